@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class MainConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "main"
+
+    def ready(self):
+        from tryon_tray.utils.metrics import get_metrics_exporter
+
+        # Record tryon_tray job metrics from startup on, for the metrics endpoint
+        get_metrics_exporter()
@@ -22,6 +22,7 @@ urlpatterns = [
     path('password-reset/', views.password_reset_view, name='password_reset'),
     path('reset-password/<str:token>/', views.password_reset_confirm_view, name='password_reset_confirm'),
     path('batch/list/', views.tryonbatch_list, name='tryonbatch_list'),
+    path('metrics/', views.metrics_view, name='metrics'),
 
 
     path('compare/', views_comparision.compare, name='compare'),
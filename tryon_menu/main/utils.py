@@ -2,7 +2,7 @@ import boto3
 from io import BytesIO
 from PIL import Image
 import requests
-from tryon_tray.api.vton import VTON
+from tryon_tray.api.vton import VTON, VTON_fanout
 from django.conf import settings
 from .models import InputSet, ModelVersion, Tryon
 import uuid
@@ -15,41 +15,26 @@ from tryon_menu.aws_constants import (
 from dotenv import load_dotenv
 from tryon_tray.api.video_gen import generate_video
 from tryon_tray.types.video import VideoMode, VideoDuration
-from datetime import timedelta
+from tryon_tray.utils.sinks import MemorySink, S3Sink
 load_dotenv()
 
-def generate_tryon_via_api(input_set, model_version, s3_client):
-    """
-    Generate a tryon image using the tryon-tray API.
-    Returns the S3 keys for the generated image and its thumbnail, along with metadata.
-    """
-    # Download input images from S3
-    garment_obj = BytesIO()
-    model_obj = BytesIO()
-    
-    s3_client.download_fileobj(AWS_STORAGE_BUCKET_NAME, input_set.garment_key, garment_obj)
-    s3_client.download_fileobj(AWS_STORAGE_BUCKET_NAME, input_set.model_key, model_obj)
-    
-    # Save temporary files
-    garment_obj.seek(0)
-    model_obj.seek(0)
-    
-    temp_garment = f"/tmp/{uuid.uuid4()}.jpg"
-    temp_model = f"/tmp/{uuid.uuid4()}.jpg"
-    temp_result = f"/tmp/{uuid.uuid4()}.jpg"
-    
-    with open(temp_garment, 'wb') as f:
-        f.write(garment_obj.read())
-    with open(temp_model, 'wb') as f:
-        f.write(model_obj.read())
+def _read_s3_image(s3_client, key):
+    """Read an image from S3 into memory."""
+    image_obj = BytesIO()
+    s3_client.download_fileobj(AWS_STORAGE_BUCKET_NAME, key, image_obj)
+    return image_obj.getvalue()
+
+def _download_input_images(input_set, s3_client):
+    """Read the input set images from S3 into memory.
     
-    # Call tryon-tray API with model-specific parameters
+    tryon-tray takes the image bytes directly, so nothing is written to disk.
+    """
+    return _read_s3_image(s3_client, input_set.model_key), _read_s3_image(s3_client, input_set.garment_key)
+
+def _tryon_api_params(input_set, model_version, result_sink):
+    """Build the tryon-tray parameters for a model version."""
     api_params = {
-        'model_image': temp_model,
-        'garment_image': temp_garment,
-        'model_name': model_version.tray_code,
-        'auto_download': True,
-        'download_path': temp_result,
+        'result_sink': result_sink,
         'show_polling_progress': True,
     }
     
@@ -78,8 +63,17 @@ def generate_tryon_via_api(input_set, model_version, s3_client):
             'mode': 'quality'
         })
     
-    # Generate try-on
-    result = VTON(**api_params)
+    return api_params
+
+def _upload_tryon_result(result, model_version, result_sink, s3_client):
+    """Upload a generated tryon and its thumbnail to S3.
+    
+    The tryon is read from the in-memory sink it was downloaded into.
+    Returns the S3 keys for the image and its thumbnail, the resolution and the time taken.
+    """
+    if not result.get('outputs'):
+        errors = result.get('download_errors')
+        raise errors[0] if errors else ValueError("No tryon result was downloaded")
     
     # Generate unique filenames for S3
     timestamp = uuid.uuid4().hex[:8]
@@ -89,7 +83,7 @@ def generate_tryon_via_api(input_set, model_version, s3_client):
     thumb_key = f'thumbnails/tryons/{timestamp}_{model_version.model.name}_{model_version.version}_thumb.jpg'
     
     # Get image resolution
-    with Image.open(temp_result) as img:
+    with result_sink.image() as img:
         width, height = img.size
         resolution = f"{width}x{height}"
         
@@ -103,77 +97,96 @@ def generate_tryon_via_api(input_set, model_version, s3_client):
         s3_client.upload_fileobj(thumb_buffer, AWS_STORAGE_BUCKET_NAME, thumb_key)
     
     # Upload original image
-    with open(temp_result, 'rb') as f:
-        s3_client.upload_fileobj(f, AWS_STORAGE_BUCKET_NAME, image_key)
+    s3_client.upload_fileobj(BytesIO(result_sink.getvalue()), AWS_STORAGE_BUCKET_NAME, image_key)
     
-    # Clean up temporary files
-    import os
-    os.remove(temp_garment)
-    os.remove(temp_model)
-    os.remove(temp_result)
     from pprint import pprint
     pprint(result)
     
-    # Extract time taken in seconds
-    time_taken = None
-    if result.get('timing'):
-        try:
-            # Convert time_taken to seconds if it's a datetime.timedelta
-            time_taken = result['timing']['time_taken'].total_seconds()
-        except AttributeError:
-            # If it's already a number, use it as is
-            time_taken = float(result['timing']['time_taken'])
+    # Time taken in seconds
+    time_taken = result['timing'].total if result.get('timing') else None
+    
+    return image_key, thumb_key, resolution, time_taken
+
+def generate_tryon_via_api(input_set, model_version, s3_client):
+    """
+    Generate a tryon image using the tryon-tray API.
+    Returns the S3 keys for the generated image and its thumbnail, along with metadata.
+    """
+    model_image, garment_image = _download_input_images(input_set, s3_client)
+    result_sink = MemorySink()
+    
+    # Call tryon-tray API with model-specific parameters
+    api_params = {
+        'model_image': model_image,
+        'garment_image': garment_image,
+        'model_name': model_version.tray_code,
+        **_tryon_api_params(input_set, model_version, result_sink),
+    }
     
-    return image_key, thumb_key, resolution, time_taken 
+    # Generate try-on
+    result = VTON(**api_params)
+    return _upload_tryon_result(result, model_version, result_sink, s3_client)
+
+def generate_tryons_via_api(input_set, model_versions, s3_client):
+    """
+    Generate tryon images for several model versions at once using the tryon-tray fan-out API.
+    Yields (model_version, outcome) as each provider finishes, where outcome is the
+    (image_key, thumb_key, resolution, time_taken) tuple of generate_tryon_via_api
+    or the exception raised for that model version.
+    """
+    # Each provider is keyed by its tray code, so one model version per code
+    versions_by_code = {mv.tray_code: mv for mv in model_versions}
+    model_image, garment_image = _download_input_images(input_set, s3_client)
+    result_sinks = {code: MemorySink() for code in versions_by_code}
+    
+    for provider_result in VTON_fanout(
+        model_image,
+        garment_image,
+        model_names=list(versions_by_code),
+        params={
+            code: _tryon_api_params(input_set, mv, result_sinks[code])
+            for code, mv in versions_by_code.items()
+        },
+    ):
+        model_version = versions_by_code[provider_result.model_name]
+        if not provider_result.ok:
+            yield model_version, provider_result.error
+            continue
+        try:
+            yield model_version, _upload_tryon_result(
+                provider_result.result, model_version,
+                result_sinks[provider_result.model_name], s3_client
+            )
+        except Exception as e:
+            yield model_version, e
 
 def generate_video_via_api(input_set, model_version, s3_client):
     """
     Generate a video using the tryon-tray API.
     Returns the S3 key for the generated video and the time taken.
     """
-    # Download model image from S3
-    model_obj = BytesIO()
-    s3_client.download_fileobj(AWS_STORAGE_BUCKET_NAME, input_set.model_key, model_obj)
-    model_obj.seek(0)
-    temp_model = f"/tmp/{uuid.uuid4()}.jpg"
-    with open(temp_model, 'wb') as f:
-        f.write(model_obj.read())
+    # Read model image from S3
+    model_image = _read_s3_image(s3_client, input_set.model_key)
+
+    # Generate unique filename for S3
+    timestamp = uuid.uuid4().hex[:8]
+    video_key = f'tryons/{timestamp}_{model_version.model.name}_{model_version.version}.mp4'
 
-    # Call video generation API
+    # Call video generation API, streaming the video straight into S3
     result = generate_video(
-        source_image=temp_model,
+        source_image=model_image,
         prompt=input_set.prompt,
         mode=VideoMode.STANDARD.value,
         duration=VideoDuration.FIVE.value,
         show_polling_progress=True,
-        auto_download=True,
-        download_path=f"/tmp/{uuid.uuid4()}.mp4",
+        result_sink=S3Sink(AWS_STORAGE_BUCKET_NAME, video_key, client=s3_client),
     )
+    if result.download_error:
+        raise result.download_error
+    if result.output is None:
+        raise ValueError(f"Video {result.video_url} could not be stored in S3")
 
-    # Generate unique filename for S3
-    timestamp = uuid.uuid4().hex[:8]
-    video_key = f'tryons/{timestamp}_{model_version.model.name}_{model_version.version}.mp4'
-
-    # Upload video to S3
-    with open(result.local_path, 'rb') as f:
-        s3_client.upload_fileobj(f, AWS_STORAGE_BUCKET_NAME, video_key)
-
-    # Clean up temporary files
-    import os
-    os.remove(temp_model)
-    os.remove(result.local_path)
-
-    # Extract time taken in seconds
-    time_taken = None
-    if result.timing:
-        try:
-            # If time_taken is a string, convert it to a timedelta
-            if isinstance(result.timing['time_taken'], str):
-                time_taken = timedelta(seconds=float(result.timing['time_taken'].split(':')[-1])).total_seconds()
-            else:
-                time_taken = result.timing['time_taken'].total_seconds()
-        except AttributeError:
-            # If it's already a number, use it as is
-            time_taken = float(result.timing['time_taken'])
+    # Time taken in seconds
+    time_taken = result.timing.total if result.timing else None
 
     return video_key, time_taken 
\ No newline at end of file
@@ -2,8 +2,10 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.views import redirect_to_login
 from django.core.mail import send_mail
 from django.conf import settings
+import hmac
 import uuid
 from .models import TryonBatch, Tryon, PasswordResetToken, InputSet, ModelVersion, RankedPair
 import boto3
@@ -19,7 +21,8 @@ from django.core.paginator import Paginator
 from io import BytesIO
 from django.urls import reverse
 from django.db.models import Count, Q, F
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+from tryon_tray.utils.metrics import CONTENT_TYPE, get_metrics_exporter
 
 def index_view(request):
     return redirect('modelversion_list')
@@ -293,7 +296,7 @@ def create_tryonbatch_step1(request):
 
 @login_required
 def create_tryonbatch_step2(request):
-    from main.utils import generate_tryon_via_api, generate_video_via_api
+    from main.utils import generate_tryon_via_api, generate_tryons_via_api, generate_video_via_api
     # Get data from session
     tryonbatch_data = request.session.get('tryonbatch_data')
     if not tryonbatch_data:
@@ -318,8 +321,42 @@ def create_tryonbatch_step2(request):
                 region_name=AWS_S3_REGION_NAME
             )
             
+            # Run the API try-ons for all providers at once, so the batch takes as long
+            # as the slowest provider instead of the sum of all of them
+            fanout_versions = {}
+            if tryonbatch_data['mode'] != 'video':
+                for model_version in model_versions:
+                    if model_version.is_api_implemented:
+                        fanout_versions.setdefault(model_version.tray_code, model_version)
+            if fanout_versions:
+                for model_version, outcome in generate_tryons_via_api(input_set, fanout_versions.values(), s3_client):
+                    if isinstance(outcome, Exception):
+                        # Log the error but continue with other models
+                        print(f"API error for {model_version}: {str(outcome)}")
+                        continue
+                    image_key, thumb_key, resolution, time_taken = outcome
+                    
+                    # Create Tryon object with API results
+                    tryon = Tryon.objects.create(
+                        input_set=input_set,
+                        model_version=model_version,
+                        image_key=image_key,
+                        thumb_key=thumb_key,
+                        is_generated_by_api=True,
+                        time_taken=time_taken,
+                        resolution=resolution,
+                        price_per_inference=model_version.price_per_inference,
+                        notes="",  # Empty string for text field
+                        mode=tryonbatch_data['mode']  # Set mode
+                    )
+                    batch.tryons.add(tryon)
+            fanned_out_ids = {model_version.id for model_version in fanout_versions.values()}
+            
             # Process each model version
             for model_version in model_versions:
+                if model_version.id in fanned_out_ids:
+                    continue
+
                 if model_version.is_api_implemented:
                     if tryonbatch_data['mode'] == 'video':
                         # Use API to generate video
@@ -656,3 +693,18 @@ def tryonbatch_list(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return render(request, 'main/tryonbatch_list.html', {'batches': page_obj})
+
+def metrics_view(request):
+    """Try-on job metrics in the Prometheus text format.
+    
+    Open to staff users, and to scrapers sending the METRICS_TOKEN setting
+    as a bearer token.
+    """
+    token = settings.METRICS_TOKEN
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    if not (token and hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode())):
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        if not request.user.is_staff:
+            return HttpResponseForbidden()
+    return HttpResponse(get_metrics_exporter().render(), content_type=CONTENT_TYPE)
@@ -137,6 +137,9 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100MB
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Bearer token Prometheus scrapes /metrics/ with; staff users can always view it
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
 # Import local settings
 try:
     from .settings_local import *
@@ -47,7 +47,7 @@ result = VTON(
 # Print results
 print("\nGeneration completed!")
 if result.get('timing'):
-    print(f"Time taken: {result['timing']['time_taken']}")
+    print(f"Time taken: {result['timing'].total:.1f}s")
 
 if result.get('local_path'):
     print(f"\nImage downloaded to: {result['local_path']}")
@@ -56,4 +56,4 @@ if result.local_path:
 
 if result.timing:
     print(f"\nTiming information:")
-    print(f"Time taken: {result.timing['time_taken']}") 
\ No newline at end of file
+    print(f"Time taken: {result.timing.total:.1f}s") 
\ No newline at end of file
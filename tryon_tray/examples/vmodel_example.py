@@ -58,7 +58,7 @@ def main():
         print("\nProcess completed successfully!")
         print(f"Result saved to: {result.get('local_path')}")
         print(f"Result URLs: {result.get('urls')}")
-        print(f"Time taken: {result.get('timing', {}).get('time_taken')}")
+        print(f"Time taken: {result['timing'].total:.1f}s")
         
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -0,0 +1,6 @@
+"""In-process benchmarks of tryon_tray's own overhead.
+
+Provider I/O is stubbed out: payloads are encoded without being sent,
+status checks answer immediately and downloads come from a local fake
+server. Run with ``python -m benchmarks`` from ``tryon_tray/python``.
+"""
@@ -0,0 +1,55 @@
+"""Command line entry point: ``python -m benchmarks``."""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from . import bench_download, bench_encode, bench_polling, bench_services  # noqa: F401 (register benchmarks)
+from .harness import (
+    DEFAULT_HISTORY, REGISTRY, environment, find_regressions, format_result,
+    load_history, run_benchmark, save_run
+)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("-k", "--filter", action="append", default=[],
+                        help="Only run benchmarks whose name contains this text (repeatable)")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    parser.add_argument("--quick", action="store_true",
+                        help="Run every operation once to check the benchmarks work; nothing is recorded")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY), help=f"JSON history file (default {DEFAULT_HISTORY})")
+    parser.add_argument("--no-save", action="store_true", help="Compare with the history without recording this run")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Slowdown against the previous run reported as a regression (default 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    selected = [
+        bench for name, bench in REGISTRY.items()
+        if not args.filter or any(text in name for text in args.filter)
+    ]
+    if args.list:
+        for bench in selected:
+            print(bench.name)
+        return 0
+
+    env = environment()
+    print(f"tryon_tray {env['version']} ({env['commit'] or 'no commit'}), Python {env['python']}")
+    print(f"{'benchmark':<36} {'median':>10} {'stdev':>10}")
+    results = []
+    for bench in selected:
+        result = run_benchmark(bench, quick=args.quick)
+        print(format_result(result), flush=True)
+        results.append(result)
+    if args.quick:
+        return 0
+
+    regressions = find_regressions(results, load_history(args.history), env, args.threshold)
+    if not args.no_save:
+        save_run(results, args.history, env)
+        print(f"\nRecorded in {args.history}")
+    for regression in regressions:
+        print(f"REGRESSION {regression.name}: {regression.ratio:.2f}x slower than the previous run")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""Result download throughput from a local fake provider."""
+
+import os
+import tempfile
+from pathlib import Path
+
+from tryon_tray.testing.fake_providers import FakeProviderServer
+from tryon_tray.utils.download import Downloader
+from tryon_tray.utils.sinks import MemorySink
+
+from .harness import MB, benchmark
+
+SIZE = 20 * MB
+
+def _serve(server: FakeProviderServer) -> str:
+    return server.serve_file("/results/bench.bin", os.urandom(SIZE), content_type="application/octet-stream")
+
+@benchmark("download.file[20MB]", bytes=SIZE)
+def download_file():
+    with FakeProviderServer(latency=0) as server, tempfile.TemporaryDirectory() as tmp:
+        url = _serve(server)
+        downloader = Downloader()
+        yield lambda: downloader.download(url, Path(tmp) / "result.bin")
+
+@benchmark("download.memory[20MB]", bytes=SIZE)
+def download_memory():
+    with FakeProviderServer(latency=0) as server:
+        url = _serve(server)
+        downloader = Downloader()
+
+        def fetch() -> None:
+            [result] = downloader.save_all([url], MemorySink())
+            if not result.ok:
+                raise result.error
+
+        yield fetch
@@ -0,0 +1,46 @@
+"""Payload build and base64 encoding of input images."""
+
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from tryon_tray.services.vton.fashnai import FashnaiVTON
+from tryon_tray.utils.payload_cache import configure_payload_cache
+from tryon_tray.utils.streaming import StreamingJSONBody
+
+from .harness import MB, benchmark
+
+SIZES_MB = (1, 5, 20)
+
+def _payload(size: int, cached: bool):
+    """Build a Fashn payload for a pair of ``size``-byte images and stream its body."""
+    with tempfile.TemporaryDirectory() as tmp, patch.dict(os.environ, {"FASHNAI_API_KEY": "bench"}):
+        person = Path(tmp) / "person.jpg"
+        garment = Path(tmp) / "garment.jpg"
+        person.write_bytes(os.urandom(size))
+        garment.write_bytes(os.urandom(size))
+        service = FashnaiVTON(str(person), str(garment))
+
+        def build() -> None:
+            if not cached:
+                # A fresh cache, so every image is hashed and encoded
+                configure_payload_cache()
+            body = StreamingJSONBody(service.prepare_payload())
+            expected = len(body)
+            sent = sum(len(chunk) for chunk in body)
+            assert sent == expected
+
+        try:
+            yield build
+        finally:
+            configure_payload_cache()
+
+for _size in SIZES_MB:
+    benchmark(f"encode.payload[{_size}MB]", bytes=2 * _size * MB)(
+        lambda size=_size: _payload(size * MB, cached=False)
+    )
+
+benchmark("encode.payload_cached[5MB]", number=5, bytes=2 * 5 * MB)(
+    lambda: _payload(5 * MB, cached=True)
+)
@@ -0,0 +1,37 @@
+"""Poll scheduler overhead per job."""
+
+from tryon_tray.utils.polling import FixedPolling, PollScheduler
+
+from .harness import benchmark
+
+JOBS = 500
+POLLS_PER_JOB = 3
+
+def _status_check(polls: int):
+    """Status check that reports completion on its ``polls``-th call."""
+    calls = 0
+
+    def check():
+        nonlocal calls
+        calls += 1
+        return (True, ["https://example.com/result.png"]) if calls >= polls else (False, None)
+
+    return check
+
+@benchmark(f"polling.scheduler[{JOBS} jobs]", items=JOBS)
+def poll_loop():
+    scheduler = PollScheduler(max_workers=8)
+    policy = FixedPolling(0)
+
+    def run() -> None:
+        futures = [
+            scheduler.submit(_status_check(POLLS_PER_JOB), max_attempts=POLLS_PER_JOB, policy=policy)
+            for _ in range(JOBS)
+        ]
+        for future in futures:
+            future.result()
+
+    try:
+        yield run
+    finally:
+        scheduler.stop()
@@ -0,0 +1,48 @@
+"""Service construction and request signing."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from tryon_tray.services.factory import ServiceFactory, ServiceType
+from tryon_tray.utils.auth import JWTCache
+
+from .harness import benchmark
+
+INPUTS = Path(__file__).resolve().parents[1] / "tests" / "inputs"
+PERSON = str(INPUTS / "person.jpg")
+GARMENT = str(INPUTS / "garment.jpeg")
+
+CREDENTIALS = {
+    "FASHNAI_API_KEY": "bench",
+    "KLINGAI_ACCESS_ID": "bench-access-id",
+    "KLINGAI_API_KEY": "bench-secret-key-of-a-realistic-length"
+}
+
+def _get_service(model_name: str):
+    with patch.dict(os.environ, CREDENTIALS):
+        # Import the provider module before timing
+        ServiceFactory.get_service_class(ServiceType.VTON, model_name)
+        yield lambda: ServiceFactory.get_service(
+            ServiceType.VTON, model_name, model_image=PERSON, garment_image=GARMENT
+        )
+
+for _model_name in ("fashnai", "klingai"):
+    benchmark(f"factory.get_service[{_model_name}]", number=1000)(
+        lambda model_name=_model_name: _get_service(model_name)
+    )
+
+@benchmark("auth.jwt_sign", number=1000)
+def jwt_sign():
+    cache = JWTCache()
+
+    def sign() -> None:
+        cache.clear()
+        cache.get(CREDENTIALS["KLINGAI_ACCESS_ID"], CREDENTIALS["KLINGAI_API_KEY"])
+
+    yield sign
+
+@benchmark("auth.jwt_cached", number=10000)
+def jwt_cached():
+    cache = JWTCache()
+    yield lambda: cache.get(CREDENTIALS["KLINGAI_ACCESS_ID"], CREDENTIALS["KLINGAI_API_KEY"])
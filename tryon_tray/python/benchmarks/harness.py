@@ -0,0 +1,223 @@
+"""Benchmark registry, timing loop and JSON history."""
+
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+MB = 1024 * 1024
+
+# Outside the source tree, so runs never end up in a commit
+DEFAULT_HISTORY = Path("~/.cache/tryon_tray/bench_history.json")
+
+# A benchmark is a generator function: the code before ``yield`` sets up,
+# the yielded callable is the operation being timed, and the code after
+# ``yield`` tears down.
+BenchmarkFunction = Callable[[], Iterator[Callable[[], Any]]]
+
+@dataclass
+class Benchmark:
+    """A registered benchmark.
+
+    Attributes:
+        name: Unique name, e.g. ``"encode.payload[5MB]"``
+        func: Generator function yielding the operation to time
+        number: Operations per timed repeat
+        repeat: Timed repeats (the reported figures are over these)
+        bytes: Bytes one operation processes, to report throughput
+        items: Items one operation handles, to report time per item
+    """
+    name: str
+    func: BenchmarkFunction
+    number: int = 1
+    repeat: int = 5
+    bytes: Optional[int] = None
+    items: Optional[int] = None
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one benchmark.
+
+    Attributes:
+        name: Benchmark name
+        times: Seconds per operation, one value per repeat
+        number: Operations per repeat
+        bytes: Bytes one operation processes
+        items: Items one operation handles
+    """
+    name: str
+    times: List[float]
+    number: int
+    bytes: Optional[int] = None
+    items: Optional[int] = None
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "median": self.median,
+            "min": min(self.times),
+            "mean": statistics.mean(self.times),
+            "stdev": statistics.stdev(self.times) if len(self.times) > 1 else 0.0,
+            "repeat": len(self.times),
+            "number": self.number
+        }
+        if self.bytes:
+            data["mb_per_s"] = self.bytes / MB / self.median
+        if self.items:
+            data["per_item"] = self.median / self.items
+        return data
+
+@dataclass
+class Regression:
+    """A benchmark that got slower than in the previous run."""
+    name: str
+    previous: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.previous
+
+REGISTRY: Dict[str, Benchmark] = {}
+
+def benchmark(
+    name: str,
+    number: int = 1,
+    repeat: int = 5,
+    bytes: Optional[int] = None,
+    items: Optional[int] = None
+) -> Callable[[BenchmarkFunction], BenchmarkFunction]:
+    """Register a generator function as a benchmark (see :class:`Benchmark`)."""
+    def register(func: BenchmarkFunction) -> BenchmarkFunction:
+        if name in REGISTRY:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        REGISTRY[name] = Benchmark(name, func, number, repeat, bytes, items)
+        return func
+    return register
+
+def run_benchmark(bench: Benchmark, quick: bool = False) -> BenchmarkResult:
+    """Time one benchmark.
+
+    The operation runs once untimed to warm up, then ``repeat`` times
+    ``number`` operations are timed with the garbage collector paused.
+
+    Args:
+        bench: Benchmark to run
+        quick: Time a single operation without warm-up, to check that the
+            benchmark works rather than to measure it
+    """
+    number, repeat = (1, 1) if quick else (bench.number, bench.repeat)
+    generator = bench.func()
+    operation = next(generator)
+    try:
+        if not quick:
+            operation()
+        times = []
+        for _ in range(repeat):
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                for _ in range(number):
+                    operation()
+                times.append((time.perf_counter() - start) / number)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+    finally:
+        generator.close()
+    return BenchmarkResult(bench.name, times, number, bench.bytes, bench.items)
+
+def environment() -> Dict[str, Any]:
+    """Description of the code and machine a run measured."""
+    from tryon_tray import __version__
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "version": __version__,
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": f"{platform.node()} {platform.machine()} {platform.system()}"
+    }
+
+def load_history(path: Union[str, Path] = DEFAULT_HISTORY) -> List[Dict[str, Any]]:
+    """Earlier runs, oldest first."""
+    path = Path(path).expanduser()
+    if not path.exists():
+        return []
+    return json.loads(path.read_text())["runs"]
+
+def save_run(
+    results: List[BenchmarkResult],
+    path: Union[str, Path] = DEFAULT_HISTORY,
+    env: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Append a run to the history file.
+
+    Returns:
+        The recorded run
+    """
+    run = {**(env or environment()), "results": {r.name: r.to_dict() for r in results}}
+    runs = load_history(path) + [run]
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"runs": runs}, indent=2) + "\n")
+    return run
+
+def find_regressions(
+    results: List[BenchmarkResult],
+    history: List[Dict[str, Any]],
+    env: Dict[str, Any],
+    threshold: float = 0.2
+) -> List[Regression]:
+    """Benchmarks whose median is more than ``threshold`` slower than last time.
+
+    Only the latest earlier run on the same machine and Python version is
+    compared against, since timings from elsewhere are not comparable.
+    """
+    same = [
+        run for run in history
+        if run.get("machine") == env["machine"] and run.get("python") == env["python"]
+    ]
+    if not same:
+        return []
+    previous = same[-1]["results"]
+    regressions = []
+    for result in results:
+        before = previous.get(result.name)
+        if before and result.median > before["median"] * (1 + threshold):
+            regressions.append(Regression(result.name, before["median"], result.median))
+    return regressions
+
+def format_result(result: BenchmarkResult) -> str:
+    """One table row for a result."""
+    data = result.to_dict()
+    row = f"{result.name:<36} {_format_seconds(data['median']):>10} {_format_seconds(data['stdev']):>10}"
+    if "mb_per_s" in data:
+        row += f" {data['mb_per_s']:>10.1f} MB/s"
+    if "per_item" in data:
+        row += f" {_format_seconds(data['per_item']):>10}/item"
+    return row
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
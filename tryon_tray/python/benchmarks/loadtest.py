@@ -0,0 +1,332 @@
+"""Load test: many concurrent try-on jobs against a fake provider.
+
+Drives ``--jobs`` jobs through ``VTON_async`` (the body of ``VTON()``),
+``--concurrency`` at a time, against a local stand-in for the provider's
+HTTP API, and reports throughput, status checks per job, memory per job and
+the latency distribution. The fake provider runs in a child process, so the
+memory and CPU measured are the client's alone. From ``tryon_tray/python``::
+
+    PYTHONPATH=src python -m benchmarks.loadtest --provider fashnai --jobs 2000 --latency 2
+
+With ``--record DIR`` the run's HTTP exchanges are recorded to a cassette
+(see ``tryon_tray.utils.cassette``); ``--replay DIR --speed 10`` replays a
+cassette, recorded here or from a production batch, without any server.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from tryon_tray.api.vton import VTON_async
+from tryon_tray.testing import fake_providers
+from tryon_tray.testing.fake_providers import lognormal, synthetic_image
+from tryon_tray.types.timing import JobTiming
+from tryon_tray.utils.cassette import Cassette
+from tryon_tray.utils.hooks import JobHooks
+from tryon_tray.utils.http import configure_async_client, configure_http
+from tryon_tray.utils.polling import configure_poll_scheduler
+from tryon_tray.utils.sinks import MemorySink
+
+# Fake server class and the attribute holding the URL its service takes as base_url
+PROVIDERS = {
+    "fashnai": ("FakeFashnServer", "base_url"),
+    "klingai": ("FakeKlingServer", "images_url"),
+    "vmodel": ("FakeVModelServer", "base_url"),
+    "alphabake": ("FakeAlphabakeServer", "base_url"),
+}
+
+CREDENTIALS = {
+    "FASHNAI_API_KEY": "load-test",
+    "KLINGAI_ACCESS_ID": "load-test",
+    "KLINGAI_API_KEY": "load-test-secret-of-a-realistic-length",
+    "VMODEL_API_KEY": "load-test",
+    "ALPHABAKE_API_KEY": "load-test",
+}
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+# Written next to a recorded cassette, so a replay knows what was run
+RUN_FILE = "loadtest.json"
+
+@dataclass
+class JobRecord:
+    """Outcome of one job.
+
+    Attributes:
+        latency: Seconds from the start of the job until it returned
+        polls: Status checks sent
+        phases: Seconds spent in each phase of the job (see JobTiming)
+        error: Exception the job raised, if it failed
+    """
+    latency: float
+    polls: int
+    phases: Dict[str, float] = field(default_factory=dict)
+    error: Optional[BaseException] = None
+
+class _JobRecorder(JobHooks):
+    def __init__(self):
+        self.polls = 0
+        self.timing: Optional[JobTiming] = None
+
+    def on_submit(self, service: Any) -> None:
+        self.timing = service.timing
+
+    def on_poll(self, service: Any) -> None:
+        self.polls += 1
+
+    def record(self, latency: float, error: Optional[BaseException] = None) -> JobRecord:
+        phases: Dict[str, float] = {}
+        for phase in self.timing.phases if self.timing else ():
+            phases[phase.name] = phases.get(phase.name, 0.0) + phase.duration
+        return JobRecord(latency, self.polls, phases, error)
+
+def _serve(provider: str, options: Dict[str, Any], conn: Any) -> None:
+    """Run a fake provider until the parent asks for its statistics."""
+    class_name, url_attribute = PROVIDERS[provider]
+    median, sigma = options.pop("latency"), options.pop("latency_sigma")
+    latency = lognormal(median, sigma, seed=options.get("seed")) if sigma > 0 and median > 0 else median
+    with getattr(fake_providers, class_name)(latency=latency, **options) as server:
+        conn.send(getattr(server, url_attribute))
+        conn.recv()
+        conn.send({"requests": len(server.requests), "rejected": server.rejected, "tasks": len(server.tasks)})
+
+async def run_jobs(
+    provider: str,
+    base_url: Optional[str],
+    jobs: int,
+    concurrency: int,
+    poll_interval: float,
+    max_polls: int,
+    input_size: int = 512,
+    download: bool = False
+) -> List[JobRecord]:
+    """Run jobs against a provider and record how each went.
+
+    ``base_url`` None sends the jobs to the provider's own API.
+    """
+    person = synthetic_image(input_size, input_size)
+    garment = synthetic_image(input_size // 2, input_size // 2)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def job() -> JobRecord:
+        recorder = _JobRecorder()
+        extra: Dict[str, Any] = {"result_sink": MemorySink()} if download else {}
+        if base_url is not None:
+            extra["base_url"] = base_url
+        async with semaphore:
+            start = time.monotonic()
+            try:
+                await VTON_async(
+                    model_image=person,
+                    garment_image=garment,
+                    model_name=provider,
+                    polling_interval=poll_interval,
+                    max_polling_attempts=max_polls,
+                    hooks=recorder,
+                    **extra
+                )
+            except Exception as e:
+                return recorder.record(time.monotonic() - start, e)
+            return recorder.record(time.monotonic() - start)
+
+    return await asyncio.gather(*(job() for _ in range(jobs)))
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile of unsorted values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))]
+
+def _current_rss() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _peak_rss() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def report(
+    records: List[JobRecord],
+    wall: float,
+    server_stats: Optional[Dict[str, Any]],
+    rss_growth: Optional[int]
+) -> Dict[str, Any]:
+    """Summary of a load test run (``server_stats`` is None for a replay)."""
+    failed = [r for r in records if r.error is not None]
+    polls = sum(r.polls for r in records)
+    latencies = [r.latency for r in records]
+    phases: Dict[str, float] = {}
+    for record in records:
+        for name, duration in record.phases.items():
+            phases[name] = phases.get(name, 0.0) + duration
+    return {
+        "jobs": len(records),
+        "failed": len(failed),
+        "errors": dict(Counter(type(r.error).__name__ for r in failed).most_common()),
+        "wall_seconds": wall,
+        "jobs_per_second": len(records) / wall if wall else 0.0,
+        "polls": polls,
+        "polls_per_job": polls / len(records) if records else 0.0,
+        "requests": server_stats["requests"] if server_stats else None,
+        "rate_limited": server_stats["rejected"] if server_stats else None,
+        "latency": {f"p{p:g}": percentile(latencies, p) for p in PERCENTILES} if records else {},
+        "latency_max": max(latencies, default=0.0),
+        "phase_means": {name: total / len(records) for name, total in phases.items()},
+        "rss_growth_bytes": rss_growth,
+        "rss_per_job_bytes": rss_growth / len(records) if rss_growth is not None and records else None,
+    }
+
+def format_report(summary: Dict[str, Any]) -> str:
+    lines = [
+        f"jobs           {summary['jobs']} ({summary['jobs'] - summary['failed']} ok, {summary['failed']} failed)",
+        f"wall time      {summary['wall_seconds']:.2f} s",
+        f"throughput     {summary['jobs_per_second']:.1f} jobs/s",
+        f"polls          {summary['polls_per_job']:.2f} per job ({summary['polls']} total)",
+    ]
+    if summary["requests"] is not None:
+        lines.append(f"requests       {summary['requests']} received, {summary['rate_limited']} answered 429")
+    lines.append(
+        "latency        " + "  ".join(f"{name} {value:.3f} s" for name, value in summary["latency"].items())
+        + f"  max {summary['latency_max']:.3f} s"
+    )
+    if summary["phase_means"]:
+        lines.append("phases (mean)  " + "  ".join(f"{name} {value:.3f} s" for name, value in summary["phase_means"].items()))
+    if summary["rss_growth_bytes"] is not None:
+        lines.append(
+            f"memory         +{summary['rss_growth_bytes'] / 2**20:.1f} MB peak RSS, "
+            f"{summary['rss_per_job_bytes'] / 1024:.1f} KB per job"
+        )
+    for name, count in summary["errors"].items():
+        lines.append(f"error          {count} x {name}")
+    return "\n".join(lines)
+
+def _measure(args: argparse.Namespace, base_url: Optional[str]) -> Tuple[List[JobRecord], float, Optional[int]]:
+    """Run the jobs; returns their records, the wall time and the peak RSS growth."""
+    rss_before = _current_rss() or _peak_rss()
+    start = time.monotonic()
+    records = asyncio.run(run_jobs(
+        args.provider,
+        base_url,
+        jobs=args.jobs,
+        concurrency=args.concurrency or args.jobs,
+        poll_interval=args.poll_interval,
+        max_polls=args.max_polls,
+        input_size=args.input_size,
+        download=args.download
+    ))
+    wall = time.monotonic() - start
+    peak = _peak_rss()
+    rss_growth = max(peak - rss_before, 0) if peak is not None and rss_before is not None else None
+    return records, wall, rss_growth
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", choices=sorted(PROVIDERS), default="fashnai")
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, help="Jobs in flight at once (default: all of them)")
+    parser.add_argument("--workers", type=int, default=64,
+                        help="Threads for blocking calls and connections per host (default 64)")
+    parser.add_argument("--poll-workers", type=int, default=16, help="Status checks sent at once (default 16)")
+    parser.add_argument("--latency", type=float, default=2.0, help="Median seconds a job takes (default 2)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5,
+                        help="Log-normal spread of job latency; 0 for a fixed latency (default 0.5)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of jobs that fail")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered 429")
+    parser.add_argument("--retry-after", type=float, help="Retry-After sent with those 429s, in seconds")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between status checks")
+    parser.add_argument("--max-polls", type=int, default=600)
+    parser.add_argument("--input-size", type=int, default=512, help="Width and height of the model image")
+    parser.add_argument("--output-size", type=int, default=512, help="Width and height of the result images")
+    parser.add_argument("--download", action="store_true", help="Download results into memory")
+    parser.add_argument("--seed", type=int, default=0)
+    cassettes = parser.add_mutually_exclusive_group()
+    cassettes.add_argument("--record", metavar="DIR", help="Record the run's HTTP exchanges to a cassette")
+    cassettes.add_argument("--replay", metavar="DIR", help="Replay a cassette instead of running a fake provider")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Replay speed-up (default 1); 0 replays without delays")
+    parser.add_argument("--json", help="Also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    for name, value in CREDENTIALS.items():
+        os.environ.setdefault(name, value)
+    cassette = None
+    base_url = None
+    if args.replay:
+        cassette = Cassette(args.replay, "replay", speed=args.speed or None)
+        run_file = Path(args.replay) / RUN_FILE
+        if run_file.exists():
+            recorded = json.loads(run_file.read_text())
+            args.provider, base_url = recorded["provider"], recorded["base_url"]
+    elif args.record:
+        cassette = Cassette(args.record, "record")
+    configure_http(pool_maxsize=args.workers, cassette=cassette)
+    configure_async_client(max_workers=args.workers)
+    configure_poll_scheduler(max_workers=args.poll_workers)
+
+    server_stats = None
+    try:
+        if args.replay:
+            records, wall, rss_growth = _measure(args, base_url)
+        else:
+            options = {
+                "latency": args.latency,
+                "latency_sigma": args.latency_sigma,
+                "failure_rate": args.failure_rate,
+                "rate_limit_rate": args.rate_limit_rate,
+                "retry_after": args.retry_after,
+                "output_size": (args.output_size, args.output_size),
+                "seed": args.seed,
+            }
+            conn, child_conn = multiprocessing.Pipe()
+            server = multiprocessing.Process(target=_serve, args=(args.provider, options, child_conn), daemon=True)
+            server.start()
+            try:
+                base_url = conn.recv()
+                if args.record:
+                    run = {"provider": args.provider, "base_url": base_url}
+                    (Path(args.record) / RUN_FILE).write_text(json.dumps(run) + "\n")
+                records, wall, rss_growth = _measure(args, base_url)
+                conn.send("stop")
+                server_stats = conn.recv()
+            finally:
+                server.join(timeout=10)
+                if server.is_alive():
+                    server.terminate()
+    finally:
+        if cassette is not None:
+            cassette.close()
+
+    summary = {
+        "provider": args.provider,
+        "concurrency": args.concurrency or args.jobs,
+        "workers": args.workers,
+        **report(records, wall, server_stats, rss_growth)
+    }
+    source = f"{args.provider} replayed at {args.speed:g}x" if args.replay else f"{args.provider} fake"
+    print(f"provider       {source}, {summary['concurrency']} concurrent, "
+          f"{args.workers} workers, {args.poll_workers} poll workers")
+    print(format_report(summary))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
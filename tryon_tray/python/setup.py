@@ -32,6 +32,11 @@ setup(
         "pyjwt",
         "replicate",
     ],
+    extras_require={
+        "images": ["Pillow"],
+        "s3": ["boto3"],
+        "otel": ["opentelemetry-api"],
+    },
     include_package_data=True,
     test_suite="tests",
 ) 
\ No newline at end of file
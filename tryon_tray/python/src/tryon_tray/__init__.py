@@ -1,17 +1,18 @@
 """A unified interface for virtual try-on services"""
 
-__version__ = "0.2.2"
-
-# Import services to ensure registration
-from . import services
-from .services import video  # Video generation services
-from .services import vton   # Virtual try-on services
+import importlib
 
-# Import the main API function
-from .vton_api import VTON
+__version__ = "0.2.2"
 
-# Import utility functions for model discovery
-from .utils.discovery import get_available_models, get_model_params, get_model_sample_config
+# Public API, imported on first access so that ``import tryon_tray`` stays
+# cheap. Provider services are loaded by the service factory when a model
+# is first requested.
+_EXPORTS = {
+    'VTON': '.vton_api',
+    'get_available_models': '.utils.discovery',
+    'get_model_params': '.utils.discovery',
+    'get_model_sample_config': '.utils.discovery',
+}
 
 # Export public API
 __all__ = [
@@ -19,4 +20,14 @@ __all__ = [
     'get_available_models',
     'get_model_params', 
     'get_model_sample_config'
-] 
\ No newline at end of file
+]
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,71 +1,168 @@
 """Alphabake API client implementation."""
 
-import os
 import time
 import json
-import base64
-import requests
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
+from ..utils import http
+from ..utils.download import get_downloader
+from ..utils.ratelimit import Governor, get_governor
+from ..utils.file_io import stream_base64
+from ..utils.image_input import ImageData
+from ..utils.preprocess import ImageSpec
+from ..utils.streaming import StreamingJSONBody
 
 class AlphabakeAPIClient:
     """Client for interacting with the Alphabake API."""
     
-    def __init__(self, api_key: str, base_url: str = "https://app.alphabake.io/"):
-        """Initialize the Alphabake API client."""
+    BASE_URL = "https://app.alphabake.io/"
+    # The v2 API, which fetches input images from URLs itself
+    V2_BASE_URL = "https://api.alphabake.io/"
+    
+    _shared: Dict[Tuple[str, str], "AlphabakeAPIClient"] = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, api_key: str, base_url: str = BASE_URL, v2_base_url: Optional[str] = None):
+        """Initialize the Alphabake API client.
+        
+        Args:
+            api_key: Alphabake API key
+            base_url: URL of the API that takes uploaded images
+            v2_base_url: URL of the v2 API that takes image URLs (defaults
+                to the public v2 API, or to base_url when that is overridden)
+        """
         self.api_key = api_key
         self.base_url = base_url
+        if v2_base_url is None:
+            v2_base_url = self.V2_BASE_URL if base_url == self.BASE_URL else base_url
+        self.v2_base_url = v2_base_url
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
         self.create_url = f"{self.base_url}api/tryon/"
         self.fetch_url = f"{self.base_url}api/tryon_state/"
+        self.create_url_v2 = f"{self.v2_base_url}api/v2/tryon/"
+        self.fetch_url_v2 = f"{self.v2_base_url}api/v2/tryon_status/"
+    
+    @property
+    def governor(self) -> Governor:
+        """Rate limiter for this client's API key."""
+        return get_governor("alphabake", self.api_key)
+    
+    @classmethod
+    def shared(cls, api_key: str, base_url: str = BASE_URL) -> "AlphabakeAPIClient":
+        """Get the client shared by every job using the same key and base URL."""
+        with cls._shared_lock:
+            client = cls._shared.get((api_key, base_url))
+            if client is None:
+                client = cls._shared[(api_key, base_url)] = cls(api_key=api_key, base_url=base_url)
+        return client
     
     def create_job(
         self,
-        model_image_path: str,
-        garment_image_path: str,
+        model_image_path: Union[str, Path, ImageData],
+        garment_image_path: Union[str, Path, ImageData],
         mode: str = "balanced",
         garment_name: str = None,
-        tryon_name: str = None
+        tryon_name: str = None,
+        model_image_spec: Optional[ImageSpec] = None,
+        garment_image_spec: Optional[ImageSpec] = None
     ) -> str:
-        """Create a virtual try-on job."""
+        """Create a virtual try-on job.
+        
+        Images are file paths or in-memory images. The image specs, if
+        given, preprocess the images before upload.
+        """
         # Generate default names if not provided
         if not garment_name:
             garment_name = f"garment-{int(time.time())}"
         if not tryon_name:
             tryon_name = f"tryon-{int(time.time())}"
         
-        # Read and encode images
-        with open(model_image_path, 'rb') as f:
-            human_image_data = f.read()
-        with open(garment_image_path, 'rb') as f:
-            garment_image_data = f.read()
-            
-        human_base64_image = base64.b64encode(human_image_data).decode('utf-8')
-        garment_base64_image = base64.b64encode(garment_image_data).decode('utf-8')
-        
-        # Prepare payload
+        # Prepare payload; images are base64-encoded while the body is sent
         payload = {
-            'human_image_base64': human_base64_image,
-            'garment_image_base64': garment_base64_image,
+            'human_image_base64': stream_base64(model_image_path, spec=model_image_spec),
+            'garment_image_base64': stream_base64(garment_image_path, spec=garment_image_spec),
             'garment_name': garment_name,
             'tryon_name': tryon_name,
             'mode': mode  # Options: 'fast', 'balanced', or 'quality'
         }
         
         # Make API request
-        response = requests.post(
+        response = http.post(
             self.create_url,
             headers=self.headers,
-            data=json.dumps(payload)
+            governor=self.governor,
+            data=StreamingJSONBody(payload)
         )
         response.raise_for_status()
         
         # Return the tryon_pk for status tracking
         return response.json()["tryon_pk"]
     
+    def create_job_from_urls(self, human_url: str, garment_url: str, garment_type: str = "top") -> str:
+        """Create a virtual try-on job from image URLs with the v2 API.
+        
+        Alphabake fetches the images itself, so no image data is uploaded.
+        
+        Args:
+            human_url: URL of the model/person image (e.g. a presigned S3 URL)
+            garment_url: URL of the garment image
+            garment_type: "top", "bottom" or "full"
+            
+        Returns:
+            The v2 tryon_id, for :meth:`get_job_status` with ``v2=True``
+        """
+        payload = {
+            'human_url': human_url,
+            'garment_url': garment_url,
+            'garment_type': garment_type
+        }
+        
+        response = http.post(
+            self.create_url_v2,
+            headers=self.headers,
+            governor=self.governor,
+            data=json.dumps(payload)
+        )
+        response.raise_for_status()
+        
+        return response.json()["tryon_id"]
+    
+    def get_job_status(self, tryon_pk: str, v2: bool = False) -> Optional[List[str]]:
+        """Poll the job once.
+        
+        Args:
+            tryon_pk: Job ID from :meth:`create_job`, or the tryon_id from
+                :meth:`create_job_from_urls` with ``v2=True``
+            v2: Whether the job was created with the v2 API
+        
+        Returns:
+            Result URLs if the job is done, None if it is still processing
+        """
+        payload = {
+            'tryon_id' if v2 else 'tryon_pk': tryon_pk
+        }
+        
+        response = http.post(
+            self.fetch_url_v2 if v2 else self.fetch_url,
+            headers=self.headers,
+            governor=self.governor,
+            idempotent=True,
+            data=json.dumps(payload)
+        )
+        response.raise_for_status()
+        result = response.json()
+        
+        # Check if processing is complete
+        if result.get("status") == "done":
+            return [result.get("s3_url")]
+        elif result.get("message") != "success":
+            raise Exception(f"Tryon processing failed: {result.get('message')}")
+        return None
+    
     def fetch_job(
         self,
         tryon_pk: str,
@@ -73,25 +170,11 @@ class AlphabakeAPIClient:
         delay: int = 2
     ) -> List[str]:
         """Fetch the job status and results."""
-        payload = {
-            'tryon_pk': tryon_pk
-        }
-        
         time_elapsed = 0
         for _ in range(max_attempts):
-            response = requests.post(
-                self.fetch_url,
-                headers=self.headers,
-                data=json.dumps(payload)
-            )
-            response.raise_for_status()
-            result = response.json()
-            
-            # Check if processing is complete
-            if result.get("status") == "done":
-                return [result.get("s3_url")]
-            elif result.get("message") != "success":
-                raise Exception(f"Tryon processing failed: {result.get('message')}")
+            result_urls = self.get_job_status(tryon_pk)
+            if result_urls is not None:
+                return result_urls
             
             # Wait before next attempt
             time.sleep(delay)
@@ -100,10 +183,9 @@ class AlphabakeAPIClient:
         raise TimeoutError(f"Maximum polling time exceeded: {time_elapsed} seconds")
     
     def download_image(self, url: str, output_path: str) -> None:
-        """Download the generated image."""
-        response = requests.get(url)
-        response.raise_for_status()
+        """Download the generated image.
         
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "wb") as f:
-            f.write(response.content) 
\ No newline at end of file
+        Raises:
+            DownloadError: If the image could not be downloaded completely
+        """
+        get_downloader().download(url, output_path) 
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""Resume jobs left pending in the job journal."""
+
+from typing import AsyncIterator, Iterator, Optional, Union
+
+from .vton import _as_completed
+from ..services.factory import ServiceType, get_service
+from ..types.journal import ResumedJob
+from ..utils.http import iterate_sync
+from ..utils.journal import JobJournal, JournalEntry, get_job_journal
+from ..utils.polling import PollingPolicy
+
+def resume_jobs(
+    journal: Optional[JobJournal] = None,
+    provider: Optional[str] = None,
+    max_concurrency: int = 8,
+    max_polling_attempts: int = 60,
+    polling_interval: int = 5,
+    polling_policy: Union[PollingPolicy, str, None] = None,
+    **kwargs
+) -> Iterator[ResumedJob]:
+    """Collect jobs that were submitted but never seen to finish.
+    
+    Blocking wrapper around :func:`resume_jobs_async`.
+    
+    Args:
+        journal: Journal to resume from (defaults to the process-wide one)
+        provider: Only resume jobs of this provider
+        max_concurrency: Maximum number of jobs polled at once
+        max_polling_attempts: Maximum number of polling attempts per job
+        polling_interval: Time between polling attempts in seconds
+        polling_policy: PollingPolicy, "adaptive" or None for a fixed
+            polling_interval (try-on jobs only)
+        **kwargs: Service arguments overriding the journaled ones, e.g.
+            api_key, auto_download or download_path
+        
+    Yields:
+        ResumedJob for each pending job, in completion order
+    """
+    return iterate_sync(resume_jobs_async(
+        journal=journal,
+        provider=provider,
+        max_concurrency=max_concurrency,
+        max_polling_attempts=max_polling_attempts,
+        polling_interval=polling_interval,
+        polling_policy=polling_policy,
+        **kwargs
+    ))
+
+async def resume_jobs_async(
+    journal: Optional[JobJournal] = None,
+    provider: Optional[str] = None,
+    max_concurrency: int = 8,
+    max_polling_attempts: int = 60,
+    polling_interval: int = 5,
+    polling_policy: Union[PollingPolicy, str, None] = None,
+    **kwargs
+) -> AsyncIterator[ResumedJob]:
+    """Collect jobs that were submitted but never seen to finish.
+    
+    Each job is polled again with its journaled remote ID, never submitted
+    again. Jobs that finished while the process was down complete on their
+    first status check and are downloaded if they were set to be. Finished
+    jobs are marked in the journal; jobs that time out again stay pending.
+
+    Only jobs no live worker holds a lease on are resumed, and each is
+    claimed before it is polled, so resuming is safe while other workers
+    share the journal. The lease of a worker that died runs out after
+    ``journal.lease`` seconds.
+    
+    Takes the same arguments as :func:`resume_jobs`.
+    
+    Yields:
+        ResumedJob for each pending job, in completion order
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    journal = journal or get_job_journal()
+    
+    async def resume(entry: JournalEntry) -> ResumedJob:
+        resumed = ResumedJob(entry=entry)
+        try:
+            service_type = ServiceType[entry.service_type]
+            service = get_service(service_type, entry.model_name, **{**entry.params, **kwargs, "journal": journal})
+            service._restore_submission(journal, entry)
+            if service_type is ServiceType.VIDEO:
+                service.max_polling_attempts = max_polling_attempts
+                service.polling_interval = polling_interval
+                await service.resume_async()
+            else:
+                await service.resume_async(
+                    max_attempts=max_polling_attempts,
+                    delay=polling_interval,
+                    polling_policy=polling_policy
+                )
+            resumed.result = service.get_result()
+        except Exception as e:
+            resumed.error = e
+        return resumed
+    
+    jobs = (resume(entry) for entry in journal.pending(provider) if journal.claim(entry.id))
+    completed = _as_completed(jobs, max_concurrency)
+    try:
+        async for resumed in completed:
+            yield resumed
+    finally:
+        await completed.aclose()
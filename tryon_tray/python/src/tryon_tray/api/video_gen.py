@@ -1,40 +1,23 @@
 from typing import Optional, Dict, Any
+from ..utils.image_input import ImageInput
 from ..types.video import VideoGenParams, VideoGenResponse, VideoModelVersion, VideoMode, VideoDuration
 from ..services.factory import get_service, ServiceType
 
-def generate_video(
-    source_image: str,
+def _create_service(
+    source_image: ImageInput,
     prompt: str,
-    model_name: str = VideoModelVersion.KLING_V1_5.value,
-    mode: str = VideoMode.STANDARD.value,
-    duration: str = VideoDuration.FIVE.value,
-    negative_prompt: str = "",
-    cfg_scale: float = 0.5,
-    seed: Optional[int] = None,
-    auto_download: bool = False,
-    download_path: Optional[str] = None,
-    show_polling_progress: bool = False,
+    model_name: str,
+    mode: str,
+    duration: str,
+    negative_prompt: str,
+    cfg_scale: float,
+    seed: Optional[int],
+    auto_download: bool,
+    download_path: Optional[str],
+    show_polling_progress: bool,
     **kwargs
-) -> VideoGenResponse:
-    """Generate a video from an image.
-    
-    Args:
-        source_image: Path or URL to the source image
-        prompt: Text description of desired video
-        model_name: Name of the model to use (e.g., "kling-v1-5")
-        mode: Generation mode ("std" or "pro")
-        duration: Video duration in seconds ("5" or "10")
-        negative_prompt: What to avoid in generation
-        cfg_scale: Control strength of the prompt
-        seed: Random seed for reproducibility
-        auto_download: Whether to automatically download the video
-        download_path: Path to save the downloaded video
-        show_polling_progress: Whether to show polling progress
-        **kwargs: Additional model-specific parameters
-    
-    Returns:
-        VideoGenResponse containing the video URL and metadata
-    """
+) -> Any:
+    """Create the video generation service for the given parameters."""
     # Create parameters object
     params = VideoGenParams(
         source_image=source_image,
@@ -48,7 +31,7 @@ def generate_video(
     )
     
     # Get appropriate service
-    service = get_service(
+    return get_service(
         service_type=ServiceType.VIDEO,
         model_name=model_name,
         source_image=source_image,
@@ -63,12 +46,9 @@ def generate_video(
         show_polling_progress=show_polling_progress,
         **kwargs
     )
-    
-    # Run generation
-    service.run()
-    result = service.get_result()
-    
-    # Convert to response object
+
+def _to_response(result: Dict[str, Any]) -> VideoGenResponse:
+    """Convert a service result to a response object."""
     return VideoGenResponse(
         video_url=result["video_url"],
         source_image=result["source_image"],
@@ -79,5 +59,90 @@ def generate_video(
         created_at=result.get("created_at"),
         updated_at=result.get("updated_at"),
         local_path=result.get("local_path"),
-        timing=result.get("timing")
-    ) 
\ No newline at end of file
+        timing=result.get("timing"),
+        output=result.get("output"),
+        download_error=result.get("download_error")
+    )
+
+def generate_video(
+    source_image: ImageInput,
+    prompt: str,
+    model_name: str = VideoModelVersion.KLING_V1_5.value,
+    mode: str = VideoMode.STANDARD.value,
+    duration: str = VideoDuration.FIVE.value,
+    negative_prompt: str = "",
+    cfg_scale: float = 0.5,
+    seed: Optional[int] = None,
+    auto_download: bool = False,
+    download_path: Optional[str] = None,
+    show_polling_progress: bool = False,
+    **kwargs
+) -> VideoGenResponse:
+    """Generate a video from an image.
+    
+    Args:
+        source_image: Path or URL to the source image, or the image as
+            bytes, a binary file object or a PIL image
+        prompt: Text description of desired video
+        model_name: Name of the model to use (e.g., "kling-v1-5")
+        mode: Generation mode ("std" or "pro")
+        duration: Video duration in seconds ("5" or "10")
+        negative_prompt: What to avoid in generation
+        cfg_scale: Control strength of the prompt
+        seed: Random seed for reproducibility
+        auto_download: Whether to automatically download the video
+        download_path: Path to save the downloaded video
+        show_polling_progress: Whether to show polling progress
+        **kwargs: Additional model-specific parameters, and
+            ``result_sink`` to store the video somewhere other than a local
+            file (see :mod:`tryon_tray.utils.sinks`)
+    
+    Returns:
+        VideoGenResponse containing the video URL and metadata
+    """
+    service = _create_service(
+        source_image, prompt, model_name, mode, duration, negative_prompt,
+        cfg_scale, seed, auto_download, download_path, show_polling_progress,
+        **kwargs
+    )
+    
+    # Run generation
+    service.run()
+    
+    # Convert to response object
+    with service.timing.phase("postprocess"):
+        return _to_response(service.get_result())
+
+async def generate_video_async(
+    source_image: ImageInput,
+    prompt: str,
+    model_name: str = VideoModelVersion.KLING_V1_5.value,
+    mode: str = VideoMode.STANDARD.value,
+    duration: str = VideoDuration.FIVE.value,
+    negative_prompt: str = "",
+    cfg_scale: float = 0.5,
+    seed: Optional[int] = None,
+    auto_download: bool = False,
+    download_path: Optional[str] = None,
+    show_polling_progress: bool = False,
+    **kwargs
+) -> VideoGenResponse:
+    """Generate a video from an image without blocking the event loop.
+    
+    Takes the same arguments as :func:`generate_video`.
+    
+    Returns:
+        VideoGenResponse containing the video URL and metadata
+    """
+    service = _create_service(
+        source_image, prompt, model_name, mode, duration, negative_prompt,
+        cfg_scale, seed, auto_download, download_path, show_polling_progress,
+        **kwargs
+    )
+    
+    # Run generation
+    await service.run_async()
+    
+    # Convert to response object
+    with service.timing.phase("postprocess"):
+        return _to_response(service.get_result())
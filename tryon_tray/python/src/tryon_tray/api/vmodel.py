@@ -1,45 +1,80 @@
 """VModel API client implementation."""
 
-import os
 import time
-import requests
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
+from ..utils import http
+from ..utils.download import get_downloader
+from ..utils.image_input import ImageData, image_name, read_image
+from ..utils.preprocess import ImageSpec, preprocessed_bytes
+from ..utils.ratelimit import Governor, get_governor
 
 class VModelAPIClient:
     """Client for interacting with the VModel API."""
     
     BASE_URL = "https://developer.vmodel.ai/api/vmodel/v1/ai-virtual-try-on"
     
-    def __init__(self, api_key: str):
-        """Initialize the VModel API client."""
+    _shared: Dict[Tuple[str, str], "VModelAPIClient"] = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, api_key: str, base_url: str = BASE_URL):
+        """Initialize the VModel API client.
+        
+        Args:
+            api_key: VModel API token
+            base_url: URL of the try-on API
+        """
         self.api_key = api_key
+        self.base_url = base_url
         self.headers = {
             "Authorization": api_key,
             "accept": "application/json"
         }
     
+    @property
+    def governor(self) -> Governor:
+        """Rate limiter for this client's API key."""
+        return get_governor("vmodel", self.api_key)
+    
+    @classmethod
+    def shared(cls, api_key: str, base_url: str = BASE_URL) -> "VModelAPIClient":
+        """Get the client shared by every job using the same key and base URL."""
+        with cls._shared_lock:
+            client = cls._shared.get((api_key, base_url))
+            if client is None:
+                client = cls._shared[(api_key, base_url)] = cls(api_key=api_key, base_url=base_url)
+        return client
+    
     def create_job(
         self,
-        model_image_path: str,
-        garment_image_path: str,
+        model_image_path: Union[str, Path, ImageData],
+        garment_image_path: Union[str, Path, ImageData],
         clothes_type: str = "upper_body",
-        prompt: str = ""
+        prompt: str = "",
+        model_image_spec: Optional[ImageSpec] = None,
+        garment_image_spec: Optional[ImageSpec] = None
     ) -> str:
-        """Create a virtual try-on job."""
-        files = [
-            ('clothes_image', (os.path.basename(garment_image_path), open(garment_image_path, 'rb'), 'image/png')),
-            ('custom_model', (os.path.basename(model_image_path), open(model_image_path, 'rb'), 'image/png'))
-        ]
+        """Create a virtual try-on job.
         
+        Images are file paths or in-memory images. The image specs, if
+        given, preprocess the images before upload.
+        """
         payload = {
             'clothes_type': clothes_type,
             'prompt': prompt
         }
         
-        response = requests.post(
-            f"{self.BASE_URL}/create-job",
+        # Read the images up front so a rate-limited upload can be resent
+        files = [
+            ('clothes_image', self._upload_file(garment_image_path, garment_image_spec)),
+            ('custom_model', self._upload_file(model_image_path, model_image_spec))
+        ]
+        
+        response = http.post(
+            f"{self.base_url}/create-job",
             headers=self.headers,
+            governor=self.governor,
             data=payload,
             files=files
         )
@@ -47,6 +82,34 @@ class VModelAPIClient:
         
         return response.json()["result"]["job_id"]
     
+    @staticmethod
+    def _upload_file(path: Union[str, Path, ImageData], spec: Optional[ImageSpec]) -> Tuple[str, bytes, str]:
+        """Multipart file tuple for an image, preprocessed if a spec is given."""
+        if spec is None:
+            return image_name(path), read_image(path), 'image/png'
+        name = f"{Path(image_name(path)).stem}.{spec.format.lower()}"
+        return name, preprocessed_bytes(path, spec), spec.mime_type
+    
+    def get_job_status(self, job_id: str) -> Optional[List[str]]:
+        """Poll the job once.
+        
+        Returns:
+            Result URLs if the job is done, None if it is still processing
+        """
+        response = http.get(
+            f"{self.base_url}/get-job/{job_id}",
+            headers=self.headers,
+            governor=self.governor
+        )
+        response.raise_for_status()
+        result = response.json()
+        
+        if result["code"] == 100000 and result["result"]["output_image_url"]:
+            return result["result"]["output_image_url"]
+        elif result["code"] == 300104:
+            raise Exception("Image generation failed.")
+        return None
+    
     def fetch_job(
         self,
         job_id: str,
@@ -55,27 +118,18 @@ class VModelAPIClient:
     ) -> List[str]:
         """Fetch the job status and results."""
         for _ in range(max_attempts):
-            response = requests.get(
-                f"{self.BASE_URL}/get-job/{job_id}",
-                headers=self.headers
-            )
-            response.raise_for_status()
-            result = response.json()
-            
-            if result["code"] == 100000 and result["result"]["output_image_url"]:
-                return result["result"]["output_image_url"]
-            elif result["code"] == 300104:
-                raise Exception("Image generation failed.")
+            result_urls = self.get_job_status(job_id)
+            if result_urls is not None:
+                return result_urls
             
             time.sleep(delay)
         
         raise TimeoutError("Maximum polling attempts reached")
     
     def download_image(self, url: str, output_path: str) -> None:
-        """Download the generated image."""
-        response = requests.get(url)
-        response.raise_for_status()
+        """Download the generated image.
         
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "wb") as f:
-            f.write(response.content) 
\ No newline at end of file
+        Raises:
+            DownloadError: If the image could not be downloaded completely
+        """
+        get_downloader().download(url, output_path) 
\ No newline at end of file
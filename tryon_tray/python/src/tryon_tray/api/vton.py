@@ -1,32 +1,107 @@
 """Virtual try-on API."""
 
-from typing import Dict, Any, Optional
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, Iterable, Iterator, AsyncIterator, Awaitable, Sequence, TypeVar, Union
 from pathlib import Path
 from ..services.factory import get_vton_service
+from ..types.download import DownloadError
+from ..types.vton import VTONBatchResult, VTONProviderResult
+from ..utils.http import get_async_client, run_sync, iterate_sync
+from ..utils.image_input import ImageInput, load_image_input
+from ..utils.polling import PollingPolicy
+from ..utils.result_cache import ResultCache, resolve_result_cache
+
+T = TypeVar("T")
 
 def VTON(
-    model_image: str,
-    garment_image: str,
+    model_image: ImageInput,
+    garment_image: ImageInput,
     model_name: str = "fashnai",
     auto_download: bool = False,
     download_path: Optional[str] = None,
     max_polling_attempts: int = 60,
     polling_interval: int = 5,
     show_polling_progress: bool = False,
+    polling_policy: Union[PollingPolicy, str, None] = None,
+    cache: Union[bool, ResultCache, None] = None,
     **kwargs
 ) -> Dict[str, Any]:
     """Generate a virtual try-on image.
     
+    Blocking wrapper around :func:`VTON_async`.
+    
     Args:
-        model_image: Path to the model/person image
-        garment_image: Path to the garment image
+        model_image: Model/person image, as a path, bytes, a binary file
+            object or a PIL image
+        garment_image: Garment image, in any of the same forms
         model_name: Name of the model to use (e.g., "fashnai", "replicate")
         auto_download: Whether to automatically download the result
         download_path: Path to save the downloaded image
         max_polling_attempts: Maximum number of polling attempts
         polling_interval: Time between polling attempts in seconds
         show_polling_progress: Whether to show polling progress
-        **kwargs: Additional model-specific parameters
+        polling_policy: PollingPolicy, "adaptive" (learn each provider's
+            completion times) or None for a fixed polling_interval
+        cache: True to reuse results from the process-wide result cache
+            (see :mod:`tryon_tray.utils.result_cache`), or a ResultCache;
+            an identical earlier job is returned without calling the
+            provider, with ``"cached": True``
+        **kwargs: Additional model-specific parameters, and
+            ``result_sink`` to store the results somewhere other than local
+            files (see :mod:`tryon_tray.utils.sinks`)
+        
+    Returns:
+        Dictionary containing result URLs and metadata
+    """
+    return run_sync(VTON_async(
+        model_image=model_image,
+        garment_image=garment_image,
+        model_name=model_name,
+        auto_download=auto_download,
+        download_path=download_path,
+        max_polling_attempts=max_polling_attempts,
+        polling_interval=polling_interval,
+        show_polling_progress=show_polling_progress,
+        polling_policy=polling_policy,
+        cache=cache,
+        **kwargs
+    ))
+
+async def VTON_async(
+    model_image: ImageInput,
+    garment_image: ImageInput,
+    model_name: str = "fashnai",
+    auto_download: bool = False,
+    download_path: Optional[str] = None,
+    max_polling_attempts: int = 60,
+    polling_interval: int = 5,
+    show_polling_progress: bool = False,
+    polling_policy: Union[PollingPolicy, str, None] = None,
+    cache: Union[bool, ResultCache, None] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """Generate a virtual try-on image without blocking the event loop.
+    
+    Args:
+        model_image: Model/person image, as a path, bytes, a binary file
+            object or a PIL image
+        garment_image: Garment image, in any of the same forms
+        model_name: Name of the model to use (e.g., "fashnai", "replicate")
+        auto_download: Whether to automatically download the result
+        download_path: Path to save the downloaded image
+        max_polling_attempts: Maximum number of polling attempts
+        polling_interval: Time between polling attempts in seconds
+        show_polling_progress: Whether to show polling progress
+        polling_policy: PollingPolicy, "adaptive" (learn each provider's
+            completion times) or None for a fixed polling_interval
+        cache: True to reuse results from the process-wide result cache
+            (see :mod:`tryon_tray.utils.result_cache`), or a ResultCache;
+            an identical earlier job is returned without calling the
+            provider, with ``"cached": True``
+        **kwargs: Additional model-specific parameters, and
+            ``result_sink`` to store the results somewhere other than local
+            files (see :mod:`tryon_tray.utils.sinks`)
         
     Returns:
         Dictionary containing result URLs and metadata
@@ -42,11 +117,254 @@ def VTON(
         **kwargs
     )
     
+    client = get_async_client()
+    result_cache = resolve_result_cache(cache)
+    if result_cache is not None:
+        with service.timing.phase("cache"):
+            key = await client.run(service.cache_key)
+            cached = await client.run(result_cache.get, key)
+        if cached is not None:
+            return await client.run(service._restore_cached, cached)
+    
     # Run generation and wait for completion
-    service.run_and_wait(
+    await service.run_and_wait_async(
         max_attempts=max_polling_attempts,
-        delay=polling_interval
+        delay=polling_interval,
+        polling_policy=polling_policy
     )
     
     # Get result with metadata
-    return service.get_result() 
\ No newline at end of file
+    with service.timing.phase("postprocess"):
+        result = service.get_result()
+        if result_cache is not None:
+            try:
+                outputs = await client.run(service._result_files)
+            except DownloadError:
+                # Without its files the result is not worth caching
+                return result
+            metadata = {k: v for k, v in result.items() if k not in service.RUN_FIELDS}
+            await client.run(result_cache.put, key, service.provider, metadata, outputs)
+    return result
+
+def VTON_batch(
+    pairs: Iterable[Sequence[Any]],
+    model_name: str = "fashnai",
+    max_concurrency: int = 8,
+    max_polling_attempts: int = 60,
+    polling_interval: int = 5,
+    preprocess_workers: Optional[int] = None,
+    **kwargs
+) -> Iterator[VTONBatchResult]:
+    """Run many virtual try-on jobs and yield results as each one finishes.
+    
+    Blocking wrapper around :func:`VTON_batch_async`.
+    
+    Args:
+        pairs: Jobs as (model_image, garment_image) or
+            (model_image, garment_image, params) tuples
+        model_name: Name of the model to use (e.g., "fashnai", "alphabake")
+        max_concurrency: Maximum number of jobs in flight at once
+        max_polling_attempts: Maximum number of polling attempts per job
+        polling_interval: Time between polling attempts in seconds
+        preprocess_workers: Number of processes that preprocess input images
+            when ``preprocess`` is set (defaults to the number of CPUs)
+        **kwargs: Model-specific parameters shared by every job, e.g.
+            preprocess=True to resize and re-encode inputs before upload
+        
+    Yields:
+        VTONBatchResult for each job, in completion order
+    """
+    return iterate_sync(VTON_batch_async(
+        pairs,
+        model_name=model_name,
+        max_concurrency=max_concurrency,
+        max_polling_attempts=max_polling_attempts,
+        polling_interval=polling_interval,
+        preprocess_workers=preprocess_workers,
+        **kwargs
+    ))
+
+async def VTON_batch_async(
+    pairs: Iterable[Sequence[Any]],
+    model_name: str = "fashnai",
+    max_concurrency: int = 8,
+    max_polling_attempts: int = 60,
+    polling_interval: int = 5,
+    preprocess_workers: Optional[int] = None,
+    **kwargs
+) -> AsyncIterator[VTONBatchResult]:
+    """Run many virtual try-on jobs and yield results as each one finishes.
+    
+    Jobs are pulled from ``pairs`` lazily, so at most ``max_concurrency``
+    of them are being encoded, submitted, polled or downloaded at a time,
+    and a slow job never holds back the ones queued behind it. With
+    ``preprocess`` set, images are preprocessed in a process pool shared by
+    the batch, so resizing does not compete with the event loop for the GIL.
+    
+    Takes the same arguments as :func:`VTON_batch`.
+    
+    Yields:
+        VTONBatchResult for each job, in completion order
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    
+    async def run_job(index: int, job: Sequence[Any]) -> VTONBatchResult:
+        model_image, garment_image = job[0], job[1]
+        params = dict(job[2]) if len(job) > 2 and job[2] else {}
+        batch_result = VTONBatchResult(
+            index=index,
+            model_image=model_image,
+            garment_image=garment_image,
+            params=params
+        )
+        try:
+            batch_result.result = await VTON_async(
+                model_image=model_image,
+                garment_image=garment_image,
+                model_name=model_name,
+                max_polling_attempts=max_polling_attempts,
+                polling_interval=polling_interval,
+                **{**kwargs, **params}
+            )
+        except Exception as e:
+            batch_result.error = e
+        return batch_result
+    
+    pool = None
+    if kwargs.get("preprocess") and kwargs.get("preprocess_executor") is None:
+        pool = ProcessPoolExecutor(max_workers=preprocess_workers)
+        kwargs["preprocess_executor"] = pool
+    
+    jobs = (run_job(index, job) for index, job in enumerate(pairs))
+    completed = _as_completed(jobs, max_concurrency)
+    try:
+        async for batch_result in completed:
+            yield batch_result
+    finally:
+        await completed.aclose()
+        if pool is not None:
+            # Cancelling the remaining jobs cancelled their queued preprocessing
+            pool.shutdown(wait=False)
+
+def VTON_fanout(
+    model_image: ImageInput,
+    garment_image: ImageInput,
+    model_names: Iterable[str],
+    params: Optional[Dict[str, Dict[str, Any]]] = None,
+    max_polling_attempts: int = 60,
+    polling_interval: int = 5,
+    **kwargs
+) -> Iterator[VTONProviderResult]:
+    """Send one input pair to several providers and yield results as each finishes.
+    
+    Blocking wrapper around :func:`VTON_fanout_async`.
+    
+    Args:
+        model_image: Model/person image, as a path, bytes, a binary file
+            object or a PIL image
+        garment_image: Garment image, in any of the same forms
+        model_names: Names of the registered models to run (e.g., ["fashnai", "klingai"])
+        params: Model-specific parameters keyed by model name; these may
+            also override model_image and garment_image for one provider
+        max_polling_attempts: Maximum number of polling attempts per provider
+        polling_interval: Time between polling attempts in seconds
+        **kwargs: Parameters shared by every provider
+        
+    Yields:
+        VTONProviderResult for each provider, in completion order
+    """
+    return iterate_sync(VTON_fanout_async(
+        model_image,
+        garment_image,
+        model_names,
+        params=params,
+        max_polling_attempts=max_polling_attempts,
+        polling_interval=polling_interval,
+        **kwargs
+    ))
+
+async def VTON_fanout_async(
+    model_image: ImageInput,
+    garment_image: ImageInput,
+    model_names: Iterable[str],
+    params: Optional[Dict[str, Dict[str, Any]]] = None,
+    max_polling_attempts: int = 60,
+    polling_interval: int = 5,
+    **kwargs
+) -> AsyncIterator[VTONProviderResult]:
+    """Send one input pair to several providers and yield results as each finishes.
+    
+    All providers run at once, so the whole call takes as long as the
+    slowest provider rather than the sum of all of them.
+    
+    Takes the same arguments as :func:`VTON_fanout`.
+    
+    Yields:
+        VTONProviderResult for each provider, in completion order
+    """
+    params = params or {}
+    # Read file objects once, so every provider gets the same image
+    model_image = load_image_input(model_image)
+    garment_image = load_image_input(garment_image)
+    
+    async def run_provider(model_name: str) -> VTONProviderResult:
+        provider_params = {
+            "model_image": model_image,
+            "garment_image": garment_image,
+            **kwargs,
+            **params.get(model_name, {})
+        }
+        provider_result = VTONProviderResult(model_name=model_name, params=provider_params)
+        try:
+            provider_result.result = await VTON_async(
+                model_name=model_name,
+                max_polling_attempts=max_polling_attempts,
+                polling_interval=polling_interval,
+                **provider_params
+            )
+        except Exception as e:
+            provider_result.error = e
+        return provider_result
+    
+    model_names = list(model_names)
+    jobs = (run_provider(model_name) for model_name in model_names)
+    completed = _as_completed(jobs, max(len(model_names), 1))
+    try:
+        async for provider_result in completed:
+            yield provider_result
+    finally:
+        await completed.aclose()
+
+async def _as_completed(
+    jobs: Iterator[Awaitable[T]],
+    max_concurrency: int
+) -> AsyncIterator[T]:
+    """Await jobs with bounded concurrency and yield results in completion order.
+    
+    Jobs are pulled from the iterator only when a slot frees up. Jobs still
+    pending when the consumer stops iterating are cancelled.
+    """
+    pending = set()
+    
+    def fill() -> None:
+        while len(pending) < max_concurrency:
+            try:
+                job = next(jobs)
+            except StopIteration:
+                return
+            pending.add(asyncio.ensure_future(job))
+    
+    try:
+        fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            fill()
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
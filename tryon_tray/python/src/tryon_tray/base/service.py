@@ -1,18 +1,378 @@
 """Base class for all services."""
 
 from abc import ABC
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple, Union
+import asyncio
+import hashlib
+import time
+import requests
+
+from ..types.timing import JobTiming
+from ..utils.callbacks import CallbackReceiver, get_callback_receiver
+from ..types.download import DownloadResult
+from ..utils.file_io import fetch_image, stream_base64
+from ..utils.hooks import JobHooks, emit, get_hooks
+from ..utils.http import get_async_client
+from ..utils.image_input import image_label, is_url
+from ..utils.journal import JobJournal, JournalEntry, resolve_job_journal
+from ..utils.payload_cache import get_payload_cache
+from ..utils.preprocess import ImageSpec, preprocess_async, resolve_image_spec
+from ..utils.polling import FixedPolling, PollingPolicy, get_poll_scheduler
+from ..utils.ratelimit import Governor, get_governor
 
 class BaseService(ABC):
     """Base class for all services."""
-    
+
+    # Provider name used to key per-provider state such as learned polling schedules
+    PROVIDER = None
+
+    # Provider whose rate limits this service shares (defaults to PROVIDER)
+    RATE_LIMIT_PROVIDER = None
+
+    # Whether the provider can call a URL given at submit time when the job completes
+    SUPPORTS_CALLBACKS = False
+
+    # Seconds between safety-net polls while waiting for a completion callback
+    CALLBACK_FALLBACK_INTERVAL = 60
+
+    # Whether the provider can fetch input images from URLs itself
+    ACCEPTS_IMAGE_URLS = False
+
+    # Input image attribute names keyed by role ("human", "garment", "source")
+    IMAGE_INPUTS: Dict[str, str] = {}
+
+    URL_MODES = ("auto", "passthrough", "inline")
+
+    # ServiceType name the job journal recreates this service under
+    SERVICE_TYPE: Optional[str] = None
+
+    # Attributes identifying a submitted job at the provider; services
+    # without any are not written to the job journal
+    JOB_STATE: Tuple[str, ...] = ()
+
+    # Parameters never written to the job journal
+    UNJOURNALED_PARAMS = frozenset({
+        "api_key", "callbacks", "preprocess", "preprocess_executor", "journal", "result_sink", "hooks"
+    })
+
+    @property
+    def provider(self) -> str:
+        """Name of the provider behind this service."""
+        return self.PROVIDER or self.__class__.__name__
+
+    @property
+    def governor(self) -> Governor:
+        """Rate and concurrency limiter for this provider and API key."""
+        return get_governor(self.RATE_LIMIT_PROVIDER or self.provider, self.api_key)
+
     def __init__(self, **kwargs):
-        """Initialize service with optional parameters."""
+        """Initialize service with optional parameters.
+
+        Args:
+            **kwargs: Service parameters, including:
+                callbacks: True (process-wide receiver) or a CallbackReceiver
+                    to have the provider push completion instead of polling
+                callback_fallback_interval: Poll interval while waiting for
+                    a callback in seconds
+                preprocess: True to resize and re-encode input images for
+                    the provider before upload, an ImageSpec, or a dict of
+                    ImageSpec per role ("human", "garment", "source")
+                preprocess_executor: Executor to preprocess images on
+                    (e.g. a ProcessPoolExecutor shared by a batch)
+                url_mode: How image URLs are sent. "auto" passes them to
+                    providers that accept URLs unless preprocessing is on and
+                    downloads them for the rest; "passthrough" always passes
+                    them; "inline" always downloads and uploads the bytes
+                journal: True or a JobJournal to record the job once
+                    submitted, so it can be resumed after a crash; False
+                    to skip the journal configured process-wide
+                hooks: JobHooks (or a list of them) that receive this job's
+                    lifecycle events, in addition to those added with
+                    :func:`~tryon_tray.utils.hooks.add_hooks`
+        """
         self.api_key = kwargs.get("api_key")
         self.result_data = None
-    
+        self.callbacks = kwargs.get("callbacks")
+        self.callback_fallback_interval = kwargs.get(
+            "callback_fallback_interval", self.CALLBACK_FALLBACK_INTERVAL
+        )
+        self.callback_url: Optional[str] = None
+        self.preprocess = kwargs.get("preprocess")
+        self.preprocess_executor = kwargs.get("preprocess_executor")
+        self.url_mode = kwargs.get("url_mode", "auto")
+        if self.url_mode not in self.URL_MODES:
+            raise ValueError(f"url_mode must be one of {self.URL_MODES}, got {self.url_mode!r}")
+        if self.url_mode == "passthrough" and not self.ACCEPTS_IMAGE_URLS:
+            raise ValueError(f"{self.provider} does not accept image URLs")
+        self.journal = kwargs.get("journal")
+        self.journal_id: Optional[int] = None
+        self._job_journal: Optional[JobJournal] = None
+        self._lease_renewed_at = 0.0
+        self.timing = JobTiming()
+        hooks = kwargs.get("hooks") or ()
+        self.hooks: List[JobHooks] = [hooks] if isinstance(hooks, JobHooks) else list(hooks)
+        self.downloads: List[DownloadResult] = []
+
+    def image_spec(self, role: str) -> Optional[ImageSpec]:
+        """How to preprocess the input image with the given role, or None to send it as is."""
+        return resolve_image_spec(self.preprocess, self.provider, role)
+
+    def _image_inputs(self) -> List[Tuple[Any, str]]:
+        """Input images as (image, role) pairs."""
+        return [(getattr(self, attr), role) for role, attr in self.IMAGE_INPUTS.items()]
+
+    def _passes_image_urls(self) -> bool:
+        """Whether image URLs are sent to the provider as URLs rather than as data."""
+        if self.url_mode == "auto":
+            return self.ACCEPTS_IMAGE_URLS and not self.preprocess
+        return self.url_mode == "passthrough"
+
+    def _inline_image_urls(self) -> None:
+        """Download URL inputs that are not passed to the provider as URLs.
+
+        Images are held in memory, so they are uploaded like any other
+        in-memory input. Inputs already downloaded are left alone.
+        """
+        if self._passes_image_urls():
+            return
+        for role, attr in self.IMAGE_INPUTS.items():
+            image = getattr(self, attr)
+            if is_url(image):
+                setattr(self, attr, fetch_image(image))
+
+    def _image_value(self, image: Any, role: str, data_uri: bool = False) -> Union[str, Any]:
+        """JSON payload value for an input image: its URL, or its base64 encoding."""
+        if is_url(image):
+            return image
+        return stream_base64(image, data_uri=data_uri, spec=self.image_spec(role))
+
+    async def _preprocess_inputs(self) -> None:
+        """Preprocess input images into the payload cache before submitting."""
+        for path, role in self._image_inputs():
+            spec = self.image_spec(role)
+            if spec and not is_url(path):
+                await preprocess_async(path, spec, executor=self.preprocess_executor)
+
+    def _input_digests(self) -> Dict[str, str]:
+        """Content hash of each input image (or its URL), keyed by role."""
+        digests = {}
+        for image, role in self._image_inputs():
+            digests[role] = f"url:{image}" if is_url(image) else get_payload_cache().content_hash(image)
+        return digests
+
+    def _journal_model_name(self) -> str:
+        """Name the service is registered under in the service factory."""
+        return self.provider
+
+    def _journal_params(self) -> Dict[str, Any]:
+        """Arguments that recreate this service to collect a journaled job."""
+        return {attr: image_label(getattr(self, attr)) for attr in self.IMAGE_INPUTS.values()}
+
+    def _record_submission(self) -> None:
+        """Write the job the provider just accepted to the job journal."""
+        journal = resolve_job_journal(self.journal)
+        if journal is None or not self.JOB_STATE:
+            return
+        digests = self._input_digests()
+        inputs_hash = hashlib.sha256("".join(f"{role}={digests[role]};" for role in sorted(digests)).encode()).hexdigest()
+        self._job_journal = journal
+        self.journal_id = journal.record(
+            service_type=self.SERVICE_TYPE,
+            model_name=self._journal_model_name(),
+            provider=self.provider,
+            remote_state={attr: getattr(self, attr) for attr in self.JOB_STATE},
+            inputs_hash=inputs_hash,
+            params=self._journal_params()
+        )
+        self._lease_renewed_at = time.monotonic()
+
+    def _restore_submission(self, journal: JobJournal, entry: JournalEntry) -> None:
+        """Take over a journaled job, to collect it without submitting it again."""
+        for attr, value in entry.remote_state.items():
+            setattr(self, attr, value)
+        # Only the time since the restart can be split into phases
+        self.timing.started_at = datetime.fromtimestamp(entry.submitted_at)
+        self._job_journal = journal
+        self.journal_id = entry.id
+        self._lease_renewed_at = time.monotonic()
+
+    def _renew_lease(self) -> None:
+        """Keep the journaled job leased to this worker while it is polled."""
+        if self._job_journal is None or self.journal_id is None:
+            return
+        now = time.monotonic()
+        if now - self._lease_renewed_at >= self._job_journal.lease / 3:
+            self._lease_renewed_at = now
+            self._job_journal.renew(self.journal_id)
+
+    def _release_lease(self) -> None:
+        """Let another worker resume the journaled job this one gave up on."""
+        if self._job_journal is not None and self.journal_id is not None:
+            self._job_journal.release(self.journal_id)
+
+    def _record_outcome(self, result: Any = None, error: Optional[Exception] = None) -> None:
+        """Mark the journaled job completed or failed."""
+        if self._job_journal is None or self.journal_id is None:
+            return
+        if error is not None:
+            self._job_journal.fail(self.journal_id, str(error))
+        else:
+            self._job_journal.complete(self.journal_id, result)
+
+    def on_submit(self) -> None:
+        """Called once the provider has accepted the job."""
+        self._emit("on_submit")
+
+    def on_poll(self) -> None:
+        """Called before every status check."""
+        self._emit("on_poll")
+
+    def on_complete(self, result: Any) -> None:
+        """Called when the provider has finished the job."""
+        self._emit("on_complete", result)
+
+    def on_error(self, error: BaseException) -> None:
+        """Called when the job fails, times out or cannot be submitted."""
+        self._emit("on_error", error)
+
+    def on_download(self, results: List[DownloadResult]) -> None:
+        """Called once the result files have been stored."""
+        self._emit("on_download", results)
+
+    def _emit(self, event: str, *args: Any) -> None:
+        """Send a lifecycle event to the process-wide hooks and this job's hooks."""
+        hooks = get_hooks() + tuple(self.hooks)
+        if hooks:
+            emit(hooks, event, self, *args)
+
+    def _callback_receiver(self) -> Optional[CallbackReceiver]:
+        """Receiver to register jobs with, or None to rely on polling alone."""
+        if not self.callbacks or not self.SUPPORTS_CALLBACKS:
+            return None
+        if isinstance(self.callbacks, CallbackReceiver):
+            return self.callbacks
+        return get_callback_receiver()
+
+    async def _submit_and_wait(
+        self,
+        submit: Optional[Callable[[], Awaitable[Any]]],
+        policy: PollingPolicy,
+        max_attempts: int,
+        on_poll: Optional[Callable[[], None]] = None
+    ) -> Any:
+        """Submit a job and wait until its status check reports completion.
+
+        Image URLs the provider is not sent are downloaded first, and input
+        images are preprocessed if enabled. The job holds one of the
+        provider's in-flight slots from submission until it completes. With
+        callbacks enabled on a provider that supports them, the job's
+        callback URL is set as ``self.callback_url`` before submitting, and
+        the polling policy is replaced by slow fallback polling that the
+        callback cuts short.
+
+        Each phase of the job is timed in ``self.timing``, and the job's
+        lifecycle events (``on_submit``, ``on_poll``, ``on_complete`` and
+        ``on_error``) are sent to its hooks.
+
+        Once the provider accepts the job it is written to the job journal,
+        if enabled, and marked completed or failed when it finishes. The job
+        stays leased to this worker while it is polled; jobs that time out
+        or lose their process stay pending, to be resumed.
+
+        Args:
+            submit: Coroutine function that starts the job, or None to wait
+                for a job restored from the journal
+            policy: Polling policy used without callbacks
+            max_attempts: Maximum number of status checks
+            on_poll: Optional callable invoked before every status check
+
+        Returns:
+            Result reported by ``self.check_status``
+        """
+        def poll() -> None:
+            self._renew_lease()
+            self.on_poll()
+            if on_poll:
+                on_poll()
+
+        try:
+            result = await self._run_job(submit, policy, max_attempts, poll)
+        except Exception as e:
+            self.on_error(e)
+            raise
+        self.on_complete(result)
+        return result
+
+    async def _run_job(
+        self,
+        submit: Optional[Callable[[], Awaitable[Any]]],
+        policy: PollingPolicy,
+        max_attempts: int,
+        on_poll: Callable[[], None]
+    ) -> Any:
+        client = get_async_client()
+        if submit is not None:
+            with self.timing.phase("encode"):
+                await client.run(self._inline_image_urls)
+                await self._preprocess_inputs()
+
+        governor = self.governor
+        slot = governor.reserve()
+        try:
+            with self.timing.phase("throttle"):
+                await asyncio.wrap_future(slot)
+        except asyncio.CancelledError:
+            if not slot.cancel():
+                # The slot was granted just as we gave up waiting
+                governor.release()
+            raise
+
+        # A resumed job was submitted without this process's callback URL
+        receiver = self._callback_receiver() if submit is not None else None
+        registration = receiver.register() if receiver else None
+        try:
+            if registration:
+                self.callback_url = registration.url
+                interval = self.callback_fallback_interval
+                policy = FixedPolling(interval, initial_delay=interval)
+            if submit is not None:
+                with self.timing.phase("submit"):
+                    await submit()
+                await client.run(self._record_submission)
+                self.on_submit()
+
+            if getattr(self, "show_polling_progress", False):
+                print("\nPolling for results", end="", flush=True)
+
+            scheduler = get_poll_scheduler()
+            future = scheduler.submit(
+                self.check_status,
+                max_attempts=max_attempts,
+                on_poll=on_poll,
+                policy=policy
+            )
+            if registration:
+                registration.attach(future, scheduler)
+            try:
+                with self.timing.phase("inference"):
+                    result = await asyncio.wrap_future(future)
+            except (TimeoutError, requests.RequestException):
+                # The job may still finish at the provider; leave it pending
+                await client.run(self._release_lease)
+                raise
+            except Exception as e:
+                await client.run(self._record_outcome, None, e)
+                raise
+            await client.run(self._record_outcome, result)
+            return result
+        finally:
+            governor.release()
+            if registration:
+                registration.close()
+
     def get_result(self) -> Dict[str, Any]:
         """Get operation results."""
         if not self.result_data:
             raise ValueError("No result available. Run the operation first.")
-        return self.result_data 
\ No newline at end of file
+        return self.result_data
\ No newline at end of file
@@ -1,21 +1,30 @@
 """Base class for video generation services."""
 
 from abc import abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple, Union
 import time
-from datetime import datetime
 from pathlib import Path
 import requests
 
 from .service import BaseService
-from ..utils.file_io import download_file
+from ..types.download import DownloadError
+from ..utils.download import get_downloader
+from ..utils.http import get_async_client, run_sync
+from ..utils.image_input import ImageData, ImageInput, image_label, load_image_input
+from ..utils.polling import resolve_polling_policy
+from ..utils.sinks import LocalFileSink, ResultSink
 
 class BaseVideoGen(BaseService):
     """Base class for video generation services."""
     
+    MAX_POLLING_ATTEMPTS = 120
+    POLLING_INTERVAL = 5
+    IMAGE_INPUTS = {"source": "source_image"}
+    SERVICE_TYPE = "VIDEO"
+    
     def __init__(
         self,
-        source_image: str,
+        source_image: ImageInput,
         prompt: str,
         model_name: str = "kling-v1-5",
         mode: str = "std",
@@ -26,12 +35,14 @@ class BaseVideoGen(BaseService):
         auto_download: bool = False,
         download_path: Optional[str] = None,
         show_polling_progress: bool = False,
+        result_sink: Optional[ResultSink] = None,
         **kwargs
     ):
         """Initialize video generation service.
         
         Args:
-            source_image: Path or URL to the source image
+            source_image: Path or URL to the source image, or the image
+                as bytes, a binary file object or a PIL image
             prompt: Text description of desired video
             model_name: Name of the model to use
             mode: Generation mode (e.g., "standard" or "professional")
@@ -42,10 +53,14 @@ class BaseVideoGen(BaseService):
             auto_download: Whether to automatically download the generated video
             download_path: Path to save the downloaded video
             show_polling_progress: Whether to show polling progress
-            **kwargs: Additional service-specific parameters
+            result_sink: Where to store the video instead of
+                ``download_path`` (e.g. S3Sink); the video is always
+                downloaded when set
+            **kwargs: Additional service-specific parameters, including
+                max_polling_attempts, polling_interval and polling_policy
         """
         super().__init__(**kwargs)
-        self.source_image = source_image
+        self.source_image: Union[str, Path, ImageData] = load_image_input(source_image)
         self.prompt = prompt
         self.model_name = model_name
         self.mode = mode
@@ -54,12 +69,16 @@ class BaseVideoGen(BaseService):
         self.cfg_scale = cfg_scale
         self.seed = seed
         self.result_url = None
+        self.result_sink = result_sink
+        self.output: Any = None
+        self.download_error: Optional[DownloadError] = None
         self.auto_download = auto_download
         self.download_path = download_path
         self.show_polling_progress = show_polling_progress
-        self.start_time = None
-        self.end_time = None
-        self.time_taken = None
+        self.max_polling_attempts = kwargs.get("max_polling_attempts", self.MAX_POLLING_ATTEMPTS)
+        self.polling_interval = kwargs.get("polling_interval", self.POLLING_INTERVAL)
+        self.polling_policy = kwargs.get("polling_policy")
+        self.params = kwargs
         
     def _print_polling_progress(self):
         """Print polling progress if enabled."""
@@ -67,21 +86,30 @@ class BaseVideoGen(BaseService):
             print(".", end="", flush=True)
     
     def _download_video(self) -> str:
-        """Download the generated video."""
+        """Download the generated video.
+        
+        The video goes to ``result_sink``, or to ``download_path``. A failed
+        download is recorded in ``download_error`` rather than raised, so
+        the video URL is kept.
+        
+        Returns:
+            Where the video was stored
+        """
         if not self.result_url:
             raise ValueError("No video URL available")
-            
-        if not self.download_path:
-            # Generate default path if none provided
-            timestamp = int(time.time())
-            self.download_path = f"outputs/video_{timestamp}.mp4"
-            
-        # Ensure directory exists
-        Path(self.download_path).parent.mkdir(parents=True, exist_ok=True)
         
-        # Download the file
-        download_file(self.result_url, self.download_path)
-        return self.download_path
+        sink = self.result_sink
+        if sink is None:
+            if not self.download_path:
+                # Generate default path if none provided
+                timestamp = int(time.time())
+                self.download_path = f"outputs/video_{timestamp}.mp4"
+            sink = LocalFileSink(self.download_path, resume=get_downloader().resume)
+        
+        [result] = self.downloads = get_downloader().save_all([self.result_url], sink)
+        self.output = result.location
+        self.download_error = result.error
+        return result.path
         
     @abstractmethod
     def validate_parameters(self) -> None:
@@ -98,6 +126,72 @@ class BaseVideoGen(BaseService):
         """Process API response and return video URL."""
         pass
     
+    @abstractmethod
+    def submit(self) -> str:
+        """Create the generation task and return its ID."""
+        pass
+    
+    @abstractmethod
+    def check_status(self) -> Tuple[bool, Optional[Union[str, Exception]]]:
+        """Check current status of the generation task.
+        
+        Returns:
+            Tuple containing:
+            - bool: Whether the task is complete
+            - Optional[Union[str, Exception]]: Video URL or error
+        """
+        pass
+    
+    def run(self) -> None:
+        """Run the video generation process.
+        
+        Blocking wrapper around :meth:`run_async`.
+        """
+        run_sync(self.run_async())
+    
+    async def run_async(self) -> None:
+        """Run the video generation process without blocking the event loop."""
+        client = get_async_client()
+        
+        # Submit the task and poll for results (or wait for its callback)
+        await self._generate(lambda: client.run(self.submit))
+    
+    async def resume_async(self) -> None:
+        """Wait for a task restored from the job journal, without submitting it."""
+        await self._generate(None)
+    
+    def _journal_model_name(self) -> str:
+        return self.model_name
+    
+    def _journal_params(self) -> Dict[str, Any]:
+        """Arguments that recreate this service to collect a journaled task."""
+        params = {k: v for k, v in self.params.items() if k not in self.UNJOURNALED_PARAMS}
+        return {
+            **super()._journal_params(),
+            "prompt": self.prompt,
+            "mode": self.mode,
+            "duration": self.duration,
+            "negative_prompt": self.negative_prompt,
+            "cfg_scale": self.cfg_scale,
+            "seed": self.seed,
+            "auto_download": self.auto_download,
+            "download_path": self.download_path,
+            **params
+        }
+    
+    async def _generate(self, submit: Optional[Callable[[], Awaitable[Any]]]) -> None:
+        client = get_async_client()
+        await self._submit_and_wait(
+            submit,
+            policy=resolve_polling_policy(self.polling_policy, self.provider, self.polling_interval),
+            max_attempts=self.max_polling_attempts,
+            on_poll=self._print_polling_progress
+        )
+        if self.auto_download or self.result_sink is not None:
+            with self.timing.phase("download"):
+                await client.run(self._download_video)
+            self.on_download(self.downloads)
+    
     def get_result(self) -> Dict[str, Any]:
         """Get the generation result."""
         if not self.result_url:
@@ -105,19 +199,19 @@ class BaseVideoGen(BaseService):
             
         result = {
             "video_url": self.result_url,
-            "source_image": self.source_image,
+            "source_image": image_label(self.source_image),
             "prompt": self.prompt,
             "mode": self.mode,
             "duration": self.duration,
-            "timing": {
-                "start_time": self.start_time.isoformat() if self.start_time else None,
-                "end_time": self.end_time.isoformat() if self.end_time else None,
-                "time_taken": str(self.time_taken) if self.time_taken else None
-            }
+            "timing": self.timing
         }
         
-        # Add download path if auto-downloaded
-        if self.auto_download and self.download_path:
+        # Add where the video was stored if downloaded
+        if self.download_error:
+            result["download_error"] = self.download_error
+        elif self.result_sink is not None:
+            result["output"] = self.output
+        elif self.auto_download and self.download_path:
             result["local_path"] = self.download_path
             
         return result 
\ No newline at end of file
@@ -1,43 +1,78 @@
 """Base class for virtual try-on services."""
 
 from abc import abstractmethod
-from typing import Dict, Any, Optional, List, Union, Tuple
+from typing import Dict, Any, Awaitable, Callable, Optional, List, Union, Tuple
 from pathlib import Path
-import time
+import hashlib
+import json
 import requests
 
 from .service import BaseService
-from ..utils.file_io import download_file
+from ..types.download import DownloadError
+from ..utils.download import get_downloader
+from ..utils.http import get_async_client, run_sync
+from ..utils.image_input import ImageData, ImageInput, image_label, load_image_input
+from ..utils.polling import PollingPolicy, resolve_polling_policy
+from ..utils.result_cache import CachedResult
+from ..utils.sinks import LocalFileSink, MemorySink, ResultSink
 
 class BaseVTON(BaseService):
     """Base class for virtual try-on services."""
     
+    IMAGE_INPUTS = {"human": "model_image", "garment": "garment_image"}
+    SERVICE_TYPE = "VTON"
+    
+    # Model the provider runs, part of the result cache key
+    MODEL_VERSION: Optional[str] = None
+    
+    # Generation parameters the provider defaults when they are not given
+    DEFAULT_PARAMS: Dict[str, Any] = {}
+    
+    # Parameters that change how a job runs but not what it produces
+    RUNTIME_PARAMS = frozenset({
+        "api_key", "base_url", "callbacks", "callback_fallback_interval",
+        "preprocess", "preprocess_executor", "url_mode", "journal", "hooks"
+    })
+    
+    # Result entries that describe one run of a job (where its results were
+    # downloaded to and how long it took) rather than the result itself
+    RUN_FIELDS = ("local_paths", "local_path", "outputs", "download_errors", "timing")
+    
     def __init__(
         self,
-        model_image: str,
-        garment_image: str,
+        model_image: ImageInput,
+        garment_image: ImageInput,
         auto_download: bool = False,
         download_path: Optional[str] = None,
         show_polling_progress: bool = False,
+        result_sink: Optional[ResultSink] = None,
         **kwargs
     ):
         """Initialize virtual try-on service.
         
         Args:
-            model_image: Path to the model/person image
-            garment_image: Path to the garment image
+            model_image: Model/person image, as a path, bytes, a binary
+                file object or a PIL image
+            garment_image: Garment image, in any of the same forms
             auto_download: Whether to automatically download the result
             download_path: Path to save the downloaded image
             show_polling_progress: Whether to show polling progress
+            result_sink: Where to store the results instead of
+                ``download_path`` (e.g. MemorySink or S3Sink); results are
+                always downloaded when set
             **kwargs: Additional service-specific parameters
         """
         super().__init__(**kwargs)
-        self.model_image = model_image
-        self.garment_image = garment_image
+        self.model_image: Union[str, Path, ImageData] = load_image_input(model_image)
+        self.garment_image: Union[str, Path, ImageData] = load_image_input(garment_image)
         self.auto_download = auto_download
         self.download_path = download_path
         self.show_polling_progress = show_polling_progress
+        self.result_sink = result_sink
         self.result_urls: List[str] = []
+        self.outputs: List[Any] = []
+        self.local_paths: List[str] = []
+        self.download_errors: List[DownloadError] = []
         self.params = kwargs
         
     def _print_polling_progress(self):
@@ -45,56 +80,225 @@ class BaseVTON(BaseService):
         if self.show_polling_progress:
             print(".", end="", flush=True)
     
+    def _sink(self) -> Optional[ResultSink]:
+        """Where results are downloaded to, or None to only return URLs."""
+        if self.result_sink is not None:
+            return self.result_sink
+        if self.auto_download and self.download_path:
+            return LocalFileSink(self.download_path, resume=get_downloader().resume)
+        return None
+    
     def _download_result(self) -> str:
-        """Download the generated image."""
+        """Download every generated image at once.
+        
+        Images go to ``result_sink``, or to ``download_path`` where several
+        are numbered before its extension. Images that fail to download are
+        recorded in ``download_errors`` rather than raised, so the result
+        URLs are kept.
+        
+        Returns:
+            Location of the first image
+        """
         if not self.result_urls:
             raise ValueError("No result URLs available")
-            
-        if not self.download_path:
+        
+        sink = self._sink()
+        if sink is None:
             raise ValueError("No download path specified")
-            
-        # Ensure directory exists
-        Path(self.download_path).parent.mkdir(parents=True, exist_ok=True)
         
-        # Download the first result
-        download_file(self.result_urls[0], self.download_path)
-        return self.download_path
+        results = get_downloader().save_all(self.result_urls, sink)
+        self.downloads = results
+        self.outputs = [r.location for r in results if r.ok]
+        self.local_paths = self.outputs if isinstance(sink, LocalFileSink) else []
+        self.download_errors = [r.error for r in results if not r.ok]
+        return results[0].path
+    
+    def _download_fields(self) -> Dict[str, Any]:
+        """Result entries for downloaded images."""
+        sink = self._sink()
+        if sink is None:
+            return {}
+        if isinstance(sink, LocalFileSink):
+            fields: Dict[str, Any] = {"local_paths": self.local_paths}
+            if self.local_paths:
+                fields["local_path"] = self.local_paths[0]
+        else:
+            fields = {"outputs": self.outputs}
+        if self.download_errors:
+            fields["download_errors"] = self.download_errors
+        return fields
+    
+    def generation_params(self) -> Dict[str, Any]:
+        """Parameters that determine the result, with provider defaults filled in."""
+        params = {k: v for k, v in self.params.items() if k not in self.RUNTIME_PARAMS}
+        return {**self.DEFAULT_PARAMS, **params}
+    
+    def cache_key(self) -> str:
+        """Key identifying this job's result in a :class:`ResultCache`.
+        
+        Two jobs share a key when they run the same provider and model
+        version with the same generation parameters on inputs with the same
+        content (URLs are keyed by the URL) and the same preprocessing.
+        """
+        inputs = {}
+        for role, content in self._input_digests().items():
+            spec = self.image_spec(role)
+            inputs[role] = [content, spec.variant if spec else None]
+        material = {
+            "provider": self.provider,
+            "model_version": self.MODEL_VERSION,
+            "params": self.generation_params(),
+            "inputs": inputs
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def _journal_params(self) -> Dict[str, Any]:
+        """Arguments that recreate this service to collect a journaled job."""
+        params = {k: v for k, v in self.params.items() if k not in self.UNJOURNALED_PARAMS}
+        return {
+            **super()._journal_params(),
+            "auto_download": self.auto_download,
+            "download_path": self.download_path,
+            **params
+        }
+    
+    def _result_files(self) -> List[bytes]:
+        """Bytes of every result file, for storing in the result cache.
+        
+        Files already downloaded to local paths or a MemorySink are reused;
+        otherwise they are downloaded into memory.
+        
+        Raises:
+            DownloadError: If a result file could not be downloaded
+        """
+        count = len(self.result_urls)
+        if isinstance(self._sink(), LocalFileSink) and len(self.local_paths) == count:
+            return [Path(path).read_bytes() for path in self.local_paths]
+        if isinstance(self.result_sink, MemorySink) and len(self.outputs) == count:
+            return [self.result_sink.getvalue(i) for i in range(count)]
+        
+        sink = MemorySink()
+        for result in get_downloader().save_all(self.result_urls, sink):
+            if not result.ok:
+                raise result.error
+        return [sink.getvalue(i) for i in range(count)]
+    
+    def _restore_cached(self, cached: CachedResult) -> Dict[str, Any]:
+        """Build the result of a cache hit, storing its files like a download would."""
+        self.result_urls = cached.metadata.get("urls", [])
+        sink = self._sink()
+        if sink is not None:
+            with self.timing.phase("download"):
+                self.outputs = []
+                for i, data in enumerate(cached.outputs):
+                    url = self.result_urls[i] if i < len(self.result_urls) else ""
+                    writer = sink.open(url, i, len(cached.outputs))
+                    writer.reset()
+                    writer.write(data)
+                    self.outputs.append(writer.commit())
+                self.local_paths = self.outputs if isinstance(sink, LocalFileSink) else []
+                self.download_errors = []
+        
+        result = dict(cached.metadata)
+        if "source_images" in result:
+            result["source_images"] = {
+                "model": image_label(self.model_image),
+                "garment": image_label(self.garment_image)
+            }
+        result.update(self._download_fields())
+        result["timing"] = self.timing
+        result["cached"] = True
+        return result
     
     def run_and_wait(
         self,
         max_attempts: int = 60,
-        delay: int = 5
+        delay: int = 5,
+        polling_policy: Union[PollingPolicy, str, None] = None
     ) -> List[str]:
         """Run the try-on process and wait for completion.
         
+        Blocking wrapper around :meth:`run_and_wait_async`.
+        
         Args:
             max_attempts: Maximum number of polling attempts
             delay: Time between polling attempts in seconds
+            polling_policy: PollingPolicy, "adaptive" or None for a fixed delay
             
         Returns:
             List of result URLs
         """
-        # Start the job
-        self.run()
+        return run_sync(self.run_and_wait_async(
+            max_attempts=max_attempts,
+            delay=delay,
+            polling_policy=polling_policy
+        ))
+    
+    async def run_and_wait_async(
+        self,
+        max_attempts: int = 60,
+        delay: int = 5,
+        polling_policy: Union[PollingPolicy, str, None] = None
+    ) -> List[str]:
+        """Run the try-on process and wait for completion without blocking.
         
-        # Poll for results
-        if self.show_polling_progress:
-            print("\nPolling for results", end="", flush=True)
-            
-        for _ in range(max_attempts):
-            self._print_polling_progress()
-            
-            is_complete, result = self.check_status()
-            if is_complete:
-                if isinstance(result, Exception):
-                    raise result
-                if self.auto_download and self.download_path:
-                    self._download_result()
-                return result
+        Args:
+            max_attempts: Maximum number of polling attempts
+            delay: Time between polling attempts in seconds
+            polling_policy: PollingPolicy, "adaptive" (learn this provider's
+                completion times) or None for a fixed delay
             
-            time.sleep(delay)
+        Returns:
+            List of result URLs
+        """
+        # Start the job and poll for results (or wait for its callback)
+        return await self._wait_async(self.run_async, max_attempts, delay, polling_policy)
+    
+    async def resume_async(
+        self,
+        max_attempts: int = 60,
+        delay: int = 5,
+        polling_policy: Union[PollingPolicy, str, None] = None
+    ) -> List[str]:
+        """Wait for a job restored from the job journal, without submitting it.
         
-        raise TimeoutError("Maximum polling attempts reached")
+        Takes the same arguments as :meth:`run_and_wait_async`.
+        
+        Returns:
+            List of result URLs
+        """
+        return await self._wait_async(None, max_attempts, delay, polling_policy)
+    
+    async def _wait_async(
+        self,
+        submit: Optional[Callable[[], Awaitable[Any]]],
+        max_attempts: int,
+        delay: int,
+        polling_policy: Union[PollingPolicy, str, None]
+    ) -> List[str]:
+        result = await self._submit_and_wait(
+            submit,
+            policy=resolve_polling_policy(polling_policy, self.provider, delay),
+            max_attempts=max_attempts,
+            on_poll=self._print_polling_progress
+        )
+        if self._sink() is not None:
+            with self.timing.phase("download"):
+                await get_async_client().run(self._download_result)
+            self.on_download(self.downloads)
+        return result
+    
+    async def run_async(self) -> str:
+        """Start the try-on process without blocking the event loop.
+        
+        The default implementation runs :meth:`run` on the shared async
+        client. Services with a native async transport may override it.
+        """
+        return await get_async_client().run(self.run)
+    
+    async def check_status_async(self) -> Tuple[bool, Optional[Union[List[str], Exception]]]:
+        """Check current status of the try-on job without blocking the event loop."""
+        return await get_async_client().run(self.check_status)
     
     @abstractmethod
     def run(self) -> str:
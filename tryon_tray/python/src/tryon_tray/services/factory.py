@@ -1,43 +1,123 @@
 """Service factory for creating service instances."""
 
+import importlib
+import threading
 from enum import Enum, auto
-from typing import Dict, Type, Any
+from typing import Dict, List, Type, Any, Union
 
 class ServiceType(Enum):
     """Types of services available."""
     VTON = auto()
     VIDEO = auto()
 
+# Entry point group plugins register their services under, per service type.
+# An entry point named after the model points at its class, e.g.
+# ``mymodel = my_package.vton:MyVTON`` in the ``tryon_tray.vton`` group.
+ENTRY_POINT_GROUPS = {
+    ServiceType.VTON: "tryon_tray.vton",
+    ServiceType.VIDEO: "tryon_tray.video",
+}
+
 class ServiceFactory:
-    """Factory for creating service instances."""
-    
-    _registry: Dict[ServiceType, Dict[str, Type]] = {
-        ServiceType.VTON: {},
-        ServiceType.VIDEO: {}
+    """Factory for creating service instances.
+
+    Services are registered as classes or as ``"module:ClassName"`` paths.
+    A path is imported the first time the service is requested, so
+    ``import tryon_tray`` does not pay for provider SDKs (replicate, jwt,
+    ...) the process never uses.
+    """
+
+    _registry: Dict[ServiceType, Dict[str, Union[Type, str]]] = {
+        ServiceType.VTON: {
+            "fashnai": "tryon_tray.services.vton.fashnai:FashnaiVTON",
+            "klingai": "tryon_tray.services.vton.klingai:KlingaiVTON",
+            "replicate": "tryon_tray.services.vton.replicate:ReplicateVTON",
+            "vmodel": "tryon_tray.services.vton.vmodel:VModelVTON",
+            "alphabake": "tryon_tray.services.vton.alphabake:AlphabakeVTON",
+        },
+        ServiceType.VIDEO: {
+            "kling-v1": "tryon_tray.services.video.kling:KlingVideoGen",
+            "kling-v1-5": "tryon_tray.services.video.kling:KlingVideoGen",
+        }
     }
-    
+
+    _entry_points_loaded = False
+    _lock = threading.Lock()
+
     @classmethod
-    def register(cls, service_type: ServiceType, model_name: str, service_class: Type):
-        """Register a service implementation."""
+    def register(cls, service_type: ServiceType, model_name: str, service_class: Union[Type, str]):
+        """Register a service implementation.
+
+        Args:
+            service_type: Type of the service
+            model_name: Name the service is requested by
+            service_class: The class, or its ``"module:ClassName"`` path to
+                import on first use
+        """
         if service_type not in cls._registry:
             cls._registry[service_type] = {}
         cls._registry[service_type][model_name] = service_class
-    
+
     @classmethod
-    def get_service(cls, service_type: ServiceType, model_name: str, **kwargs) -> Any:
-        """Get a service instance by type and model name."""
+    def get_service_class(cls, service_type: ServiceType, model_name: str) -> Type:
+        """Get a service class by type and model name, importing it if needed."""
         if service_type not in cls._registry:
             raise ValueError(f"Unknown service type: {service_type}")
-            
+
         registry = cls._registry[service_type]
+        if model_name not in registry:
+            cls._load_entry_points()
         if model_name not in registry:
             raise ValueError(
                 f"Unknown model '{model_name}' for service type {service_type}. "
-                f"Available models: {list(registry.keys())}"
+                f"Available models: {cls.available(service_type)}"
             )
-            
+
         service_class = registry[model_name]
-        return service_class(**kwargs)
+        if isinstance(service_class, str):
+            service_class = registry[model_name] = _import_class(service_class)
+        return service_class
+
+    @classmethod
+    def get_service(cls, service_type: ServiceType, model_name: str, **kwargs) -> Any:
+        """Get a service instance by type and model name."""
+        return cls.get_service_class(service_type, model_name)(**kwargs)
+
+    @classmethod
+    def available(cls, service_type: ServiceType) -> List[str]:
+        """Names of the registered services of a type, without importing them."""
+        cls._load_entry_points()
+        return list(cls._registry.get(service_type, {}))
+
+    @classmethod
+    def _load_entry_points(cls) -> None:
+        """Register services installed by plugin packages, once."""
+        if cls._entry_points_loaded:
+            return
+        with cls._lock:
+            if cls._entry_points_loaded:
+                return
+            for service_type, group in ENTRY_POINT_GROUPS.items():
+                for entry_point in _entry_points(group):
+                    # Built-in and explicitly registered services take precedence
+                    cls._registry[service_type].setdefault(entry_point.name, entry_point.value)
+            cls._entry_points_loaded = True
+
+def _import_class(path: str) -> Type:
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+def _entry_points(group: str) -> List[Any]:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        # Python 3.7 has no importlib.metadata; plugins are not supported there
+        return []
+    try:
+        return list(entry_points(group=group))
+    except TypeError:
+        # Before Python 3.10 entry_points() returns a dict of groups
+        return list(entry_points().get(group, []))
 
 # Convenience functions
 def get_service(service_type: ServiceType, model_name: str, **kwargs) -> Any:
@@ -46,4 +126,4 @@ def get_service(service_type: ServiceType, model_name: str, **kwargs) -> Any:
 
 def get_vton_service(model_name: str, **kwargs) -> Any:
     """Get a VTON service instance."""
-    return get_service(ServiceType.VTON, model_name, **kwargs) 
\ No newline at end of file
+    return get_service(ServiceType.VTON, model_name, **kwargs)
@@ -1,9 +1,18 @@
-"""Video generation services."""
+"""Video generation services.
 
-from ...types.video import VideoModelVersion
-from ..factory import ServiceFactory, ServiceType
-from .kling import KlingVideoGen
+Provider modules are imported on first use; they are registered with
+:class:`~tryon_tray.services.factory.ServiceFactory` by module path.
+"""
 
-# Register Kling video services
-ServiceFactory.register(ServiceType.VIDEO, VideoModelVersion.KLING_V1.value, KlingVideoGen)
-ServiceFactory.register(ServiceType.VIDEO, VideoModelVersion.KLING_V1_5.value, KlingVideoGen) 
\ No newline at end of file
+import importlib
+
+_CLASSES = {
+    "KlingVideoGen": ".kling",
+}
+
+__all__ = list(_CLASSES)
+
+def __getattr__(name):
+    if name not in _CLASSES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_CLASSES[name], __name__), name)
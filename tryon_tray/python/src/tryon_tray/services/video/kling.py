@@ -1,25 +1,32 @@
 """Kling AI video generation service."""
 
-import time
-import jwt
-import base64
 import requests
-from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Union
 
 from ...base.video import BaseVideoGen
 from ...types.video import VideoModelVersion, VideoMode, VideoDuration, VideoGenError
+from ...utils.auth import get_jwt_token
 from ...utils.config import get_env_or_raise
+from ...utils.image_input import ImageData
+from ...utils.streaming import Base64File
+from ...utils import http
 
 class KlingVideoGen(BaseVideoGen):
     """Kling AI video generation service."""
     
+    PROVIDER = "klingai_video"
+    # Image and video tasks count against the same Kling account limits
+    RATE_LIMIT_PROVIDER = "klingai"
+    SUPPORTS_CALLBACKS = True
+    ACCEPTS_IMAGE_URLS = True
     BASE_URL = "https://api.klingai.com/v1"
+    JOB_STATE = ("task_id",)
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.access_id = get_env_or_raise("KLINGAI_ACCESS_ID")
         self.api_key = get_env_or_raise("KLINGAI_API_KEY")
+        self.base_url = kwargs.get("base_url", self.BASE_URL)
         self.task_id = None
         self.created_at = None
         self.updated_at = None
@@ -39,17 +46,8 @@ class KlingVideoGen(BaseVideoGen):
             raise ValueError(f"Invalid duration. Must be one of: {[d.value for d in VideoDuration]}")
     
     def _encode_jwt_token(self) -> str:
-        """Generate JWT token for authentication."""
-        headers = {
-            "alg": "HS256",
-            "typ": "JWT"
-        }
-        payload = {
-            "iss": self.access_id,
-            "exp": int(time.time()) + 1800,  # 30 minutes expiry
-            "nbf": int(time.time()) - 5
-        }
-        return jwt.encode(payload, self.api_key, headers=headers)
+        """Get a JWT token for authentication, shared until shortly before it expires."""
+        return get_jwt_token(self.access_id, self.api_key)
     
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with authentication."""
@@ -58,13 +56,13 @@ class KlingVideoGen(BaseVideoGen):
             "Content-Type": "application/json"
         }
     
-    def _image_to_base64(self, image_path: str) -> str:
-        """Convert image to base64 string."""
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+    def _image_to_base64(self, image_path: Union[str, ImageData]) -> Union[str, Base64File]:
+        """Payload value for an image: its URL, or base64 encoded while the request is sent."""
+        return self._image_value(image_path, "source")
     
     def prepare_payload(self) -> Dict[str, Any]:
         """Prepare the API request payload."""
+        self._inline_image_urls()
         source_base64 = self._image_to_base64(self.source_image)
         
         payload = {
@@ -80,6 +78,8 @@ class KlingVideoGen(BaseVideoGen):
             payload["negative_prompt"] = self.negative_prompt
         if self.seed is not None:
             payload["seed"] = self.seed
+        if self.callback_url:
+            payload["callback_url"] = self.callback_url
             
         return payload
     
@@ -97,17 +97,16 @@ class KlingVideoGen(BaseVideoGen):
         
         return self.result_url
     
-    def run(self) -> None:
-        """Run the video generation process."""
-        self.start_time = datetime.now()
-        
+    def submit(self) -> str:
+        """Create the video generation task."""
         self.validate_parameters()
         payload = self.prepare_payload()
         
         # Create task
-        response = requests.post(
-            f"{self.BASE_URL}/videos/image2video",
+        response = http.post(
+            f"{self.base_url}/videos/image2video",
             headers=self._get_headers(),
+            governor=self.governor,
             json=payload
         )
         
@@ -116,42 +115,32 @@ class KlingVideoGen(BaseVideoGen):
         
         task_data = response.json()
         self.task_id = task_data["data"]["task_id"]
+        return self.task_id
+    
+    def check_status(self) -> Tuple[bool, Optional[Union[str, Exception]]]:
+        """Check the status of the video generation task."""
+        response = http.get(
+            f"{self.base_url}/videos/image2video/{self.task_id}",
+            headers=self._get_headers(),
+            governor=self.governor
+        )
         
-        # Poll for results
-        max_attempts = 120
-        delay = 5
-        
-        if self.show_polling_progress:
-            print("\nPolling for results", end="", flush=True)
-            
-        for _ in range(max_attempts):
-            self._print_polling_progress()
-            
-            response = requests.get(
-                f"{self.BASE_URL}/videos/image2video/{self.task_id}",
-                headers=self._get_headers()
-            )
-            
-            if not response.ok:
-                self._handle_error(response)
-                
-            result = response.json()
-            status = result["data"]["task_status"]
-            
-            if status == "succeed":
-                self.process_response(result)
-                self.end_time = datetime.now()
-                self.time_taken = self.end_time - self.start_time
-                
-                if self.auto_download:
-                    self._download_video()
-                return
-            elif status == "failed":
-                raise Exception(f"Task failed: {result['data'].get('task_status_msg', 'Unknown error')}")
+        if not response.ok:
+            if response.status_code == 429 or response.status_code >= 500:
+                # The check failed, not the task: leave it pending
+                response.raise_for_status()
+            self._handle_error(response)
             
-            time.sleep(delay)
+        result = response.json()
+        status = result["data"]["task_status"]
+        
+        if status == "succeed":
+            self.process_response(result)
+            return True, self.result_url
+        elif status == "failed":
+            return True, Exception(f"Task failed: {result['data'].get('task_status_msg', 'Unknown error')}")
         
-        raise TimeoutError("Maximum polling attempts reached")
+        return False, None
     
     def _handle_error(self, response: requests.Response) -> None:
         """Handle API errors."""
@@ -1,15 +1,22 @@
-"""Virtual try-on services."""
-
-from ..factory import ServiceFactory, ServiceType
-from .fashnai import FashnaiVTON
-from .klingai import KlingaiVTON
-from .replicate import ReplicateVTON
-from .vmodel import VModelVTON
-from .alphabake import AlphabakeVTON
-
-# Register VTON services
-ServiceFactory.register(ServiceType.VTON, "fashnai", FashnaiVTON)
-ServiceFactory.register(ServiceType.VTON, "klingai", KlingaiVTON)
-ServiceFactory.register(ServiceType.VTON, "replicate", ReplicateVTON)
-ServiceFactory.register(ServiceType.VTON, "vmodel", VModelVTON)
-ServiceFactory.register(ServiceType.VTON, "alphabake", AlphabakeVTON) 
\ No newline at end of file
+"""Virtual try-on services.
+
+Provider modules are imported on first use; they are registered with
+:class:`~tryon_tray.services.factory.ServiceFactory` by module path.
+"""
+
+import importlib
+
+_CLASSES = {
+    "FashnaiVTON": ".fashnai",
+    "KlingaiVTON": ".klingai",
+    "ReplicateVTON": ".replicate",
+    "VModelVTON": ".vmodel",
+    "AlphabakeVTON": ".alphabake",
+}
+
+__all__ = list(_CLASSES)
+
+def __getattr__(name):
+    if name not in _CLASSES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_CLASSES[name], __name__), name)
@@ -1,43 +1,67 @@
 """Alphabake virtual try-on service."""
 
-import os
 import time
-from datetime import datetime
 from typing import Dict, Any, Tuple, Optional, Union, List
 
+import requests
+
 from ...base.vton import BaseVTON
 from ...api.alphabake import AlphabakeAPIClient
 from ...utils.config import get_alphabake_api_token
+from ...utils.image_input import ImageInput, image_exists, image_label, is_url
 
 class AlphabakeVTON(BaseVTON):
     """Alphabake virtual try-on service implementation."""
     
-    def __init__(self, model_image: str, garment_image: str, **kwargs):
+    PROVIDER = "alphabake"
+    ACCEPTS_IMAGE_URLS = True
+    DEFAULT_PARAMS = {"mode": "balanced", "garment_type": "top"}
+    RUNTIME_PARAMS = BaseVTON.RUNTIME_PARAMS | {"garment_name", "tryon_name"}
+    JOB_STATE = ("_tryon_pk", "_v2")
+    
+    def __init__(self, model_image: ImageInput, garment_image: ImageInput, **kwargs):
         """Initialize Alphabake VTON service."""
         super().__init__(model_image, garment_image, **kwargs)
         if not self.api_key:
             self.api_key = get_alphabake_api_token()
         
         base_url = kwargs.get("base_url", "https://app.alphabake.io/")
-        self.client = AlphabakeAPIClient(api_key=self.api_key, base_url=base_url)
+        self.client = AlphabakeAPIClient.shared(api_key=self.api_key, base_url=base_url)
         self._tryon_pk = None
-        self.start_time = None
-        self.end_time = None
-        self.time_taken = None
+        self._v2 = False
         
+    def _passes_image_urls(self) -> bool:
+        """Whether to use the v2 API, which takes both images as URLs."""
+        return super()._passes_image_urls() and all(is_url(image) for image, _ in self._image_inputs())
+    
     def run(self) -> str:
         """Run the try-on process."""
+        self._inline_image_urls()
+        if self._passes_image_urls():
+            try:
+                self._tryon_pk = self.client.create_job_from_urls(
+                    human_url=self.model_image,
+                    garment_url=self.garment_image,
+                    garment_type=self.params.get("garment_type", "top")
+                )
+            except Exception as e:
+                raise Exception(f"Alphabake job creation failed: {str(e)}")
+            self._v2 = True
+            self.status = "processing"
+            return self._tryon_pk
+        
         # Validate image paths
-        if not os.path.exists(self.model_image):
+        if not image_exists(self.model_image):
             raise ValueError(f"Model image not found: {self.model_image}")
-        if not os.path.exists(self.garment_image):
+        if not image_exists(self.garment_image):
             raise ValueError(f"Garment image not found: {self.garment_image}")
         
-        self.start_time = datetime.now()
         try:
             self._tryon_pk = self.client.create_job(
                 model_image_path=self.model_image,
                 garment_image_path=self.garment_image,
+                model_image_spec=self.image_spec("human"),
+                garment_image_spec=self.image_spec("garment"),
                 mode=self.params.get("mode", "balanced"),
                 garment_name=self.params.get("garment_name"),
                 tryon_name=self.params.get("tryon_name")
@@ -53,24 +77,19 @@ class AlphabakeVTON(BaseVTON):
             return True, Exception("No tryon_pk available. Run the try-on first.")
         
         try:
-            self.result_urls = self.client.fetch_job(
-                self._tryon_pk,
-                max_attempts=self.params.get("max_attempts", 60),
-                delay=self.params.get("delay", 2)
-            )
-            self.status = "completed"
-            self.end_time = datetime.now()
-            self.time_taken = (self.end_time - self.start_time).total_seconds()
-            
-            # Download if auto_download is enabled
-            if self.auto_download and self.download_path and self.result_urls:
-                self.client.download_image(self.result_urls[0], self.download_path)
-            
-            return True, self.result_urls
-        except TimeoutError:
-            return False, None
+            result_urls = self.client.get_job_status(self._tryon_pk, v2=self._v2)
+        except requests.RequestException:
+            # The check itself failed, not the job: leave it pending
+            raise
         except Exception as e:
             return True, Exception(f"Alphabake job check failed: {str(e)}")
+        
+        if result_urls is None:
+            return False, None
+        
+        self.result_urls = result_urls
+        self.status = "completed"
+        return True, self.result_urls
     
     def get_result(self) -> Dict[str, Any]:
         """Get the try-on result."""
@@ -80,18 +99,13 @@ class AlphabakeVTON(BaseVTON):
         result = {
             "urls": self.result_urls,
             "source_images": {
-                "model": self.model_image,
-                "garment": self.garment_image
+                "model": image_label(self.model_image),
+                "garment": image_label(self.garment_image)
             },
             "mode": self.params.get("mode", "balanced"),
-            "timing": {
-                "start_time": self.start_time.isoformat() if self.start_time else None,
-                "end_time": self.end_time.isoformat() if self.end_time else None,
-                "time_taken": int(self.time_taken) if self.time_taken else None
-            }
+            "timing": self.timing
         }
         
-        if self.auto_download and self.download_path:
-            result["local_path"] = self.download_path
+        result.update(self._download_fields())
             
         return result 
\ No newline at end of file
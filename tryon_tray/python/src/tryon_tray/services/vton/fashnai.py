@@ -1,47 +1,52 @@
 """Fashn.ai virtual try-on service."""
 
-import requests
 import time
-from datetime import datetime
 from typing import Dict, Any, Tuple, Optional, Union
 
 from ...base.vton import BaseVTON
 from ...utils.config import get_env_or_raise
-from ...utils.file_io import base64_with_prefix
+from ...utils.image_input import image_label
+from ...utils import http
 
 class FashnaiVTON(BaseVTON):
     """Fashn.ai virtual try-on service."""
     
+    PROVIDER = "fashnai"
+    ACCEPTS_IMAGE_URLS = True
     BASE_URL = "https://api.fashn.ai/v1"
+    MODEL_VERSION = "v1"
+    JOB_STATE = ("prediction_id",)
+    DEFAULT_PARAMS = {
+        "category": "tops",
+        "mode": "quality",
+        "nsfw_filter": True,
+        "cover_feet": False,
+        "adjust_hands": False,
+        "restore_background": False,
+        "restore_clothes": False,
+        "garment_photo_type": "auto",
+        "long_top": False,
+        "seed": 42,
+        "num_samples": 1
+    }
     
     def __init__(self, model_image, garment_image, **kwargs):
         super().__init__(model_image, garment_image, **kwargs)
         self.api_key = get_env_or_raise("FASHNAI_API_KEY")
+        self.base_url = kwargs.get("base_url", self.BASE_URL)
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
         self.prediction_id = None
-        self.start_time = None
-        self.end_time = None
-        self.time_taken = None
     
     def prepare_payload(self) -> Dict[str, Any]:
         """Prepare API request payload."""
+        self._inline_image_urls()
         return {
-            "model_image": base64_with_prefix(self.model_image),
-            "garment_image": base64_with_prefix(self.garment_image),
-            "category": self.params.get("category", "tops"),
-            "mode": self.params.get("mode", "quality"),
-            "nsfw_filter": self.params.get("nsfw_filter", True),
-            "cover_feet": self.params.get("cover_feet", False),
-            "adjust_hands": self.params.get("adjust_hands", False),
-            "restore_background": self.params.get("restore_background", False),
-            "restore_clothes": self.params.get("restore_clothes", False),
-            "garment_photo_type": self.params.get("garment_photo_type", "auto"),
-            "long_top": self.params.get("long_top", False),
-            "seed": self.params.get("seed", 42),
-            "num_samples": self.params.get("num_samples", 1)
+            "model_image": self._image_value(self.model_image, "human", data_uri=True),
+            "garment_image": self._image_value(self.garment_image, "garment", data_uri=True),
+            **{name: self.params.get(name, default) for name, default in self.DEFAULT_PARAMS.items()}
         }
     
     def run(self) -> str:
@@ -50,12 +55,12 @@ class FashnaiVTON(BaseVTON):
         Returns:
             str: Prediction ID for status checking
         """
-        self.start_time = datetime.now()
         payload = self.prepare_payload()
         
-        response = requests.post(
-            f"{self.BASE_URL}/run",
+        response = http.post(
+            f"{self.base_url}/run",
             headers=self.headers,
+            governor=self.governor,
             json=payload
         )
         response.raise_for_status()
@@ -73,17 +78,16 @@ class FashnaiVTON(BaseVTON):
             - bool: Whether the job is complete
             - Optional[Union[list[str], Exception]]: Result URLs or error
         """
-        response = requests.get(
-            f"{self.BASE_URL}/status/{self.prediction_id}",
-            headers=self.headers
+        response = http.get(
+            f"{self.base_url}/status/{self.prediction_id}",
+            headers=self.headers,
+            governor=self.governor
         )
         response.raise_for_status()
         data = response.json()
         
         if data["status"] == "completed":
             self.result_urls = data["output"]
-            self.end_time = datetime.now()
-            self.time_taken = int((self.end_time - self.start_time).total_seconds())
             return True, self.result_urls
         elif data["status"] == "failed":
             return True, Exception(f"Try-on failed: {data.get('error', 'Unknown error')}")
@@ -98,19 +102,14 @@ class FashnaiVTON(BaseVTON):
         result = {
             "urls": self.result_urls,
             "source_images": {
-                "model": self.model_image,
-                "garment": self.garment_image
+                "model": image_label(self.model_image),
+                "garment": image_label(self.garment_image)
             },
             "category": self.params.get("category", "tops"),
             "mode": self.params.get("mode", "quality"),
-            "timing": {
-                "start_time": self.start_time.isoformat() if self.start_time else None,
-                "end_time": self.end_time.isoformat() if self.end_time else None,
-                "time_taken": self.time_taken
-            }
+            "timing": self.timing
         }
         
-        if self.auto_download and self.download_path:
-            result["local_path"] = self.download_path
+        result.update(self._download_fields())
             
         return result 
\ No newline at end of file
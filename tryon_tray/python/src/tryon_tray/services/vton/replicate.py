@@ -3,32 +3,88 @@
 import replicate
 import os
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, Any, Tuple, Optional, Union, List
 
 from ...base.vton import BaseVTON
 from ...utils.config import get_replicate_api_token
+from ...utils.http import get_async_client
+from ...utils.image_input import ImageData, image_label, is_url
 
 class ReplicateVTON(BaseVTON):
     """Replicate virtual try-on service using IDM-VTON model."""
     
+    PROVIDER = "replicate"
+    ACCEPTS_IMAGE_URLS = True
     MODEL_ID = "cuuupid/idm-vton:c871bb9b046607b680449ecbae55fd8c6d945e0a1948644bf2361b3d021d3ff4"
+    MODEL_VERSION = MODEL_ID
+    DEFAULT_PARAMS = {
+        "crop": False,
+        "seed": 42,
+        "steps": 30,
+        "category": "upper_body",
+        "force_dc": False,
+        "mask_only": False,
+        "garment_des": ""
+    }
 
     def __init__(self, model_image, garment_image, **kwargs):
         """Initialize Replicate VTON service.
         
-        Note: model_image and garment_image must be URLs accessible by Replicate.
-        Local file paths are not supported by Replicate's API.
+        Note: model_image and garment_image must be URLs accessible by Replicate
+        or in-memory images, which the Replicate client uploads. Local file
+        paths are not supported by Replicate's API.
         """
         super().__init__(model_image, garment_image, **kwargs)
         if not self.api_key:
             self.api_key = get_replicate_api_token()
         replicate.Client(api_token=self.api_key)
         self._prediction = None
-        self.start_time = None
-        self.end_time = None
-        self.time_taken = None
 
+    def _validate_inputs(self) -> None:
+        """Ensure both input images are URLs or in-memory images.
+        
+        Raises:
+            ValueError: If an input image is a local file path
+        """
+        if not (is_url(self.model_image) or isinstance(self.model_image, ImageData)):
+            raise ValueError("Replicate requires model_image to be a URL or image data. Local file paths are not supported. Please provide a publicly accessible URL.")
+        if not (is_url(self.garment_image) or isinstance(self.garment_image, ImageData)):
+            raise ValueError("Replicate requires garment_image to be a URL or image data. Local file paths are not supported. Please provide a publicly accessible URL.")
+    
+    @staticmethod
+    def _input_image(image: Any) -> Any:
+        """Model input for an image: the URL, or a file object for the client to upload."""
+        return image.open() if isinstance(image, ImageData) else image
+    
+    def prepare_input(self) -> Dict[str, Any]:
+        """Prepare the model input."""
+        return {
+            **{name: self.params.get(name, default) for name, default in self.DEFAULT_PARAMS.items()},
+            "human_img": self._input_image(self.model_image),
+            "garm_img": self._input_image(self.garment_image)
+        }
+    
+    def _handle_output(self, output: Any) -> str:
+        """Store the model output and return the dummy prediction ID."""
+        self.status = "processing"
+        
+        # Handle FileOutput object
+        if hasattr(output, 'read'):
+            # If it's a FileOutput object, save it directly
+            if self.auto_download and self.download_path:
+                with self.timing.phase("download"):
+                    os.makedirs(os.path.dirname(self.download_path), exist_ok=True)
+                    with open(self.download_path, 'wb') as f:
+                        f.write(output.read())
+            # Store the URL for consistency
+            self.result_urls = [output.url]
+        else:
+            # If it's a URL or list of URLs
+            self.result_urls = [output] if isinstance(output, str) else output
+        
+        # Return a dummy ID since Replicate is synchronous
+        return "replicate_direct"
+    
     def run(self) -> str:
         """Run the try-on process and get results directly.
         
@@ -38,47 +94,33 @@ class ReplicateVTON(BaseVTON):
         Raises:
             ValueError: If input images are not URLs
         """
-        # Validate URLs
-        if not (self.model_image.startswith('http://') or self.model_image.startswith('https://')):
-            raise ValueError("Replicate requires model_image to be a URL. Local file paths are not supported. Please provide a publicly accessible URL.")
-        if not (self.garment_image.startswith('http://') or self.garment_image.startswith('https://')):
-            raise ValueError("Replicate requires garment_image to be a URL. Local file paths are not supported. Please provide a publicly accessible URL.")
+        self._inline_image_urls()
+        self._validate_inputs()
         
-        self.start_time = datetime.now()
         try:
-            output = replicate.run(
-                self.MODEL_ID,
-                input={
-                    "crop": self.params.get("crop", False),
-                    "seed": self.params.get("seed", 42),
-                    "steps": self.params.get("steps", 30),
-                    "category": self.params.get("category", "upper_body"),
-                    "force_dc": self.params.get("force_dc", False),
-                    "human_img": self.model_image,
-                    "garm_img": self.garment_image,
-                    "mask_only": self.params.get("mask_only", False),
-                    "garment_des": self.params.get("garment_des", "")
-                }
-            )
-            self.status = "processing"
-            self.end_time = datetime.now()
-            self.time_taken = int((self.end_time - self.start_time).total_seconds())
-            
-            # Handle FileOutput object
-            if hasattr(output, 'read'):
-                # If it's a FileOutput object, save it directly
-                if self.auto_download and self.download_path:
-                    os.makedirs(os.path.dirname(self.download_path), exist_ok=True)
-                    with open(self.download_path, 'wb') as f:
-                        f.write(output.read())
-                # Store the URL for consistency
-                self.result_urls = [output.url]
-            else:
-                # If it's a URL or list of URLs
-                self.result_urls = [output] if isinstance(output, str) else output
-            
-            # Return a dummy ID since Replicate is synchronous
-            return "replicate_direct"
+            # The client blocks until the prediction has finished
+            with self.timing.phase("inference"):
+                output = replicate.run(self.MODEL_ID, input=self.prepare_input())
+            return self._handle_output(output)
+        except Exception as e:
+            raise Exception(f"Replicate run failed: {str(e)}")
+    
+    async def run_async(self) -> str:
+        """Run the try-on process without holding a worker thread.
+        
+        Uses ``replicate.async_run`` when the installed client provides it
+        and falls back to running :meth:`run` on the shared async client.
+        """
+        if not hasattr(replicate, "async_run"):
+            return await super().run_async()
+        
+        await get_async_client().run(self._inline_image_urls)
+        self._validate_inputs()
+        
+        try:
+            with self.timing.phase("inference"):
+                output = await replicate.async_run(self.MODEL_ID, input=self.prepare_input())
+            return await get_async_client().run(self._handle_output, output)
         except Exception as e:
             raise Exception(f"Replicate run failed: {str(e)}")
 
@@ -102,20 +144,15 @@ class ReplicateVTON(BaseVTON):
         result = {
             "urls": self.result_urls,
             "source_images": {
-                "model": self.model_image,
-                "garment": self.garment_image
+                "model": image_label(self.model_image),
+                "garment": image_label(self.garment_image)
             },
             "category": self.params.get("category", "upper_body"),
             "steps": self.params.get("steps", 30),
             "seed": self.params.get("seed", 42),
-            "timing": {
-                "start_time": self.start_time.isoformat() if self.start_time else None,
-                "end_time": self.end_time.isoformat() if self.end_time else None,
-                "time_taken": self.time_taken
-            }
+            "timing": self.timing
         }
         
-        if self.auto_download and self.download_path:
-            result["local_path"] = self.download_path
+        result.update(self._download_fields())
             
         return result 
\ No newline at end of file
@@ -1,40 +1,47 @@
 """VModel virtual try-on service."""
 
-import os
-from datetime import datetime
 from typing import Dict, Any, Tuple, Optional, Union, List
 
+import requests
+
 from ...base.vton import BaseVTON
 from ...api.vmodel import VModelAPIClient
 from ...utils.config import get_vmodel_api_token
+from ...utils.image_input import ImageInput, image_exists, image_label
 
 class VModelVTON(BaseVTON):
     """VModel virtual try-on service implementation."""
     
-    def __init__(self, model_image: str, garment_image: str, **kwargs):
+    PROVIDER = "vmodel"
+    DEFAULT_PARAMS = {"category": "upper_body", "prompt": ""}
+    JOB_STATE = ("_job_id",)
+    
+    def __init__(self, model_image: ImageInput, garment_image: ImageInput, **kwargs):
         """Initialize VModel VTON service."""
         super().__init__(model_image, garment_image, **kwargs)
         if not self.api_key:
             self.api_key = get_vmodel_api_token()
-        self.client = VModelAPIClient(api_key=self.api_key)
+        base_url = kwargs.get("base_url", VModelAPIClient.BASE_URL)
+        self.client = VModelAPIClient.shared(api_key=self.api_key, base_url=base_url)
         self._job_id = None
-        self.start_time = None
-        self.end_time = None
-        self.time_taken = None
         
     def run(self) -> str:
         """Run the try-on process."""
+        # VModel takes uploads only, so image URLs are downloaded first
+        self._inline_image_urls()
+        
         # Validate image paths
-        if not os.path.exists(self.model_image):
+        if not image_exists(self.model_image):
             raise ValueError(f"Model image not found: {self.model_image}")
-        if not os.path.exists(self.garment_image):
+        if not image_exists(self.garment_image):
             raise ValueError(f"Garment image not found: {self.garment_image}")
         
-        self.start_time = datetime.now()
         try:
             self._job_id = self.client.create_job(
                 model_image_path=self.model_image,
                 garment_image_path=self.garment_image,
+                model_image_spec=self.image_spec("human"),
+                garment_image_spec=self.image_spec("garment"),
                 clothes_type=self.params.get("category", "upper_body"),
                 prompt=self.params.get("prompt", "")
             )
@@ -49,24 +56,19 @@ class VModelVTON(BaseVTON):
             return True, Exception("No job ID available. Run the try-on first.")
         
         try:
-            self.result_urls = self.client.fetch_job(
-                self._job_id,
-                max_attempts=self.params.get("max_attempts", 60),
-                delay=self.params.get("delay", 5)
-            )
-            self.status = "completed"
-            self.end_time = datetime.now()
-            self.time_taken = int((self.end_time - self.start_time).total_seconds())
-            
-            # Download if auto_download is enabled
-            if self.auto_download and self.download_path and self.result_urls:
-                self.client.download_image(self.result_urls[0], self.download_path)
-            
-            return True, self.result_urls
-        except TimeoutError:
-            return False, None
+            result_urls = self.client.get_job_status(self._job_id)
+        except requests.RequestException:
+            # The check itself failed, not the job: leave it pending
+            raise
         except Exception as e:
             return True, Exception(f"VModel job check failed: {str(e)}")
+        
+        if result_urls is None:
+            return False, None
+        
+        self.result_urls = result_urls
+        self.status = "completed"
+        return True, self.result_urls
     
     def get_result(self) -> Dict[str, Any]:
         """Get the try-on result."""
@@ -76,19 +78,14 @@ class VModelVTON(BaseVTON):
         result = {
             "urls": self.result_urls,
             "source_images": {
-                "model": self.model_image,
-                "garment": self.garment_image
+                "model": image_label(self.model_image),
+                "garment": image_label(self.garment_image)
             },
             "category": self.params.get("category", "upper_body"),
             "prompt": self.params.get("prompt", ""),
-            "timing": {
-                "start_time": self.start_time.isoformat() if self.start_time else None,
-                "end_time": self.end_time.isoformat() if self.end_time else None,
-                "time_taken": self.time_taken
-            }
+            "timing": self.timing
         }
         
-        if self.auto_download and self.download_path:
-            result["local_path"] = self.download_path
+        result.update(self._download_fields())
             
         return result 
\ No newline at end of file
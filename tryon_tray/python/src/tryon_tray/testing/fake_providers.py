@@ -0,0 +1,432 @@
+"""Local stand-ins for provider APIs, for offline tests and load tests."""
+
+import functools
+import json
+import math
+import random
+import re
+import struct
+import threading
+import time
+import urllib.request
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple, Union
+
+Route = Tuple[str, Pattern, Callable[..., Tuple[int, Any]], bool]
+
+# Seconds a job takes: a constant, or a callable drawing from a distribution
+Latency = Union[float, Callable[[], float]]
+
+def uniform(low: float, high: float, seed: Optional[int] = None) -> Callable[[], float]:
+    """Latency spread evenly between ``low`` and ``high`` seconds."""
+    rng = random.Random(seed)
+    return lambda: rng.uniform(low, high)
+
+def lognormal(median: float, sigma: float = 0.5, seed: Optional[int] = None) -> Callable[[], float]:
+    """Latency with a long tail, like a provider's inference queue.
+
+    Args:
+        median: Seconds half of the jobs finish within
+        sigma: Spread; 0.5 puts the 99th percentile at about 3.2x the median
+        seed: Seed for reproducible runs
+    """
+    rng = random.Random(seed)
+    return lambda: rng.lognormvariate(math.log(median), sigma)
+
+@functools.lru_cache(maxsize=8)
+def synthetic_image(width: int = 64, height: int = 64) -> bytes:
+    """A valid PNG of the given size showing a colour gradient."""
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    red = bytes(x * 255 // max(width - 1, 1) for x in range(width))
+    rows = []
+    for y in range(height):
+        green = y * 255 // max(height - 1, 1)
+        # Filter byte, then RGB triplets
+        rows.append(b"\x00" + bytes(value for r in red for value in (r, green, 128)))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(b"".join(rows)))
+        + chunk(b"IEND", b"")
+    )
+
+class FakeProviderServer:
+    """Minimal provider API served from a background thread.
+
+    Subclasses register routes as ``(method, path_regex, handler)``; handlers
+    receive the decoded JSON body and the regex groups and return
+    ``(status_code, json_body)``, optionally followed by a dict of response
+    headers. A ``bytes`` body is sent as is. Every request is recorded in
+    :attr:`requests` as ``(method, path)``.
+
+    Jobs are tracked with :meth:`create_task` and :meth:`task_state`: each
+    one draws its latency and whether it fails when it is submitted. Result
+    files are served under ``/results/``.
+    """
+
+    def __init__(
+        self,
+        latency: Latency = 1.0,
+        fail: bool = False,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        failure_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: Optional[float] = None,
+        output_size: Optional[Tuple[int, int]] = None,
+        seed: Optional[int] = None
+    ):
+        """Start the server.
+
+        Args:
+            latency: Seconds from submission until a job completes, or a
+                callable drawing it per job (see :func:`uniform`, :func:`lognormal`)
+            fail: Whether every job completes with a failure
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            failure_rate: Fraction of jobs that complete with a failure
+            rate_limit_rate: Fraction of API requests (not result downloads)
+                answered with 429 Too Many Requests
+            retry_after: Retry-After to send with those 429s, in seconds
+                (omitted if None)
+            output_size: (width, height) of the synthetic PNG served as each
+                result; None serves a short text placeholder
+            seed: Seed for the failure and 429 draws, for reproducible runs
+        """
+        self.latency = latency
+        self.fail = fail
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.output_size = output_size
+        self.random = random.Random(seed)
+        self.requests: List[Tuple[str, str]] = []
+        self.routes: List[Route] = []
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.submissions: List[Any] = []
+        self.rejected = 0
+        self._reject_next = 0
+        self._retry_after: Optional[float] = None
+        self._lock = threading.Lock()
+        self._server = _FakeHTTPServer((host, port), _FakeHandler)
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="tryon-tray-fake", daemon=True)
+        self._thread.start()
+        bound_host, bound_port = self._server.server_address[:2]
+        self.url = f"http://{bound_host}:{bound_port}"
+        self.route("GET", r"/results/([\w.-]+)", self._result_file, rate_limited=False)
+
+    def route(self, method: str, pattern: str, handler: Callable[..., Tuple[int, Any]], rate_limited: bool = True) -> None:
+        """Register a handler for requests matching a path regex.
+
+        Args:
+            method: HTTP method
+            pattern: Regex the whole path (without query string) must match
+            handler: Called with the JSON body and the regex groups
+            rate_limited: Whether ``rate_limit_rate`` applies to the route
+        """
+        self.routes.append((method, re.compile(f"^{pattern}$"), handler, rate_limited))
+
+    def serve_file(self, path: str, data: bytes, content_type: str = "image/jpeg") -> str:
+        """Serve static bytes, e.g. an input image, and return their URL."""
+        handler = lambda body: (200, data, {"Content-Type": content_type})
+        # Ahead of the other routes, so it can replace a task's result file
+        self.routes.insert(0, ("GET", re.compile(f"^{re.escape(path)}$"), handler, False))
+        return f"{self.url}{path}"
+
+    def reject_next(self, count: int, retry_after: Optional[float] = None) -> None:
+        """Answer the next requests with 429 Too Many Requests.
+
+        Args:
+            count: Number of requests to reject
+            retry_after: Retry-After to send, in seconds (omitted if None)
+        """
+        with self._lock:
+            self._reject_next = count
+            self._retry_after = retry_after
+
+    def count(self, method: str, prefix: str) -> int:
+        """Number of recorded requests with the given method and path prefix."""
+        with self._lock:
+            return sum(1 for m, path in self.requests if m == method and path.startswith(prefix))
+
+    def create_task(self, kind: str, body: Any) -> str:
+        """Record a submitted job, drawing its latency and outcome.
+
+        Args:
+            kind: What the job produces, "image" or "video"
+            body: The submit request body, kept in :attr:`submissions`
+
+        Returns:
+            The new task ID
+        """
+        task_id = uuid.uuid4().hex
+        latency = self.latency() if callable(self.latency) else self.latency
+        with self._lock:
+            failed = self.fail or (self.failure_rate > 0 and self.random.random() < self.failure_rate)
+            self.tasks[task_id] = {"kind": kind, "created": time.monotonic(), "latency": latency, "failed": failed}
+            self.submissions.append(body)
+        return task_id
+
+    def task_state(self, task_id: str) -> Optional[str]:
+        """"processing", "failed" or "succeeded"; None for an unknown task."""
+        with self._lock:
+            task = self.tasks.get(task_id)
+        if task is None:
+            return None
+        if time.monotonic() - task["created"] < task["latency"]:
+            return "processing"
+        return "failed" if task["failed"] else "succeeded"
+
+    def result_url(self, task_id: str) -> str:
+        """URL of a task's result file."""
+        extension = "mp4" if self.tasks[task_id]["kind"] == "video" else "png"
+        return f"{self.url}/results/{task_id}.{extension}"
+
+    def handle(self, method: str, path: str, body: Any) -> Tuple:
+        """Dispatch a request to the first matching route.
+
+        Returns:
+            (status_code, json_body) or (status_code, json_body, headers)
+        """
+        with self._lock:
+            self.requests.append((method, path))
+            if self._reject_next > 0:
+                self._reject_next -= 1
+                return self._too_many_requests(self._retry_after)
+        for route_method, pattern, handler, rate_limited in self.routes:
+            match = pattern.match(path.split("?", 1)[0])
+            if route_method == method and match:
+                if rate_limited and self.rate_limit_rate > 0:
+                    with self._lock:
+                        if self.random.random() < self.rate_limit_rate:
+                            return self._too_many_requests(self.retry_after)
+                return handler(body, *match.groups())
+        return 404, {"message": f"No route for {method} {path}"}
+
+    def _too_many_requests(self, retry_after: Optional[float]) -> Tuple[int, Any, Dict[str, str]]:
+        """429 response; the caller holds the lock."""
+        self.rejected += 1
+        headers = {} if retry_after is None else {"Retry-After": f"{retry_after:g}"}
+        return 429, {"code": 1302, "message": "Too many requests"}, headers
+
+    def _result_file(self, body: Any, name: str) -> Tuple[int, Any, Dict[str, str]]:
+        if name.endswith(".mp4"):
+            return 200, f"result {name}".encode(), {"Content-Type": "video/mp4"}
+        if self.output_size is None:
+            return 200, f"result {name}".encode(), {"Content-Type": "image/png"}
+        return 200, synthetic_image(*self.output_size), {"Content-Type": "image/png"}
+
+    def close(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "FakeProviderServer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class FakeFashnServer(FakeProviderServer):
+    """Stand-in for the Fashn API (``/run`` and ``/status/{id}``).
+
+    Point the service at it with ``base_url=server.base_url``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.route("POST", r"/v1/run", self._run)
+        self.route("GET", r"/v1/status/([\w-]+)", self._status)
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    def _run(self, body: Any) -> Tuple[int, Any]:
+        return 200, {"id": self.create_task("image", body), "error": None}
+
+    def _status(self, body: Any, prediction_id: str) -> Tuple[int, Any]:
+        state = self.task_state(prediction_id)
+        if state is None:
+            return 404, {"error": "Prediction not found"}
+        data: Dict[str, Any] = {"id": prediction_id, "status": state, "output": [], "error": None}
+        if state == "failed":
+            data["error"] = {"name": "PipelineError", "message": "Simulated failure"}
+        elif state == "succeeded":
+            data.update(status="completed", output=[self.result_url(prediction_id)])
+        return 200, data
+
+class FakeKlingServer(FakeProviderServer):
+    """Stand-in for the Kling image try-on and image-to-video APIs.
+
+    Tasks report ``processing`` until their latency has passed, then
+    ``succeed`` (or ``failed``). If the submit payload has a
+    ``callback_url``, the task status is POSTed to it on completion, the way
+    Kling notifies callers.
+
+    Point services at it with ``base_url=server.images_url`` (try-on) or
+    ``base_url=server.api_url`` (video).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.callbacks_sent = 0
+        self.route("POST", r"/v1/images/kolors-virtual-try-on", lambda body: self._create("image", body))
+        self.route("GET", r"/v1/images/kolors-virtual-try-on/([\w-]+)", self._status)
+        self.route("POST", r"/v1/videos/image2video", lambda body: self._create("video", body))
+        self.route("GET", r"/v1/videos/image2video/([\w-]+)", self._status)
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}/v1"
+
+    @property
+    def images_url(self) -> str:
+        return f"{self.url}/v1/images"
+
+    def _create(self, kind: str, body: Optional[Dict[str, Any]]) -> Tuple[int, Any]:
+        task_id = self.create_task(kind, body)
+        callback_url = (body or {}).get("callback_url")
+        if callback_url:
+            timer = threading.Timer(self.tasks[task_id]["latency"], self._send_callback, (task_id, callback_url))
+            timer.daemon = True
+            timer.start()
+        return 200, {"code": 0, "message": "SUCCESS", "data": {"task_id": task_id, "task_status": "submitted"}}
+
+    def _task_data(self, task_id: str) -> Optional[Dict[str, Any]]:
+        state = self.task_state(task_id)
+        if state is None:
+            return None
+
+        data: Dict[str, Any] = {"task_id": task_id, "created_at": 0, "updated_at": 0}
+        if state == "processing":
+            data["task_status"] = "processing"
+        elif state == "failed":
+            data.update(task_status="failed", task_status_msg="Simulated failure")
+        elif self.tasks[task_id]["kind"] == "image":
+            data.update(task_status="succeed", task_result={"images": [{"index": 0, "url": self.result_url(task_id)}]})
+        else:
+            data.update(task_status="succeed", task_result={"videos": [{"id": task_id, "url": self.result_url(task_id)}]})
+        return data
+
+    def _status(self, body: Any, task_id: str) -> Tuple[int, Any]:
+        data = self._task_data(task_id)
+        if data is None:
+            return 404, {"code": 1203, "message": "Task not found"}
+        return 200, {"code": 0, "message": "SUCCESS", "data": data}
+
+    def _send_callback(self, task_id: str, callback_url: str) -> None:
+        request = urllib.request.Request(
+            callback_url,
+            data=json.dumps(self._task_data(task_id)).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            urllib.request.urlopen(request, timeout=5).close()
+        except OSError:
+            return
+        with self._lock:
+            self.callbacks_sent += 1
+
+class FakeVModelServer(FakeProviderServer):
+    """Stand-in for the VModel try-on API (``create-job`` and ``get-job``).
+
+    Point the service at it with ``base_url=server.base_url``.
+    """
+
+    PATH = "/api/vmodel/v1/ai-virtual-try-on"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.route("POST", rf"{self.PATH}/create-job", self._create_job)
+        self.route("GET", rf"{self.PATH}/get-job/([\w-]+)", self._get_job)
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.url}{self.PATH}"
+
+    def _create_job(self, body: Any) -> Tuple[int, Any]:
+        # The multipart upload is recorded undecoded
+        return 200, {"code": 100000, "result": {"job_id": self.create_task("image", body)}}
+
+    def _get_job(self, body: Any, job_id: str) -> Tuple[int, Any]:
+        state = self.task_state(job_id)
+        if state is None:
+            return 404, {"code": 404, "message": "Job not found"}
+        if state == "failed":
+            return 200, {"code": 300104, "message": "Image generation failed", "result": None}
+        urls = [self.result_url(job_id)] if state == "succeeded" else []
+        return 200, {"code": 100000, "result": {"job_id": job_id, "status": state, "output_image_url": urls}}
+
+class FakeAlphabakeServer(FakeProviderServer):
+    """Stand-in for the Alphabake API (``api/tryon/`` and ``api/tryon_state/``, and their v2 forms).
+
+    Point the service at it with ``base_url=server.base_url``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.route("POST", r"/api/tryon/", lambda body: (200, {"tryon_pk": self.create_task("image", body)}))
+        self.route("POST", r"/api/tryon_state/", lambda body: self._state((body or {}).get("tryon_pk")))
+        self.route("POST", r"/api/v2/tryon/", lambda body: (200, {"tryon_id": self.create_task("image", body)}))
+        self.route("POST", r"/api/v2/tryon_status/", lambda body: self._state((body or {}).get("tryon_id")))
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.url}/"
+
+    def _state(self, tryon_id: Optional[str]) -> Tuple[int, Any]:
+        state = self.task_state(tryon_id or "")
+        if state is None:
+            return 404, {"message": "Tryon not found"}
+        if state == "failed":
+            return 200, {"status": "failed", "message": "Simulated failure"}
+        if state == "processing":
+            return 200, {"status": "processing", "message": "success"}
+        return 200, {"status": "done", "message": "success", "s3_url": self.result_url(tryon_id)}
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    # Load tests open hundreds of connections at once
+    request_queue_size = 1024
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    """Turns HTTP requests into FakeProviderServer.handle calls."""
+
+    # Keep-alive, so pooled clients reuse connections as with real providers
+    protocol_version = "HTTP/1.1"
+
+    def _dispatch(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = raw
+        status, payload, *extra = self.server.fake.handle(method, self.path, body)
+        if isinstance(payload, bytes):
+            data, headers = payload, {"Content-Type": "application/octet-stream"}
+        else:
+            data, headers = json.dumps(payload).encode(), {"Content-Type": "application/json"}
+        headers.update(extra[0] if extra else {})
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        pass
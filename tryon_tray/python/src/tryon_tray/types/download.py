@@ -0,0 +1,45 @@
+"""Types for result downloads."""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+class DownloadError(Exception):
+    """Error from downloading a result file."""
+    def __init__(
+        self,
+        url: str,
+        message: str,
+        path: Optional[str] = None,
+        status_code: Optional[int] = None,
+        expected_bytes: Optional[int] = None,
+        received_bytes: Optional[int] = None,
+        retryable: bool = False
+    ):
+        self.url = url
+        self.message = message
+        self.path = path
+        self.status_code = status_code
+        self.expected_bytes = expected_bytes
+        self.received_bytes = received_bytes
+        self.retryable = retryable
+        status = f"[{status_code}] " if status_code else ""
+        super().__init__(f"{status}{url}: {message}")
+
+@dataclass
+class DownloadResult:
+    """Outcome of one file in a multi-file download.
+
+    ``path`` is the local path, or the sink's description of where the file
+    went; ``location`` is what the sink stored (a path, an ``s3://`` URI or
+    an in-memory buffer).
+    """
+    url: str
+    path: str
+    size: Optional[int] = None
+    error: Optional[DownloadError] = None
+    location: Any = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file was downloaded completely."""
+        return self.error is None
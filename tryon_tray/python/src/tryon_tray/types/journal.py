@@ -0,0 +1,18 @@
+"""Types for resuming journaled jobs."""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from ..utils.journal import JournalEntry
+
+@dataclass
+class ResumedJob:
+    """Outcome of one journaled job collected after a restart."""
+    entry: JournalEntry
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the job completed successfully."""
+        return self.error is None
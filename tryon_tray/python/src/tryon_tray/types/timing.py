@@ -0,0 +1,92 @@
+"""Types for job timing."""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+@dataclass
+class PhaseTiming:
+    """One phase of a job.
+
+    Attributes:
+        name: Phase name (see :class:`JobTiming`)
+        start: ``time.monotonic()`` when the phase started
+        duration: Seconds spent in the phase, excluding phases nested in it
+    """
+    name: str
+    start: float
+    duration: float
+
+@dataclass
+class JobTiming:
+    """Where the time of one job went.
+
+    Phases, in the order a job runs them (phases a job skips are absent):
+
+    - ``cache``: looking the job up in the result cache
+    - ``encode``: downloading URL inputs the provider is not sent and
+      preprocessing images
+    - ``throttle``: waiting for the provider's rate limit and in-flight slot
+    - ``submit``: building and sending the request until the provider
+      accepts the job; base64 encoding streams into the upload, so it is
+      counted here
+    - ``inference``: provider queue and inference, until a status check (or
+      callback) sees the job finish; for Replicate, whose client blocks
+      until the prediction is done, the blocking call
+    - ``download``: storing the result files
+    - ``postprocess``: building the result and storing it in the result cache
+
+    Attributes:
+        started_at: Wall-clock time the job started, for logs
+        phases: Phases in the order they finished
+    """
+    started_at: datetime = field(default_factory=datetime.now)
+    phases: List[PhaseTiming] = field(default_factory=list)
+    _started: Optional[float] = field(default=None, repr=False, compare=False)
+    _finished: Optional[float] = field(default=None, repr=False, compare=False)
+    _nested: List[float] = field(default_factory=list, repr=False, compare=False)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a phase.
+
+        A phase opened inside another is subtracted from the outer one, so
+        durations add up to the job's total time.
+        """
+        start = time.monotonic()
+        if self._started is None:
+            self._started = start
+        self._nested.append(0.0)
+        try:
+            yield
+        finally:
+            end = time.monotonic()
+            nested = self._nested.pop()
+            if self._nested:
+                self._nested[-1] += end - start
+            self.phases.append(PhaseTiming(name, start, end - start - nested))
+            self._finished = max(self._finished or end, end)
+
+    def duration(self, name: str) -> float:
+        """Seconds spent in a phase (0 if the job skipped it)."""
+        return sum(p.duration for p in self.phases if p.name == name)
+
+    @property
+    def total(self) -> float:
+        """Seconds from the start of the first phase to the end of the last."""
+        if self._started is None or self._finished is None:
+            return 0.0
+        return self._finished - self._started
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (times in seconds)."""
+        return {
+            "started_at": self.started_at.isoformat(),
+            "total": self.total,
+            "phases": [
+                {"name": p.name, "start": p.start, "duration": p.duration}
+                for p in self.phases
+            ]
+        }
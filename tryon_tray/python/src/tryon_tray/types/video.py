@@ -2,6 +2,9 @@ from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from enum import Enum
 
+from .download import DownloadError
+from .timing import JobTiming
+
 class VideoModelVersion(Enum):
     """Available video model versions."""
     KLING_V1 = "kling-v1"
@@ -20,7 +23,7 @@ class VideoDuration(Enum):
 @dataclass
 class VideoGenParams:
     """Parameters for video generation."""
-    source_image: str
+    source_image: Any
     prompt: str
     model_name: str = VideoModelVersion.KLING_V1_5.value
     mode: str = VideoMode.STANDARD.value
@@ -44,7 +47,9 @@ class VideoGenResponse:
     created_at: Optional[int] = None
     updated_at: Optional[int] = None
     local_path: Optional[str] = None
-    timing: Optional[Dict[str, Any]] = None
+    timing: Optional[JobTiming] = None
+    output: Any = None
+    download_error: Optional[DownloadError] = None
 
 class VideoGenError(Exception):
     """Error from video generation."""
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from enum import Enum
 
+from .timing import JobTiming
+
 class VTONProvider(Enum):
     """Available VTON providers."""
     FASHNAI = "fashnai"
@@ -43,7 +45,35 @@ class VTONResponse:
     mode: str
     category: str
     local_path: Optional[str] = None
-    timing: Optional[Dict[str, Any]] = None
+    timing: Optional[JobTiming] = None
+
+@dataclass
+class VTONBatchResult:
+    """Outcome of one job in a batch run."""
+    index: int
+    model_image: Any
+    garment_image: Any
+    params: Dict[str, Any]
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the job completed successfully."""
+        return self.error is None
+
+@dataclass
+class VTONProviderResult:
+    """Outcome of one provider in a fan-out run."""
+    model_name: str
+    params: Dict[str, Any]
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the provider completed successfully."""
+        return self.error is None
 
 class VTONError(Exception):
     """Error from virtual try-on."""
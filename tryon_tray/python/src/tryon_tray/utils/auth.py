@@ -0,0 +1,73 @@
+"""Authentication helpers."""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import jwt
+
+TOKEN_TTL = 1800
+REFRESH_MARGIN = 60
+
+class JWTCache:
+    """Process-wide cache of signed HS256 tokens.
+
+    A token is signed once per access ID and reused by every service
+    instance and thread until ``refresh_margin`` seconds before it expires.
+    """
+
+    def __init__(self, ttl: int = TOKEN_TTL, refresh_margin: int = REFRESH_MARGIN):
+        """Initialize the cache.
+
+        Args:
+            ttl: Lifetime of a signed token in seconds
+            refresh_margin: Seconds before expiry at which a new token is signed
+        """
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self._tokens: Dict[Tuple[str, str], Tuple[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, access_id: str, secret_key: str) -> str:
+        """Get a valid token for an access ID, signing a new one if needed."""
+        key = (access_id, secret_key)
+        now = int(time.time())
+        cached = self._tokens.get(key)
+        if cached and cached[1] - self.refresh_margin > now:
+            return cached[0]
+
+        with self._lock:
+            # Another thread may have refreshed it while we waited
+            cached = self._tokens.get(key)
+            if cached and cached[1] - self.refresh_margin > now:
+                return cached[0]
+            expires = now + self.ttl
+            payload = {
+                "iss": access_id,
+                "exp": expires,
+                "nbf": now - 5
+            }
+            token = jwt.encode(payload, secret_key, headers={"alg": "HS256", "typ": "JWT"})
+            self._tokens[key] = (token, expires)
+        return token
+
+    def clear(self) -> None:
+        """Drop all cached tokens."""
+        with self._lock:
+            self._tokens.clear()
+
+_cache: Optional[JWTCache] = None
+_cache_lock = threading.Lock()
+
+def get_jwt_cache() -> JWTCache:
+    """Get the process-wide token cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = JWTCache()
+    return _cache
+
+def get_jwt_token(access_id: str, secret_key: str) -> str:
+    """Get a cached HS256 token for an access ID."""
+    return get_jwt_cache().get(access_id, secret_key)
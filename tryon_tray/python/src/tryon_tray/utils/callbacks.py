@@ -0,0 +1,199 @@
+"""Completion callbacks pushed by providers."""
+
+import json
+import secrets
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from .polling import PollScheduler, get_poll_scheduler
+
+CALLBACK_PATH = "/tryon-tray/callbacks/"
+
+class CallbackRegistration:
+    """A callback URL handed to a provider for one job.
+
+    The registration exists before the job is submitted (its URL goes into
+    the submit payload) and is attached to the job's scheduler future once
+    polling starts. A callback that arrives before that is remembered and
+    wakes the job as soon as it is attached.
+    """
+
+    def __init__(self, receiver: "CallbackReceiver", token: str, url: str):
+        self.receiver = receiver
+        self.token = token
+        self.url = url
+        self.payloads: List[Any] = []
+        self._future: Optional[Future] = None
+        self._scheduler: Optional[PollScheduler] = None
+        self._lock = threading.Lock()
+
+    def attach(self, future: Future, scheduler: Optional[PollScheduler] = None) -> None:
+        """Wake the given scheduler job whenever a callback arrives.
+
+        Args:
+            future: Future returned by PollScheduler.submit
+            scheduler: Scheduler tracking the job (defaults to the process-wide one)
+        """
+        with self._lock:
+            self._future = future
+            self._scheduler = scheduler or get_poll_scheduler()
+            arrived = bool(self.payloads)
+        if arrived:
+            self._scheduler.wake(future)
+
+    def notify(self, payload: Any) -> None:
+        """Record a callback payload and wake the attached job."""
+        with self._lock:
+            self.payloads.append(payload)
+            future, scheduler = self._future, self._scheduler
+        if future is not None:
+            scheduler.wake(future)
+
+    def close(self) -> None:
+        """Stop accepting callbacks for this job."""
+        self.receiver.unregister(self.token)
+
+class CallbackReceiver:
+    """Receives provider completion callbacks and wakes the matching jobs.
+
+    A callback only tells the poll scheduler to check the job right away;
+    the result itself still comes from the provider's status endpoint, so a
+    forged or malformed callback cannot complete a job, and jobs whose
+    callback never arrives are still caught by fallback polling.
+
+    By default an embedded HTTP server is started on ``host:port``. Pass
+    ``serve=False`` to mount the receiver in an existing web app instead and
+    forward requests for ``<public_url><token>`` to :meth:`dispatch`, e.g.
+    from a Django view::
+
+        def tryon_callback(request, token):
+            ok = receiver.dispatch(token, json.loads(request.body or b"null"))
+            return HttpResponse(status=200 if ok else 404)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        public_url: Optional[str] = None,
+        serve: bool = True
+    ):
+        """Initialize the receiver.
+
+        Args:
+            host: Interface the embedded server listens on
+            port: Port the embedded server listens on (0 picks a free port)
+            public_url: Base URL providers should call, if the server is
+                reachable under another address (e.g. behind a tunnel or
+                reverse proxy); registration tokens are appended to it
+            serve: Whether to start the embedded server
+        """
+        self._registrations: Dict[str, CallbackRegistration] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        if serve:
+            self._server = ThreadingHTTPServer((host, port), _CallbackHandler)
+            self._server.receiver = self
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                name="tryon-tray-callbacks",
+                daemon=True
+            )
+            self._thread.start()
+            bound_host, bound_port = self._server.server_address[:2]
+            public_url = public_url or f"http://{bound_host}:{bound_port}{CALLBACK_PATH}"
+        if not public_url:
+            raise ValueError("public_url is required when serve=False")
+        self.public_url = public_url if public_url.endswith("/") else public_url + "/"
+
+    def register(self) -> CallbackRegistration:
+        """Create a callback URL for one job."""
+        token = secrets.token_urlsafe(16)
+        registration = CallbackRegistration(self, token, f"{self.public_url}{token}")
+        with self._lock:
+            self._registrations[token] = registration
+        return registration
+
+    def unregister(self, token: str) -> None:
+        """Forget a registration."""
+        with self._lock:
+            self._registrations.pop(token, None)
+
+    def dispatch(self, token: str, payload: Any = None) -> bool:
+        """Deliver a callback.
+
+        Args:
+            token: Registration token from the callback URL
+            payload: Decoded callback body
+
+        Returns:
+            False if the token is unknown
+        """
+        with self._lock:
+            registration = self._registrations.get(token)
+        if registration is None:
+            return False
+        registration.notify(payload)
+        return True
+
+    def close(self) -> None:
+        """Stop the embedded server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+class _CallbackHandler(BaseHTTPRequestHandler):
+    """Routes ``POST <CALLBACK_PATH><token>`` to the receiver."""
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            payload = body.decode("utf-8", "replace")
+
+        token = None
+        if self.path.startswith(CALLBACK_PATH):
+            token = self.path[len(CALLBACK_PATH):].split("?", 1)[0]
+        found = bool(token) and self.server.receiver.dispatch(token, payload)
+        self.send_response(200 if found else 404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+_receiver: Optional[CallbackReceiver] = None
+_receiver_lock = threading.Lock()
+
+def get_callback_receiver() -> CallbackReceiver:
+    """Get the process-wide callback receiver, starting it on first use."""
+    global _receiver
+    if _receiver is None:
+        with _receiver_lock:
+            if _receiver is None:
+                _receiver = CallbackReceiver()
+    return _receiver
+
+def configure_callbacks(**kwargs) -> CallbackReceiver:
+    """Replace the process-wide callback receiver.
+
+    Args:
+        **kwargs: CallbackReceiver arguments (host, port, public_url, serve)
+
+    Returns:
+        The new receiver
+    """
+    global _receiver
+    with _receiver_lock:
+        previous = _receiver
+        _receiver = CallbackReceiver(**kwargs)
+    if previous is not None:
+        previous.close()
+    return _receiver
@@ -0,0 +1,354 @@
+"""Record provider HTTP exchanges and replay them offline."""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+INTERACTIONS = "interactions.jsonl"
+BLOBS = "blobs"
+
+# Text bodies up to this size are stored in the interaction itself
+INLINE_LIMIT = 64 * 1024
+
+# Responses are stored decoded, so these no longer describe the body
+_WIRE_HEADERS = frozenset({"content-encoding", "transfer-encoding", "content-length"})
+
+# Methods whose repeated requests replay as a timeline rather than one by one
+_TIMELINE_METHODS = frozenset({"GET", "HEAD"})
+
+# Job IDs are at least this long; shorter strings are not used to link requests
+_MIN_ID_LENGTH = 8
+
+class CassetteError(Exception):
+    """A replayed request has no recorded exchange."""
+
+@dataclass
+class _Group:
+    """Recorded exchanges of one request (method, URL and body)."""
+    indices: List[int]
+    position: int = -1
+    origin: Optional[int] = None
+    anchor: Optional[Tuple[float, float]] = None
+
+class Cassette:
+    """Provider HTTP exchanges stored in a directory.
+
+    ``interactions.jsonl`` holds one exchange per line: method, URL, status,
+    response headers and when the request was sent and how long it took.
+    Request and response bodies that are binary or larger than
+    ``INLINE_LIMIT`` (images, base64 payloads, result files) are stored
+    once in ``blobs/``, named by their SHA-256. Request headers are not
+    recorded, so credentials stay out of the cassette.
+
+    Install one for every provider client with
+    ``configure_http(cassette=Cassette(path, mode))``:
+
+    - ``"record"`` sends requests to the providers and records every
+      exchange, replacing any recorded before.
+    - ``"replay"`` sends nothing and answers from the recording, each
+      response after its recorded duration divided by ``speed``. Repeated
+      GETs, i.e. status checks, replay as a timeline: a check gets the
+      response recorded at the same scaled time after its job was
+      submitted, so a polling policy that checks earlier or later sees the
+      statuses it would have seen. Other requests (submits) get the next
+      unused exchange for their URL, matched on the body when it is the same.
+
+    The Replicate service uses Replicate's own client and is not recorded.
+    """
+
+    def __init__(self, path: Union[str, Path], mode: str = "replay", speed: Optional[float] = 1.0):
+        """Open a cassette.
+
+        Args:
+            path: Cassette directory (created when recording)
+            mode: "record" or "replay"
+            speed: Replay speed-up, e.g. 10 to replay ten times faster;
+                None replays without delays, one recorded status per check
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+        self.path = Path(path).expanduser()
+        self.mode = mode
+        self.speed = speed
+        self.interactions: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._file = None
+        if mode == "record":
+            (self.path / BLOBS).mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path / INTERACTIONS, "w")
+        else:
+            with open(self.path / INTERACTIONS) as f:
+                self.interactions = [json.loads(line) for line in f if line.strip()]
+            self._index()
+
+    def adapter(self, **kwargs) -> BaseAdapter:
+        """Transport adapter for a ``requests`` session.
+
+        Args:
+            **kwargs: HTTPAdapter arguments, used when recording
+        """
+        if self.mode == "record":
+            return _RecordingAdapter(self, **kwargs)
+        return _ReplayAdapter(self)
+
+    def close(self) -> None:
+        """Finish recording."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record(
+        self,
+        request: requests.PreparedRequest,
+        body: bytes,
+        start: float,
+        response: Optional[requests.Response] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """Append one exchange (a response, or the error the request raised)."""
+        interaction: Dict[str, Any] = {
+            "method": request.method,
+            "url": request.url,
+            "request": self._store_body(body, request.headers.get("Content-Type", "")),
+            "start": start - self._start,
+            "elapsed": time.monotonic() - start,
+        }
+        if response is not None:
+            headers = [[k, v] for k, v in response.headers.items() if k.lower() not in _WIRE_HEADERS]
+            interaction.update(
+                status=response.status_code,
+                reason=response.reason,
+                headers=headers,
+                response=self._store_body(response.content, response.headers.get("Content-Type", ""))
+            )
+        else:
+            interaction.update(error=type(error).__name__, message=str(error))
+        line = json.dumps(interaction)
+        with self._lock:
+            if self._file is None:
+                raise ValueError("Cassette is closed")
+            self.interactions.append(interaction)
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def match(self, method: str, url: str, body: bytes) -> Dict[str, Any]:
+        """Recorded exchange to answer a request with.
+
+        Raises:
+            CassetteError: If the cassette has no exchange for the request
+        """
+        key = (method, url, _digest(body))
+        with self._lock:
+            group = self._groups.get(key)
+            if group is not None and (method in _TIMELINE_METHODS or group.position < len(group.indices) - 1):
+                return self.interactions[self._advance(group, method)]
+
+            # A request not recorded verbatim, e.g. a submit with fresh
+            # timestamps in its body: the next unused exchange for the URL
+            queue = self._by_url.get((method, url))
+            while queue:
+                index = queue.popleft()
+                if index not in self._used:
+                    self._used.add(index)
+                    return self.interactions[index]
+            if group is not None:
+                return self.interactions[group.indices[-1]]
+        raise CassetteError(f"No recorded exchange for {method} {url}")
+
+    def served(self, interaction: Dict[str, Any]) -> None:
+        """Note that an exchange was replayed, to time the status checks of its job."""
+        with self._lock:
+            self._served_at[id(interaction)] = time.monotonic()
+
+    def build_response(self, request: requests.PreparedRequest, interaction: Dict[str, Any]) -> requests.Response:
+        """Response replaying a recorded exchange."""
+        data = self._load_body(interaction.get("response"))
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction.get("reason")
+        response.headers = CaseInsensitiveDict(interaction.get("headers") or [])
+        response.headers["Content-Length"] = str(len(data))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(data)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def _advance(self, group: _Group, method: str) -> int:
+        """Pick the exchange of a group to replay next; the caller holds the lock."""
+        last = len(group.indices) - 1
+        if self.speed is None:
+            group.position = min(group.position + 1, last)
+            return group.indices[group.position]
+
+        now = time.monotonic()
+        if group.anchor is None:
+            origin = self.interactions[group.origin] if group.origin is not None else None
+            if origin is not None and id(origin) in self._served_at:
+                # Time status checks from when their job's submit was replayed
+                group.anchor = (self._served_at[id(origin)], origin["start"] + origin["elapsed"])
+            else:
+                group.anchor = (now, self.interactions[group.indices[0]]["start"])
+        replayed_at, recorded_at = group.anchor
+        target = recorded_at + (now - replayed_at) * self.speed
+        position = 0
+        while position < last and self.interactions[group.indices[position + 1]]["start"] <= target:
+            position += 1
+        if method in _TIMELINE_METHODS:
+            group.position = max(position, group.position)
+        else:
+            # A repeated submit must get a job of its own
+            group.position = min(max(position, group.position + 1), last)
+        index = group.indices[group.position]
+        self._used.add(index)
+        return index
+
+    def _index(self) -> None:
+        """Group the recorded exchanges for :meth:`match`."""
+        self._groups: Dict[Tuple[str, str, str], _Group] = {}
+        self._by_url: Dict[Tuple[str, str], Deque[int]] = {}
+        self._used = set()
+        self._served_at: Dict[int, float] = {}
+        # Where each job ID first appeared in a response, e.g. a submit
+        first_seen: Dict[str, int] = {}
+        for index, interaction in enumerate(self.interactions):
+            method, url = interaction["method"], interaction["url"]
+            request = interaction.get("request")
+            key = (method, url, request["sha256"] if request else "")
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _Group([])
+                ids = _identifiers(urlsplit(url).path.split("/"), request)
+                origins = [first_seen[i] for i in ids if i in first_seen]
+                group.origin = max(origins) if origins else None
+            group.indices.append(index)
+            self._by_url.setdefault((method, url), deque()).append(index)
+            for value in _identifiers([], interaction.get("response")):
+                first_seen.setdefault(value, index)
+
+    def _store_body(self, data: bytes, content_type: str) -> Optional[Dict[str, Any]]:
+        if not data:
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        if len(data) <= INLINE_LIMIT and not content_type.startswith(("image/", "video/", "application/octet-stream")):
+            try:
+                return {"sha256": digest, "text": data.decode("utf-8")}
+            except UnicodeDecodeError:
+                pass
+        blob = self.path / BLOBS / digest
+        if not blob.exists():
+            temp = blob.with_name(f"{digest}.{threading.get_ident()}.tmp")
+            temp.write_bytes(data)
+            os.replace(temp, blob)
+        return {"sha256": digest, "blob": digest}
+
+    def _load_body(self, stored: Optional[Dict[str, Any]]) -> bytes:
+        if not stored:
+            return b""
+        if "text" in stored:
+            return stored["text"].encode("utf-8")
+        return (self.path / BLOBS / stored["blob"]).read_bytes()
+
+class _RecordingAdapter(HTTPAdapter):
+    """Sends requests and records each exchange."""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        body = _body_bytes(request.body)
+        if request.body is not None:
+            # A streamed body can only be read once
+            request.body = body
+        start = time.monotonic()
+        try:
+            response = super().send(request, **kwargs)
+            response.content
+        except requests.RequestException as e:
+            self.cassette.record(request, body, start, error=e)
+            raise
+        self.cassette.record(request, body, start, response=response)
+        return response
+
+class _ReplayAdapter(BaseAdapter):
+    """Answers requests from a cassette without sending them."""
+
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout: Any = None,
+             verify: Any = True, cert: Any = None, proxies: Any = None) -> requests.Response:
+        # Streamed bodies are still encoded, as they would be when sent
+        interaction = self.cassette.match(request.method, request.url, _body_bytes(request.body))
+        if self.cassette.speed is not None:
+            time.sleep(interaction["elapsed"] / self.cassette.speed)
+        self.cassette.served(interaction)
+        if "error" in interaction:
+            error_class = getattr(requests.exceptions, interaction["error"], None)
+            if not (isinstance(error_class, type) and issubclass(error_class, requests.RequestException)):
+                error_class = requests.ConnectionError
+            raise error_class(interaction["message"], request=request)
+        return self.cassette.build_response(request, interaction)
+
+    def close(self) -> None:
+        pass
+
+def _body_bytes(body: Any) -> bytes:
+    """A prepared request body as bytes."""
+    if body is None:
+        return b""
+    if isinstance(body, bytes):
+        return body
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    if hasattr(body, "read"):
+        return body.read()
+    return b"".join(chunk.encode("utf-8") if isinstance(chunk, str) else chunk for chunk in body)
+
+def _digest(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest() if body else ""
+
+def _identifiers(segments: List[str], stored: Optional[Dict[str, Any]]) -> Iterator[str]:
+    """Strings long enough to be job IDs, from URL path segments and a JSON body."""
+    for segment in segments:
+        if len(segment) >= _MIN_ID_LENGTH:
+            yield segment
+    if not stored or "text" not in stored:
+        return
+    try:
+        values = [json.loads(stored["text"])]
+    except ValueError:
+        return
+    while values:
+        value = values.pop()
+        if isinstance(value, dict):
+            values.extend(value.values())
+        elif isinstance(value, list):
+            values.extend(value)
+        elif isinstance(value, (str, int)) and not isinstance(value, bool) and len(str(value)) >= _MIN_ID_LENGTH:
+            yield str(value)
@@ -0,0 +1,282 @@
+"""Parallel, resumable downloads of result files."""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+import requests
+
+from . import http
+from .http import get_async_client
+from .retry import RetryPolicy
+from .sinks import FileWriter, ResultSink, SinkWriter, indexed_paths
+from ..types.download import DownloadError, DownloadResult
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Client errors worth retrying: request timeout and rate limiting
+RETRYABLE_CLIENT_STATUSES = frozenset({408, 429})
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-\d+/(\d+|\*)")
+_CONTENT_RANGE_UNSATISFIED = re.compile(r"bytes \*/(\d+)")
+
+class Downloader:
+    """Downloads result files concurrently, resuming and verifying each one.
+
+    Data is written to ``<path>.part`` and renamed into place once its size
+    matches the Content-Length the server announced. A transfer that fails
+    part way is retried with an HTTP Range request from the bytes already
+    on disk, so a retry only fetches what is missing; servers that ignore
+    the Range header send the whole file again.
+
+    Files can also be streamed into any :class:`ResultSink` (memory, S3, ...)
+    with the same resume and size checks.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_workers: int = 4,
+        retry: Optional[RetryPolicy] = None,
+        resume: bool = True,
+        timeout: Optional[Union[float, Tuple[float, float]]] = None
+    ):
+        """Initialize the downloader.
+
+        Args:
+            chunk_size: Bytes read from the response per write
+            max_workers: Files downloaded at once by :meth:`download_all`
+            retry: Retry schedule for failed transfers (defaults to the
+                HTTP client's policy)
+            resume: Whether to continue from an existing ``.part`` file
+            timeout: Request timeout (defaults to the HTTP client's)
+        """
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.retry = retry
+        self.resume = resume
+        self.timeout = timeout
+
+    def download(self, url: str, path: Union[str, Path]) -> Path:
+        """Download one file.
+
+        Args:
+            url: URL to download from
+            path: Path to save the file to
+
+        Returns:
+            The path of the complete file
+
+        Raises:
+            DownloadError: If the file could not be downloaded completely
+        """
+        return Path(self.fetch(url, FileWriter(path, resume=self.resume)))
+
+    def fetch(self, url: str, writer: SinkWriter) -> Any:
+        """Download one file into a sink writer.
+
+        Args:
+            url: URL to download from
+            writer: Writer receiving the file
+
+        Returns:
+            What the writer stored (see :meth:`SinkWriter.commit`)
+
+        Raises:
+            DownloadError: If the file could not be downloaded completely
+        """
+        retry = self.retry or http.get_session_pool().config.retry
+
+        attempt = 0
+        try:
+            while True:
+                try:
+                    self._transfer(url, writer)
+                    return writer.commit()
+                except DownloadError as e:
+                    e.path = writer.location
+                    if not e.retryable or attempt >= retry.max_retries:
+                        raise
+                except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                    if attempt >= retry.max_retries:
+                        raise DownloadError(
+                            url, f"Transfer failed: {e}",
+                            path=writer.location,
+                            received_bytes=writer.size,
+                            retryable=True
+                        ) from e
+                except requests.RequestException as e:
+                    # Malformed URL, unsupported scheme, redirect loop, ...
+                    raise DownloadError(
+                        url, f"Request failed: {e}",
+                        path=writer.location,
+                        received_bytes=writer.size
+                    ) from e
+                time.sleep(retry.delay(attempt))
+                attempt += 1
+        except BaseException:
+            writer.abort()
+            raise
+
+    def download_all(
+        self,
+        urls: Sequence[str],
+        paths: Sequence[Union[str, Path]]
+    ) -> List[DownloadResult]:
+        """Download several files at once.
+
+        Args:
+            urls: URLs to download
+            paths: Path to save each URL to
+
+        Returns:
+            DownloadResult for each URL, in the order given; failed files
+            carry their DownloadError instead of raising
+        """
+        if len(urls) != len(paths):
+            raise ValueError("urls and paths must have the same length")
+        return self._fetch_all(urls, lambda i: FileWriter(paths[i], resume=self.resume))
+
+    def save_all(self, urls: Sequence[str], sink: ResultSink) -> List[DownloadResult]:
+        """Download several files into a result sink at once.
+
+        Args:
+            urls: URLs to download
+            sink: Sink storing the files
+
+        Returns:
+            DownloadResult for each URL, in the order given, with what the
+            sink stored as its ``location``; failed files carry their
+            DownloadError instead of raising
+        """
+        return self._fetch_all(urls, lambda i: sink.open(urls[i], i, len(urls)))
+
+    def _fetch_all(self, urls: Sequence[str], open_writer: Callable[[int], SinkWriter]) -> List[DownloadResult]:
+        def fetch(index: int) -> DownloadResult:
+            writer = open_writer(index)
+            result = DownloadResult(url=urls[index], path=writer.location)
+            try:
+                result.location = self.fetch(urls[index], writer)
+                result.size = writer.size
+            except DownloadError as e:
+                result.error = e
+            return result
+
+        if len(urls) <= 1:
+            return [fetch(i) for i in range(len(urls))]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)), thread_name_prefix="tryon-tray-download") as pool:
+            return list(pool.map(fetch, range(len(urls))))
+
+    async def download_async(self, url: str, path: Union[str, Path]) -> Path:
+        """Download one file without blocking the event loop."""
+        return await get_async_client().run(self.download, url, path)
+
+    async def download_all_async(
+        self,
+        urls: Sequence[str],
+        paths: Sequence[Union[str, Path]]
+    ) -> List[DownloadResult]:
+        """Download several files at once without blocking the event loop."""
+        return await get_async_client().run(self.download_all, urls, paths)
+
+    async def save_all_async(self, urls: Sequence[str], sink: ResultSink) -> List[DownloadResult]:
+        """Download several files into a result sink without blocking the event loop."""
+        return await get_async_client().run(self.save_all, urls, sink)
+
+    def _transfer(self, url: str, writer: SinkWriter) -> None:
+        """Fetch the missing bytes of one file into its writer."""
+        offset = writer.size
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        kwargs = {"timeout": self.timeout} if self.timeout is not None else {}
+
+        # Retries are handled by fetch, where they can resume, not in the HTTP client
+        with http.get(url, headers=headers, stream=True, retry=False, **kwargs) as response:
+            status = response.status_code
+            if status == 416 and offset:
+                match = _CONTENT_RANGE_UNSATISFIED.match(response.headers.get("Content-Range", ""))
+                if match and int(match.group(1)) == offset:
+                    # The previous attempt had already received everything
+                    return
+                writer.reset()
+                raise DownloadError(url, "Partial download no longer matches the file", status_code=status, retryable=True)
+            if status >= 400:
+                raise DownloadError(
+                    url, response.reason or "Request failed",
+                    status_code=status,
+                    retryable=status >= 500 or status in RETRYABLE_CLIENT_STATUSES
+                )
+
+            expected = None
+            if status == 206:
+                match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+                if not match or int(match.group(1)) != offset:
+                    writer.reset()
+                    raise DownloadError(url, "Server resumed at the wrong offset", status_code=status, retryable=True)
+                if match.group(2) != "*":
+                    expected = int(match.group(2))
+            else:
+                # The server sent the whole file
+                if offset:
+                    writer.reset()
+                encoding = response.headers.get("Content-Encoding", "identity")
+                length = response.headers.get("Content-Length")
+                if length is not None and encoding == "identity":
+                    expected = int(length)
+
+            interrupted = None
+            try:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    writer.write(chunk)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                # Keep what arrived; the retry resumes from there
+                interrupted = e
+
+        received = writer.size
+        if interrupted is not None:
+            raise DownloadError(
+                url, f"Transfer interrupted: {interrupted}",
+                status_code=status,
+                expected_bytes=expected,
+                received_bytes=received,
+                retryable=True
+            ) from interrupted
+        if expected is not None and received != expected:
+            if received > expected:
+                writer.reset()
+            raise DownloadError(
+                url, "Size does not match Content-Length",
+                status_code=status,
+                expected_bytes=expected,
+                received_bytes=received,
+                retryable=True
+            )
+
+_downloader: Optional[Downloader] = None
+_downloader_lock = threading.Lock()
+
+def get_downloader() -> Downloader:
+    """Get the process-wide downloader."""
+    global _downloader
+    if _downloader is None:
+        with _downloader_lock:
+            if _downloader is None:
+                _downloader = Downloader()
+    return _downloader
+
+def configure_downloads(**kwargs) -> Downloader:
+    """Replace the process-wide downloader.
+
+    Args:
+        **kwargs: Downloader arguments (chunk_size, max_workers, retry,
+            resume, timeout)
+
+    Returns:
+        The new downloader
+    """
+    global _downloader
+    with _downloader_lock:
+        _downloader = Downloader(**kwargs)
+    return _downloader
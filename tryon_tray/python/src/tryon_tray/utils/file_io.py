@@ -2,31 +2,70 @@
 
 import base64
 import os
-import requests
 from pathlib import Path
 from typing import Union, Optional
+from urllib.parse import unquote, urlparse
+from . import http
+from .download import Downloader, get_downloader
+from .image_input import ImageData, open_image
+from .preprocess import ImageSpec, encode_preprocessed
+from .streaming import Base64File
 
-def image_to_base64(image_path: Union[str, Path]) -> str:
+def image_to_base64(image_path: Union[str, Path, ImageData]) -> str:
     """Convert image to base64 string.
     
     Args:
-        image_path: Path to image file
+        image_path: Path to image file, or an in-memory image
         
     Returns:
         Base64 encoded image string
     """
-    with open(image_path, "rb") as f:
+    with open_image(image_path) as f:
         return base64.b64encode(f.read()).decode()
 
-def base64_with_prefix(image_path: Union[str, Path]) -> str:
+def base64_with_prefix(image_path: Union[str, Path, ImageData]) -> str:
     """Convert image to base64 string with data URI prefix.
     
     Args:
-        image_path: Path to image file
+        image_path: Path to image file, or an in-memory image
         
     Returns:
         Base64 encoded image string with data URI prefix
     """
+    return f"{_data_uri_prefix(image_path)}{image_to_base64(image_path)}"
+
+def stream_base64(
+    image_path: Union[str, Path, ImageData],
+    data_uri: bool = False,
+    spec: Optional[ImageSpec] = None
+) -> Base64File:
+    """Base64 payload value that is encoded from the file while the request is sent.
+    
+    Drop-in replacement for :func:`image_to_base64` / :func:`base64_with_prefix`
+    in JSON payloads sent through :mod:`tryon_tray.utils.http`, which keeps
+    memory per request constant instead of proportional to the image size.
+    
+    Args:
+        image_path: Path to image file, or an in-memory image
+        data_uri: Whether to add the data URI prefix
+        spec: Preprocess the image with this spec before encoding
+        
+    Returns:
+        Base64File payload value
+    """
+    if spec is None:
+        return Base64File(image_path, prefix=_data_uri_prefix(image_path) if data_uri else "")
+    return Base64File(
+        image_path,
+        prefix=f"data:{spec.mime_type};base64," if data_uri else "",
+        variant=spec.variant,
+        encode=lambda: encode_preprocessed(image_path, spec)
+    )
+
+def _data_uri_prefix(image_path: Union[str, Path, ImageData]) -> str:
+    """Data URI prefix for an image file, based on its extension."""
+    if isinstance(image_path, ImageData):
+        return f"data:{image_path.mime_type};base64,"
     ext = Path(image_path).suffix.lower()
     mime_type = {
         '.jpg': 'image/jpeg',
@@ -34,37 +73,44 @@ def base64_with_prefix(image_path: Union[str, Path]) -> str:
         '.png': 'image/png',
         '.gif': 'image/gif'
     }.get(ext, 'image/jpeg')
+    return f"data:{mime_type};base64,"
+
+def fetch_image(url: str) -> ImageData:
+    """Download an input image into memory.
     
-    return f"data:{mime_type};base64,{image_to_base64(image_path)}"
+    Args:
+        url: URL of the image
+        
+    Returns:
+        The image, named after the last segment of the URL path
+    """
+    response = http.get(url)
+    response.raise_for_status()
+    name = os.path.basename(unquote(urlparse(url).path)) or None
+    return ImageData(response.content, name, url=url)
 
-def download_file(url: str, output_path: Union[str, Path], chunk_size: int = 8192) -> Optional[str]:
+def download_file(url: str, output_path: Union[str, Path], chunk_size: Optional[int] = None) -> str:
     """Download file from URL to specified path.
     
+    The transfer is retried and resumed on failure and checked against the
+    announced Content-Length (see :class:`~tryon_tray.utils.download.Downloader`).
+    
     Args:
         url: URL to download from
         output_path: Path to save file to
-        chunk_size: Size of chunks to download
+        chunk_size: Size of chunks to download (defaults to the process-wide
+            downloader's)
         
     Returns:
-        Path to downloaded file if successful, None otherwise
-    """
-    try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        Path to downloaded file
         
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                if chunk:
-                    f.write(chunk)
-        return str(output_path)
-    except Exception as e:
-        print(f"Error downloading file: {e}")
-        return None
+    Raises:
+        DownloadError: If the file could not be downloaded completely
+    """
+    downloader = get_downloader() if chunk_size is None else Downloader(chunk_size=chunk_size)
+    return str(downloader.download(url, output_path))
 
-def download_image(url: str, output_path: Union[str, Path]) -> Optional[str]:
+def download_image(url: str, output_path: Union[str, Path]) -> str:
     """Download image from URL to specified path.
     
     Args:
@@ -72,6 +118,9 @@ def download_image(url: str, output_path: Union[str, Path]) -> Optional[str]:
         output_path: Path to save image to
         
     Returns:
-        Path to downloaded image if successful, None otherwise
+        Path to downloaded image
+        
+    Raises:
+        DownloadError: If the image could not be downloaded completely
     """
     return download_file(url, output_path) 
\ No newline at end of file
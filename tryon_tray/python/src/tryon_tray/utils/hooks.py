@@ -0,0 +1,70 @@
+"""Lifecycle hooks for try-on and video jobs."""
+
+import logging
+import threading
+from typing import Any, Iterable, List, Tuple
+
+from ..types.download import DownloadResult
+
+logger = logging.getLogger(__name__)
+
+class JobHooks:
+    """Receives the lifecycle events of jobs.
+
+    Subclass it and override the events you need; every method is a no-op
+    by default. Hooks run synchronously on the thread that raised the event
+    (the event loop, or a polling or download worker), so they should be
+    quick and thread-safe. An exception in a hook is logged and does not
+    affect the job.
+
+    Every method gets the service running the job; its ``provider``,
+    ``timing`` and ``journal_id`` describe the job.
+    """
+
+    def on_submit(self, service: Any) -> None:
+        """The provider accepted the job."""
+
+    def on_poll(self, service: Any) -> None:
+        """The job's status is about to be checked."""
+
+    def on_complete(self, service: Any, result: Any) -> None:
+        """The provider finished the job with ``result`` (its result URLs)."""
+
+    def on_error(self, service: Any, error: BaseException) -> None:
+        """The job failed, timed out or could not be submitted."""
+
+    def on_download(self, service: Any, results: List[DownloadResult]) -> None:
+        """The job's result files were stored; failed files have an ``error``."""
+
+_hooks: Tuple[JobHooks, ...] = ()
+_hooks_lock = threading.Lock()
+
+def add_hooks(hooks: JobHooks) -> JobHooks:
+    """Send the events of every job in this process to ``hooks``.
+
+    Returns:
+        The hooks, for :func:`remove_hooks`
+    """
+    global _hooks
+    with _hooks_lock:
+        if hooks not in _hooks:
+            _hooks = _hooks + (hooks,)
+    return hooks
+
+def remove_hooks(hooks: JobHooks) -> None:
+    """Stop sending events to hooks added with :func:`add_hooks`."""
+    global _hooks
+    with _hooks_lock:
+        _hooks = tuple(h for h in _hooks if h is not hooks)
+
+def get_hooks() -> Tuple[JobHooks, ...]:
+    """Hooks registered process-wide."""
+    return _hooks
+
+def emit(hooks: Iterable[JobHooks], event: str, service: Any, *args: Any) -> None:
+    """Call ``event`` on each of ``hooks``, logging rather than raising errors."""
+    for receiver in hooks:
+        try:
+            getattr(receiver, event)(service, *args)
+        except Exception:
+            logger.exception("%s.%s failed", type(receiver).__name__, event)
@@ -0,0 +1,329 @@
+"""HTTP client utilities."""
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, Iterator, Optional, Tuple, TypeVar, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cassette import Cassette
+from .ratelimit import Governor, parse_retry_after
+from .retry import IDEMPOTENT_METHODS, RetryPolicy
+from .streaming import StreamingJSONBody, contains_streams
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 32
+
+@dataclass
+class HTTPConfig:
+    """Connection pool settings shared by all provider clients.
+
+    Attributes:
+        pool_maxsize: Connections kept per host
+        timeout: Seconds, or (connect, read) seconds, per request
+        keep_alive: Whether to reuse connections between requests
+        retry: When failed requests are sent again
+        cassette: Record every exchange to, or replay every exchange from,
+            this cassette (see :mod:`tryon_tray.utils.cassette`)
+    """
+    pool_maxsize: int = 32
+    timeout: Union[float, Tuple[float, float]] = (10.0, 120.0)
+    keep_alive: bool = True
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    cassette: Optional[Cassette] = None
+
+class SessionPool:
+    """Per-host pooled ``requests`` sessions.
+
+    Every service instance in the process sends its submits, status polls
+    and downloads through the same session for a given host, so TCP and TLS
+    connections are reused instead of re-established on every call.
+    """
+
+    def __init__(self, config: Optional[HTTPConfig] = None):
+        """Initialize the pool.
+
+        Args:
+            config: Pool settings (defaults to HTTPConfig())
+        """
+        self.config = config or HTTPConfig()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        """Create a session with a pooled adapter."""
+        session = requests.Session()
+        if self.config.cassette is not None:
+            adapter = self.config.cassette.adapter(pool_connections=1, pool_maxsize=self.config.pool_maxsize)
+        else:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.config.pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.config.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """Get the session for the host of a URL."""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._sessions[host] = self._create_session()
+        return session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        governor: Optional[Governor] = None,
+        idempotent: Optional[bool] = None,
+        retry: bool = True,
+        **kwargs
+    ) -> requests.Response:
+        """Send an HTTP request over the pooled session for its host.
+        
+        Failed requests are retried according to ``config.retry``.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            governor: Provider rate limiter to wait on; 429 responses are
+                then retried after their Retry-After instead of returned
+            idempotent: Whether the request can safely be sent twice, e.g.
+                a status check sent as POST or a submit carrying an
+                idempotency key (defaults to True for GET/HEAD/OPTIONS/PUT/DELETE)
+            retry: False to send the request once, for callers that run
+                their own retry loop
+            **kwargs: Arguments for requests.Session.request; a ``json``
+                payload may contain Base64File values, which are streamed
+        """
+        kwargs.setdefault("timeout", self.config.timeout)
+        if contains_streams(kwargs.get("json")):
+            # Encode Base64File values while sending instead of in memory
+            kwargs["data"] = StreamingJSONBody(kwargs.pop("json"))
+            kwargs["headers"] = {"Content-Type": "application/json", **(kwargs.get("headers") or {})}
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        policy = self.config.retry
+        max_retries = policy.max_retries if retry else 0
+        session = self.get_session(url)
+        
+        attempt = 0
+        while True:
+            try:
+                response = self._send(session, method, url, governor, **kwargs)
+            except requests.RequestException as e:
+                if attempt >= max_retries or not policy.should_retry_error(e, idempotent):
+                    raise
+            else:
+                if attempt >= max_retries or not policy.should_retry_status(response.status_code, idempotent):
+                    return response
+                response.close()
+            time.sleep(policy.delay(attempt))
+            attempt += 1
+    
+    @staticmethod
+    def _send(
+        session: requests.Session,
+        method: str,
+        url: str,
+        governor: Optional[Governor],
+        **kwargs
+    ) -> requests.Response:
+        """Send one request, waiting out 429 responses if a governor is given."""
+        if governor is None:
+            return session.request(method, url, **kwargs)
+        
+        for attempt in range(governor.limit.max_retries + 1):
+            governor.throttle()
+            response = session.request(method, url, **kwargs)
+            if response.status_code != 429:
+                governor.on_success()
+                return response
+            governor.on_rate_limited(parse_retry_after(response.headers.get("Retry-After")))
+            if attempt < governor.limit.max_retries:
+                response.close()
+        return response
+    
+    def close(self) -> None:
+        """Close all sessions and their connections."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+_pool: Optional[SessionPool] = None
+_pool_lock = threading.Lock()
+
+def get_session_pool() -> SessionPool:
+    """Get the process-wide session pool."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SessionPool()
+    return _pool
+
+def configure_http(**kwargs) -> SessionPool:
+    """Replace the process-wide session pool.
+
+    Args:
+        **kwargs: HTTPConfig fields (pool_maxsize, timeout, keep_alive, retry, cassette)
+
+    Returns:
+        The new session pool
+    """
+    global _pool
+    with _pool_lock:
+        previous = _pool
+        _pool = SessionPool(HTTPConfig(**kwargs))
+    if previous is not None:
+        previous.close()
+    return _pool
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send an HTTP request through the process-wide session pool."""
+    return get_session_pool().request(method, url, **kwargs)
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Send a GET request through the process-wide session pool."""
+    return request("GET", url, **kwargs)
+
+def post(url: str, **kwargs) -> requests.Response:
+    """Send a POST request through the process-wide session pool."""
+    return request("POST", url, **kwargs)
+
+class AsyncHTTPClient:
+    """Asyncio client shared by every service in the process.
+
+    Blocking work (HTTP exchanges, image encoding, file writes) is dispatched
+    to one bounded thread pool. A worker thread is held only for the duration
+    of a single call, never while a job is waiting between status polls, so
+    the number of in-flight jobs is no longer tied to the number of threads.
+
+    The transport is still blocking ``requests``: at most ``max_workers``
+    HTTP exchanges (submits, status checks, downloads) run at once, and
+    further calls queue for a free thread. Raise it with
+    :func:`configure_async_client` for workloads with many concurrent
+    submits or downloads, together with ``HTTPConfig.pool_maxsize``.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        """Initialize the client.
+
+        Args:
+            max_workers: Maximum number of concurrent blocking calls
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="tryon-tray"
+        )
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking callable on the shared pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(func, *args, **kwargs)
+        )
+
+    async def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send an HTTP request without blocking the event loop."""
+        return await self.run(request, method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request."""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request."""
+        return await self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        self._executor.shutdown(wait=False)
+
+_client: Optional[AsyncHTTPClient] = None
+_client_lock = threading.Lock()
+
+def get_async_client() -> AsyncHTTPClient:
+    """Get the process-wide async HTTP client."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = AsyncHTTPClient()
+    return _client
+
+def configure_async_client(max_workers: int = DEFAULT_MAX_WORKERS) -> AsyncHTTPClient:
+    """Replace the process-wide async HTTP client.
+
+    Args:
+        max_workers: Maximum number of concurrent blocking calls
+
+    Returns:
+        The new client
+    """
+    global _client
+    with _client_lock:
+        previous = _client
+        _client = AsyncHTTPClient(max_workers=max_workers)
+    if previous is not None:
+        previous.close()
+    return _client
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion from synchronous code.
+
+    When called from a thread that already runs an event loop (e.g. Jupyter
+    or an async Django view), the coroutine is run on a fresh loop in a
+    helper thread instead of failing.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as helper:
+        return helper.submit(asyncio.run, coro).result()
+
+def iterate_sync(agen: AsyncIterator[T]) -> Iterator[T]:
+    """Iterate an async generator from synchronous code.
+
+    The generator runs on an event loop in a background thread, so its
+    pending work keeps making progress while the caller handles each item.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="tryon-tray-loop", daemon=True)
+    thread.start()
+
+    async def next_item() -> T:
+        return await agen.__anext__()
+
+    try:
+        while True:
+            try:
+                item = asyncio.run_coroutine_threadsafe(next_item(), loop).result()
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()
+        asyncio.run_coroutine_threadsafe(loop.shutdown_asyncgens(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
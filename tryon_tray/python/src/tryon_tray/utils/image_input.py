@@ -0,0 +1,146 @@
+"""Image inputs given as paths, bytes, file objects or PIL images."""
+
+import hashlib
+import io
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Optional, Union
+
+# Anything accepted where the API takes an input image
+ImageInput = Union[str, Path, bytes, bytearray, memoryview, BinaryIO, Any]
+
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+class ImageData:
+    """An input image held in memory rather than on disk.
+
+    Services treat it like a file path: it is hashed for the payload cache,
+    preprocessed and uploaded without being written to disk.
+    """
+
+    def __init__(self, data: bytes, name: Optional[str] = None, url: Optional[str] = None):
+        """Initialize the image.
+
+        Args:
+            data: Encoded image bytes (JPEG, PNG, ...)
+            name: File name used for uploads and in results
+            url: URL the image was downloaded from, reported in results
+        """
+        self.data = data
+        self.url = url
+        self.mime_type = _sniff_mime_type(data, name)
+        self.name = name or f"image{_EXTENSIONS.get(self.mime_type, '.jpg')}"
+        self._digest: Optional[str] = None
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 of the image bytes."""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.data).hexdigest()
+        return self._digest
+
+    def open(self) -> BinaryIO:
+        """Readable file object over the image bytes."""
+        return io.BytesIO(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __repr__(self) -> str:
+        return f"ImageData({self.name!r}, {len(self.data)} bytes)"
+
+def _sniff_mime_type(data: bytes, name: Optional[str]) -> str:
+    for signature, mime_type in _SIGNATURES:
+        if data.startswith(signature):
+            return mime_type
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    ext = Path(name).suffix.lower() if name else ""
+    return {
+        ".jpg": "image/jpeg",
+        ".jpeg": "image/jpeg",
+        ".png": "image/png",
+        ".gif": "image/gif",
+        ".webp": "image/webp"
+    }.get(ext, "image/jpeg")
+
+def _is_pil_image(value: Any) -> bool:
+    return type(value).__module__.startswith("PIL.") and hasattr(value, "save") and hasattr(value, "mode")
+
+def load_image_input(image: ImageInput) -> Union[str, Path, ImageData]:
+    """Normalize an input image.
+
+    Paths and URLs are returned unchanged. Bytes, memoryviews and binary
+    file objects are read into an :class:`ImageData`. PIL images are
+    encoded losslessly as PNG.
+
+    Args:
+        image: Path, URL, bytes-like object, binary file object or PIL image
+
+    Returns:
+        The path or URL, or the image held in memory
+
+    Raises:
+        TypeError: If the value is not a supported image input
+    """
+    if isinstance(image, (str, Path, ImageData)):
+        return image
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return ImageData(bytes(image))
+    if _is_pil_image(image):
+        out = io.BytesIO()
+        img = image if image.mode in ("RGB", "RGBA", "L", "LA", "P") else image.convert("RGB")
+        img.save(out, format="PNG")
+        return ImageData(out.getvalue())
+    if hasattr(image, "read"):
+        data = image.read()
+        if not isinstance(data, bytes):
+            raise TypeError("Image file objects must be opened in binary mode")
+        name = getattr(image, "name", None)
+        return ImageData(data, os.path.basename(name) if isinstance(name, str) else None)
+    raise TypeError(f"Unsupported image input: {type(image).__name__}")
+
+def is_url(image: Any) -> bool:
+    """Whether an input image is an http(s) URL."""
+    return isinstance(image, str) and image.startswith(("http://", "https://"))
+
+def image_exists(image: Union[str, Path, ImageData]) -> bool:
+    """Whether an input image is in memory or an existing file."""
+    return isinstance(image, ImageData) or os.path.exists(image)
+
+def image_size(image: Union[str, Path, ImageData]) -> int:
+    """Size of an input image in bytes."""
+    return len(image) if isinstance(image, ImageData) else os.path.getsize(image)
+
+def open_image(image: Union[str, Path, ImageData]) -> BinaryIO:
+    """Open an input image for reading."""
+    return image.open() if isinstance(image, ImageData) else open(image, "rb")
+
+def read_image(image: Union[str, Path, ImageData]) -> bytes:
+    """Bytes of an input image."""
+    return image.data if isinstance(image, ImageData) else Path(image).read_bytes()
+
+def image_name(image: Union[str, Path, ImageData]) -> str:
+    """File name of an input image."""
+    return image.name if isinstance(image, ImageData) else os.path.basename(image)
+
+def image_label(image: Union[str, Path, ImageData]) -> Union[str, Path]:
+    """How an input image is reported in results: its path, URL or name."""
+    if isinstance(image, ImageData):
+        return image.url or image.name
+    return image
@@ -0,0 +1,302 @@
+"""Durable journal of submitted provider jobs."""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+DEFAULT_JOURNAL_PATH = Path("~/.cache/tryon_tray/jobs.sqlite")
+# Seconds a worker holds a job it is polling; renewed on every status check
+DEFAULT_LEASE = 300
+
+PENDING = "pending"
+COMPLETED = "completed"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    service_type TEXT NOT NULL,
+    model_name TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    remote_state TEXT NOT NULL,
+    inputs_hash TEXT NOT NULL,
+    params TEXT NOT NULL,
+    submitted_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT,
+    owner TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, submitted_at);
+"""
+
+@dataclass
+class JournalEntry:
+    """One submitted job as recorded in the journal.
+
+    Attributes:
+        id: Journal row ID
+        service_type: "VTON" or "VIDEO"
+        model_name: Name the service is registered under
+        provider: Provider name
+        remote_state: Service attributes identifying the job at the
+            provider (e.g. ``{"prediction_id": "..."}``)
+        inputs_hash: SHA-256 over the input images' content
+        params: Arguments to recreate the service with
+        submitted_at: Submission time (seconds since the epoch)
+        status: "pending", "completed" or "failed"
+        result: Result URLs of a completed job
+        error: Error message of a failed job
+        owner: Journal instance polling the job, if any
+        lease_until: Time the owner's lease on the job runs out
+    """
+    id: int
+    service_type: str
+    model_name: str
+    provider: str
+    remote_state: Dict[str, Any]
+    inputs_hash: str
+    params: Dict[str, Any]
+    submitted_at: float
+    status: str = PENDING
+    result: Any = None
+    error: Optional[str] = None
+    owner: Optional[str] = None
+    lease_until: Optional[float] = None
+
+class JobJournal:
+    """SQLite journal (WAL mode) of jobs submitted to providers.
+
+    A job is recorded as soon as the provider has accepted it, so its remote
+    ID survives a crash of the process polling it. Jobs left pending can be
+    collected with :func:`tryon_tray.api.resume.resume_jobs` instead of
+    being submitted, and billed, again.
+
+    Several workers can share one journal file. Each job is leased to the
+    worker polling it and the lease is renewed on every status check, so a
+    resume only takes over jobs whose worker gave up on them or died.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_JOURNAL_PATH, lease: float = DEFAULT_LEASE):
+        """Initialize the journal.
+
+        Args:
+            path: SQLite database file (":memory:" for a throwaway journal)
+            lease: Seconds a job stays claimed by a worker that stopped
+                renewing its lease; must exceed the longest polling interval
+        """
+        self.lease = lease
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.path = str(path) if str(path) == ":memory:" else str(Path(path).expanduser())
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            # Commits survive a process crash; only a power loss may drop the last ones
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+            # Journals written before leases were added
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+
+    def record(
+        self,
+        service_type: str,
+        model_name: str,
+        provider: str,
+        remote_state: Dict[str, Any],
+        inputs_hash: str,
+        params: Dict[str, Any],
+        submitted_at: Optional[float] = None
+    ) -> int:
+        """Record a job the provider has accepted, leased to this journal.
+
+        Returns:
+            Journal ID of the job
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO jobs (service_type, model_name, provider, remote_state, inputs_hash, params, submitted_at,"
+                " status, owner, lease_until) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    service_type, model_name, provider,
+                    json.dumps(remote_state, default=str),
+                    inputs_hash,
+                    json.dumps(params, default=str),
+                    submitted_at if submitted_at is not None else time.time(),
+                    PENDING,
+                    self.owner,
+                    time.time() + self.lease
+                )
+            )
+            return cursor.lastrowid
+
+    def claim(self, job_id: int) -> bool:
+        """Take the lease on a pending job no live worker is polling.
+
+        Returns:
+            True if this journal now holds the job's lease
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET owner = ?, lease_until = ? WHERE id = ? AND status = ?"
+                " AND (lease_until IS NULL OR lease_until < ? OR owner = ?)",
+                (self.owner, now + self.lease, job_id, PENDING, now, self.owner)
+            )
+            return cursor.rowcount == 1
+
+    def renew(self, job_id: int) -> None:
+        """Extend this journal's lease on a job it is polling."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ?",
+                (time.time() + self.lease, job_id, self.owner)
+            )
+
+    def release(self, job_id: int) -> None:
+        """Give up this journal's lease on a job it stopped polling."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET owner = NULL, lease_until = NULL WHERE id = ? AND owner = ?",
+                (job_id, self.owner)
+            )
+
+    def complete(self, job_id: int, result: Any) -> None:
+        """Mark a job completed with its result URLs."""
+        self._finish(job_id, COMPLETED, result=json.dumps(result, default=str))
+
+    def fail(self, job_id: int, error: str) -> None:
+        """Mark a job the provider reported as failed."""
+        self._finish(job_id, FAILED, error=error)
+
+    def get(self, job_id: int) -> Optional[JournalEntry]:
+        """Look up one job."""
+        with self._lock:
+            row = self._db.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _entry(row) if row else None
+
+    def pending(self, provider: Optional[str] = None, include_leased: bool = False) -> List[JournalEntry]:
+        """Jobs that were submitted but never seen to finish, oldest first.
+
+        Args:
+            provider: Only return jobs of this provider
+            include_leased: Also return jobs another worker is still polling
+        """
+        query = f"SELECT {_COLUMNS} FROM jobs WHERE status = ?"
+        args: List[Any] = [PENDING]
+        if not include_leased:
+            query += " AND (lease_until IS NULL OR lease_until < ? OR owner = ?)"
+            args += [time.time(), self.owner]
+        if provider:
+            query += " AND provider = ?"
+            args.append(provider)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY submitted_at", args).fetchall()
+        return [_entry(row) for row in rows]
+
+    def prune(self, older_than: float) -> int:
+        """Delete finished jobs submitted more than ``older_than`` seconds ago.
+
+        Returns:
+            Number of jobs deleted
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM jobs WHERE status != ? AND submitted_at < ?",
+                (PENDING, time.time() - older_than)
+            )
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    def _finish(self, job_id: int, status: str, result: Optional[str] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ?, owner = NULL, lease_until = NULL"
+                " WHERE id = ?",
+                (status, time.time(), result, error, job_id)
+            )
+
+_COLUMNS = (
+    "id, service_type, model_name, provider, remote_state, inputs_hash, params, submitted_at, status, result, error,"
+    " owner, lease_until"
+)
+
+def _entry(row: tuple) -> JournalEntry:
+    return JournalEntry(
+        id=row[0],
+        service_type=row[1],
+        model_name=row[2],
+        provider=row[3],
+        remote_state=json.loads(row[4]),
+        inputs_hash=row[5],
+        params=json.loads(row[6]),
+        submitted_at=row[7],
+        status=row[8],
+        result=json.loads(row[9]) if row[9] else None,
+        error=row[10],
+        owner=row[11],
+        lease_until=row[12]
+    )
+
+_journal: Optional[JobJournal] = None
+_journal_configured = False
+_journal_lock = threading.Lock()
+
+def get_job_journal() -> JobJournal:
+    """Get the process-wide job journal."""
+    global _journal
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                _journal = JobJournal()
+    return _journal
+
+def configure_job_journal(**kwargs) -> JobJournal:
+    """Replace the process-wide job journal and record every job in it.
+
+    Args:
+        **kwargs: JobJournal arguments (path, lease)
+
+    Returns:
+        The new journal
+    """
+    global _journal, _journal_configured
+    with _journal_lock:
+        _journal = JobJournal(**kwargs)
+        _journal_configured = True
+    return _journal
+
+def resolve_job_journal(journal: Union[bool, JobJournal, None]) -> Optional[JobJournal]:
+    """The journal to record a job in for a ``journal`` argument.
+
+    Args:
+        journal: True for the process-wide journal, a JobJournal, False to
+            skip journaling, or None to journal only once
+            :func:`configure_job_journal` has been called
+
+    Returns:
+        The journal, or None if the job is not journaled
+    """
+    if isinstance(journal, JobJournal):
+        return journal
+    if journal is None:
+        return get_job_journal() if _journal_configured else None
+    return get_job_journal() if journal else None
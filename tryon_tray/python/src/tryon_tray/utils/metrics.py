@@ -0,0 +1,214 @@
+"""Prometheus metrics and OpenTelemetry spans for jobs."""
+
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..types.download import DownloadResult
+from ..types.timing import JobTiming
+from .hooks import JobHooks, add_hooks
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class _Metric:
+    def __init__(self, name: str, kind: str, help: str):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.values: Dict[Labels, float] = {}
+
+    def add(self, labels: Labels, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+class _Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: count per bucket (not cumulative), sum, count
+        self.values: Dict[Labels, Tuple[List[int], float, int]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        counts, total, count = self.values.get(labels) or ([0] * len(self.buckets), 0.0, 0)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        self.values[labels] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels) + "}"
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class MetricsExporter(JobHooks):
+    """Job hooks that keep Prometheus metrics and emit OpenTelemetry spans.
+
+    Metrics, labelled by provider:
+
+    - ``tryon_jobs_submitted_total``, ``tryon_jobs_completed_total`` and
+      ``tryon_jobs_failed_total`` (also labelled by error type)
+    - ``tryon_jobs_in_flight``: jobs submitted and not yet finished
+    - ``tryon_polls_total``: status checks
+    - ``tryon_downloads_total``: result files stored, by outcome
+    - ``tryon_job_duration_seconds``: time until the provider finished
+    - ``tryon_job_phase_seconds``: time per phase (see
+      :class:`~tryon_tray.types.timing.JobTiming`)
+
+    :meth:`render` returns them in the Prometheus text format. When the
+    OpenTelemetry API is installed, every finished job is also reported as
+    a ``tryon.job`` span with a child span per phase; the spans go
+    wherever the configured OpenTelemetry SDK exports them.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, tracing: bool = True):
+        """Initialize the exporter.
+
+        Args:
+            buckets: Histogram bucket bounds in seconds
+            tracing: Whether to emit OpenTelemetry spans when the API is installed
+        """
+        self._lock = threading.Lock()
+        self._submitted = _Metric("tryon_jobs_submitted_total", "counter", "Jobs accepted by the provider.")
+        self._completed = _Metric("tryon_jobs_completed_total", "counter", "Jobs the provider finished.")
+        self._failed = _Metric("tryon_jobs_failed_total", "counter", "Jobs that failed, timed out or were not accepted.")
+        self._in_flight = _Metric("tryon_jobs_in_flight", "gauge", "Jobs submitted and not yet finished.")
+        self._polls = _Metric("tryon_polls_total", "counter", "Job status checks.")
+        self._downloads = _Metric("tryon_downloads_total", "counter", "Result files stored, by outcome.")
+        self._duration = _Histogram(
+            "tryon_job_duration_seconds", "Seconds from the start of a job until the provider finished it.", buckets
+        )
+        self._phases = _Histogram("tryon_job_phase_seconds", "Seconds spent in each phase of a job.", buckets)
+        self._metrics = (
+            self._submitted, self._completed, self._failed, self._in_flight,
+            self._polls, self._downloads, self._duration, self._phases
+        )
+        self._running: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._tracer = _get_tracer() if tracing else None
+
+    def on_submit(self, service: Any) -> None:
+        labels = _provider(service)
+        with self._lock:
+            self._submitted.add(labels)
+            self._in_flight.add(labels)
+            self._running.add(service)
+
+    def on_poll(self, service: Any) -> None:
+        with self._lock:
+            self._polls.add(_provider(service))
+
+    def on_complete(self, service: Any, result: Any) -> None:
+        labels = _provider(service)
+        timing: JobTiming = service.timing
+        with self._lock:
+            self._finish(service, labels)
+            self._completed.add(labels)
+            self._duration.observe(labels, timing.total)
+            for phase in timing.phases:
+                self._phases.observe(labels + (("phase", phase.name),), phase.duration)
+        self._span(service, "tryon.job", timing.phases)
+
+    def on_error(self, service: Any, error: BaseException) -> None:
+        labels = _provider(service)
+        with self._lock:
+            self._finish(service, labels)
+            self._failed.add(labels + (("error", type(error).__name__),))
+        self._span(service, "tryon.job", service.timing.phases, error)
+
+    def on_download(self, service: Any, results: List[DownloadResult]) -> None:
+        labels = _provider(service)
+        phases = [p for p in service.timing.phases if p.name == "download"][-1:]
+        with self._lock:
+            for result in results:
+                self._downloads.add(labels + (("outcome", "ok" if result.ok else "error"),))
+            for phase in phases:
+                self._phases.observe(labels + (("phase", phase.name),), phase.duration)
+        errors = [r.error for r in results if not r.ok]
+        self._span(service, "tryon.download", phases, errors[0] if errors else None)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = [line for metric in self._metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def _finish(self, service: Any, labels: Labels) -> None:
+        if service in self._running:
+            self._running.discard(service)
+            self._in_flight.add(labels, -1)
+
+    def _span(self, service: Any, name: str, phases: Sequence[Any], error: Optional[BaseException] = None) -> None:
+        """Report phases that already ran as a span with a child span each."""
+        if self._tracer is None or not phases:
+            return
+        from opentelemetry import trace
+
+        # Phases are timed on the monotonic clock; spans need wall-clock time
+        offset = time.time_ns() - time.monotonic_ns()
+        def wall(monotonic: float) -> int:
+            return int(monotonic * 1e9) + offset
+
+        start = min(p.start for p in phases)
+        end = max(p.start + p.duration for p in phases)
+        attributes = {"tryon.provider": service.provider, "tryon.service": type(service).__name__}
+        if service.journal_id is not None:
+            attributes["tryon.journal_id"] = service.journal_id
+        span = self._tracer.start_span(name, start_time=wall(start), attributes=attributes)
+        context = trace.set_span_in_context(span)
+        for phase in phases:
+            child = self._tracer.start_span(phase.name, context=context, start_time=wall(phase.start))
+            child.end(end_time=wall(phase.start + phase.duration))
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+        span.end(end_time=wall(end))
+
+def _provider(service: Any) -> Labels:
+    return (("provider", service.provider),)
+
+def _get_tracer() -> Any:
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return None
+    return trace.get_tracer("tryon_tray")
+
+_exporter: Optional[MetricsExporter] = None
+_exporter_lock = threading.Lock()
+
+def get_metrics_exporter() -> MetricsExporter:
+    """Get the process-wide exporter, registering it for every job on first use."""
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = add_hooks(MetricsExporter())
+    return _exporter
@@ -0,0 +1,243 @@
+"""Content-addressed cache of encoded request payloads."""
+
+import base64
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union
+
+from .image_input import ImageData, open_image
+
+# Raw bytes hashed or encoded per read; a multiple of 3 for base64
+READ_SIZE = 3 * 16 * 1024
+
+Entry = Union[bytes, Path]
+
+Source = Union[str, Path, ImageData]
+
+def encode_file(path: Source, read_size: int = READ_SIZE) -> Iterator[bytes]:
+    """Base64-encode a file or in-memory image chunk by chunk."""
+    with open_image(path) as f:
+        while True:
+            chunk = f.read(read_size)
+            if not chunk:
+                return
+            yield base64.b64encode(chunk)
+
+class PayloadCache:
+    """LRU cache of encoded images, keyed by content hash and variant.
+
+    The variant names the encoding applied to the file contents (e.g.
+    ``"base64"``, or a resized re-encode). Entries live in memory up to
+    ``max_bytes`` in total; with ``disk_dir`` set, entries are also written
+    there, so they survive memory eviction and process restarts, and entries
+    too large for memory are still cached.
+
+    Text placed around the data, such as a data URI prefix, is not part of
+    the entry, so plain and data-URI payloads of one image share it.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_entry_bytes: int = 16 * 1024 * 1024,
+        disk_dir: Optional[Union[str, Path]] = None,
+        disk_max_bytes: int = 2 * 1024 * 1024 * 1024
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Total size of in-memory entries (0 disables the memory tier)
+            max_entry_bytes: Largest entry kept in memory
+            disk_dir: Directory for the on-disk tier (None disables it)
+            disk_max_bytes: Total size of on-disk entries
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._fill_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    def content_hash(self, path: Source) -> str:
+        """SHA-256 of a file's contents, remembered while the file is unchanged."""
+        if isinstance(path, ImageData):
+            return path.digest
+        stat = os.stat(path)
+        key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+        digest = self._hashes.get(key)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    sha.update(chunk)
+            digest = self._hashes[key] = sha.hexdigest()
+        return digest
+
+    def get(
+        self,
+        path: Source,
+        variant: str = "base64",
+        encode: Optional[Callable[[], Iterator[bytes]]] = None
+    ) -> Optional[Entry]:
+        """Get the encoded form of a file, encoding it on a miss.
+
+        Args:
+            path: Source file or in-memory image
+            variant: Name of the encoding ``encode`` produces
+            encode: Callable yielding the encoded bytes (defaults to plain base64)
+
+        Returns:
+            The encoded bytes (memory tier), the path of the encoded file
+            (disk tier), or None if the entry is too large to cache
+        """
+        key = (self.content_hash(path), variant)
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            fill_lock = self._fill_locks.setdefault(key, threading.Lock())
+        with fill_lock:
+            # Another thread may have encoded it while we waited
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry
+            with self._lock:
+                self.misses += 1
+            chunks = encode() if encode else encode_file(path)
+            entry = self._fill(key, chunks)
+        with self._lock:
+            self._fill_locks.pop(key, None)
+        return entry
+
+    def contains(self, path: Source, variant: str = "base64") -> bool:
+        """Whether an encoding of a file is cached, in memory or on disk."""
+        key = (self.content_hash(path), variant)
+        with self._lock:
+            if key in self._memory:
+                return True
+        return bool(self.disk_dir) and self._disk_path(key).exists()
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (the disk tier is kept)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._hashes.clear()
+
+    def _disk_path(self, key: Tuple[str, str]) -> Path:
+        digest, variant = key
+        safe_variant = "".join(c if c.isalnum() or c in "-_." else "_" for c in variant)
+        return self.disk_dir / f"{digest}-{safe_variant}.b64"
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[Entry]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return data
+        if self.disk_dir:
+            path = self._disk_path(key)
+            if path.exists():
+                # Touch the entry so disk eviction is least-recently-used
+                os.utime(path)
+                with self._lock:
+                    self.hits += 1
+                if path.stat().st_size <= self.max_entry_bytes:
+                    data = path.read_bytes()
+                    self._remember(key, data)
+                    return data
+                return path
+        return None
+
+    def _fill(self, key: Tuple[str, str], chunks: Iterator[bytes]) -> Optional[Entry]:
+        if self.disk_dir:
+            fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            path = self._disk_path(key)
+            os.replace(tmp, path)
+            self._evict_disk()
+            if path.stat().st_size <= self.max_entry_bytes and self.max_bytes:
+                data = path.read_bytes()
+                self._remember(key, data)
+                return data
+            return path
+
+        parts = []
+        size = 0
+        for chunk in chunks:
+            size += len(chunk)
+            if size > self.max_entry_bytes or not self.max_bytes:
+                # Too large to hold; the caller streams from the source instead
+                return None
+            parts.append(chunk)
+        data = b"".join(parts)
+        self._remember(key, data)
+        return data
+
+    def _remember(self, key: Tuple[str, str], data: bytes) -> None:
+        if not self.max_bytes or len(data) > self.max_entry_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _evict_disk(self) -> None:
+        files = sorted(self.disk_dir.glob("*.b64"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for path in files:
+            if total <= self.disk_max_bytes:
+                break
+            total -= path.stat().st_size
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                # Evicted concurrently by another process sharing the directory
+                pass
+
+_cache: Optional[PayloadCache] = None
+_cache_lock = threading.Lock()
+
+def get_payload_cache() -> PayloadCache:
+    """Get the process-wide payload cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PayloadCache()
+    return _cache
+
+def configure_payload_cache(**kwargs) -> PayloadCache:
+    """Replace the process-wide payload cache.
+
+    Args:
+        **kwargs: PayloadCache arguments (max_bytes, max_entry_bytes,
+            disk_dir, disk_max_bytes)
+
+    Returns:
+        The new cache
+    """
+    global _cache
+    with _cache_lock:
+        _cache = PayloadCache(**kwargs)
+    return _cache
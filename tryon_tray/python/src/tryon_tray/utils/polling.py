@@ -0,0 +1,368 @@
+"""Central status polling for in-flight jobs."""
+
+from abc import ABC, abstractmethod
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+DEFAULT_MAX_WORKERS = 16
+
+StatusCheck = Callable[[], Tuple[bool, Any]]
+
+class PollingPolicy(ABC):
+    """Decides when an outstanding job is polled next."""
+
+    def first_delay(self) -> float:
+        """Time from submission to the first poll in seconds."""
+        return 0
+
+    @abstractmethod
+    def next_delay(self, attempt: int, elapsed: float) -> float:
+        """Time until the next poll in seconds.
+
+        Args:
+            attempt: Number of polls sent so far
+            elapsed: Time since the job was submitted in seconds
+        """
+
+    def observe(self, duration: float) -> None:
+        """Record how long a completed job took, in seconds."""
+        pass
+
+class FixedPolling(PollingPolicy):
+    """Poll at a fixed interval."""
+
+    def __init__(self, delay: float = 5, initial_delay: float = 0):
+        self.delay = delay
+        self.initial_delay = initial_delay
+
+    def first_delay(self) -> float:
+        return self.initial_delay
+
+    def next_delay(self, attempt: int, elapsed: float) -> float:
+        return self.delay
+
+class AdaptivePolling(PollingPolicy):
+    """Polling schedule learned from observed completion times.
+
+    Until ``min_samples`` jobs have completed this polls every
+    ``default_delay`` seconds. After that the first poll is placed at the
+    ``low_quantile`` of the completion-time distribution, ``dense_polls``
+    polls are spread evenly up to the ``high_quantile``, and past it the
+    interval grows geometrically (by ``backoff``) up to ``max_delay``.
+    """
+
+    def __init__(
+        self,
+        default_delay: float = 5,
+        min_samples: int = 5,
+        window: int = 200,
+        low_quantile: float = 0.1,
+        high_quantile: float = 0.9,
+        dense_polls: int = 8,
+        min_delay: float = 1,
+        max_delay: float = 30,
+        backoff: float = 1.5
+    ):
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.low_quantile = low_quantile
+        self.high_quantile = high_quantile
+        self.dense_polls = dense_polls
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, duration: float) -> None:
+        with self._lock:
+            self._samples.append(duration)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Quantile of the observed completion times, or None while still learning."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            samples = sorted(self._samples)
+        position = q * (len(samples) - 1)
+        lower = samples[math.floor(position)]
+        upper = samples[math.ceil(position)]
+        return lower + (upper - lower) * (position - math.floor(position))
+
+    def first_delay(self) -> float:
+        low = self.quantile(self.low_quantile)
+        return 0 if low is None else low
+
+    def next_delay(self, attempt: int, elapsed: float) -> float:
+        low = self.quantile(self.low_quantile)
+        high = self.quantile(self.high_quantile)
+        if low is None or high is None:
+            return self.default_delay
+
+        dense = max((high - low) / self.dense_polls, self.min_delay)
+        if elapsed < high:
+            return dense
+        tail = (elapsed - high) * (self.backoff - 1)
+        return min(max(dense, tail), self.max_delay)
+
+_adaptive_policies: Dict[str, AdaptivePolling] = {}
+_adaptive_lock = threading.Lock()
+
+def get_adaptive_policy(provider: str) -> AdaptivePolling:
+    """Get the process-wide adaptive policy that learns one provider's latency."""
+    with _adaptive_lock:
+        policy = _adaptive_policies.get(provider)
+        if policy is None:
+            policy = _adaptive_policies[provider] = AdaptivePolling()
+    return policy
+
+def resolve_polling_policy(
+    policy: Union[PollingPolicy, str, None],
+    provider: str,
+    delay: float
+) -> PollingPolicy:
+    """Turn a polling_policy argument into a policy object.
+
+    Args:
+        policy: A PollingPolicy, "adaptive", "fixed" or None (fixed)
+        provider: Provider whose adaptive policy to use
+        delay: Interval for the fixed policy
+    """
+    if isinstance(policy, PollingPolicy):
+        return policy
+    if policy is None or policy == "fixed":
+        return FixedPolling(delay)
+    if policy == "adaptive":
+        return get_adaptive_policy(provider)
+    raise ValueError(f"Unknown polling policy: {policy}")
+
+class PollJob:
+    """An outstanding job tracked by the scheduler."""
+
+    def __init__(
+        self,
+        check: StatusCheck,
+        policy: PollingPolicy,
+        max_attempts: int,
+        on_poll: Optional[Callable[[], None]] = None
+    ):
+        self.check = check
+        self.policy = policy
+        self.max_attempts = max_attempts
+        self.on_poll = on_poll
+        self.attempts = 0
+        self.submitted = time.monotonic()
+        self.future: Future = Future()
+        # Bumped on every reschedule so superseded queue entries are skipped
+        self.generation = 0
+        self.in_flight = False
+        self.woken = False
+
+class PollScheduler:
+    """Poll the status of many jobs from one thread.
+
+    Outstanding jobs are kept in a priority queue ordered by their next poll
+    time. The scheduler thread sleeps until the earliest job is due and hands
+    due status checks to a small worker pool, so the number of threads does
+    not grow with the number of jobs being waited on.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        """Initialize the scheduler.
+
+        Args:
+            max_workers: Maximum number of status checks sent at once
+        """
+        self._queue: List[Tuple[float, int, int, PollJob]] = []
+        self._jobs: Dict[Future, PollJob] = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="tryon-tray-poll"
+        )
+        self._stopped = False
+        self._thread = threading.Thread(target=self._loop, name="tryon-tray-poller", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        check: StatusCheck,
+        delay: float = 5,
+        max_attempts: int = 60,
+        initial_delay: float = 0,
+        on_poll: Optional[Callable[[], None]] = None,
+        policy: Optional[PollingPolicy] = None
+    ) -> Future:
+        """Track a job until its status check reports completion.
+
+        Args:
+            check: Callable returning (is_complete, result_or_error)
+            delay: Time between polls in seconds
+            max_attempts: Maximum number of polls before timing out
+            initial_delay: Time before the first poll in seconds
+            on_poll: Optional callable invoked before every poll
+            policy: Polling policy; overrides delay and initial_delay
+
+        Returns:
+            Future resolved with the result, or with the job's error or a
+            TimeoutError once max_attempts polls have been sent
+        """
+        job = PollJob(check, policy or FixedPolling(delay, initial_delay), max_attempts, on_poll)
+        with self._condition:
+            self._jobs[job.future] = job
+        self._schedule(job, job.submitted + job.policy.first_delay())
+        return job.future
+
+    def wake(self, future: Future) -> bool:
+        """Poll a job now instead of at its scheduled time.
+
+        Used when a provider pushes a completion callback: the job is checked
+        once more right away, so the callback only has to say "look now".
+
+        Args:
+            future: Future returned by :meth:`submit`
+
+        Returns:
+            False if the job is no longer tracked
+        """
+        with self._condition:
+            job = self._jobs.get(future)
+            if job is None or job.future.done():
+                return False
+            if job.in_flight:
+                # Re-check as soon as the current poll returns
+                job.woken = True
+            else:
+                self._push(job, time.monotonic())
+        return True
+
+    def pending(self) -> int:
+        """Number of outstanding jobs still being tracked."""
+        with self._condition:
+            return len(self._jobs)
+
+    def stop(self) -> None:
+        """Stop the scheduler and cancel all outstanding jobs."""
+        with self._condition:
+            self._stopped = True
+            jobs, self._jobs = self._jobs, {}
+            self._queue = []
+            self._condition.notify()
+        for job in jobs.values():
+            job.future.cancel()
+        self._thread.join()
+        self._executor.shutdown(wait=False)
+
+    def _schedule(self, job: PollJob, due: float) -> None:
+        with self._condition:
+            if self._stopped:
+                job.future.cancel()
+                return
+            if job.woken:
+                job.woken = False
+                due = time.monotonic()
+            self._push(job, due)
+
+    def _push(self, job: PollJob, due: float) -> None:
+        # Caller holds the condition
+        job.generation += 1
+        heapq.heappush(self._queue, (due, next(self._counter), job.generation, job))
+        self._condition.notify()
+
+    def _loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    if self._queue:
+                        wait = self._queue[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._condition.wait(wait)
+                    else:
+                        self._condition.wait()
+                if self._stopped:
+                    return
+                _, _, generation, job = heapq.heappop(self._queue)
+                if generation != job.generation:
+                    continue
+                if job.future.cancelled():
+                    self._jobs.pop(job.future, None)
+                    continue
+                job.in_flight = True
+
+            self._executor.submit(self._poll, job)
+
+    def _poll(self, job: PollJob) -> None:
+        job.attempts += 1
+        try:
+            if job.on_poll:
+                job.on_poll()
+            is_complete, result = job.check()
+        except Exception as e:
+            self._resolve(job, exception=e)
+            return
+
+        now = time.monotonic()
+        with self._condition:
+            job.in_flight = False
+        if is_complete:
+            if isinstance(result, Exception):
+                self._resolve(job, exception=result)
+            else:
+                job.policy.observe(now - job.submitted)
+                self._resolve(job, result=result)
+        elif job.attempts >= job.max_attempts:
+            self._resolve(job, exception=TimeoutError("Maximum polling attempts reached"))
+        else:
+            self._schedule(job, now + job.policy.next_delay(job.attempts, now - job.submitted))
+
+    def _resolve(self, job: PollJob, result: Any = None, exception: Optional[BaseException] = None) -> None:
+        with self._condition:
+            job.in_flight = False
+            self._jobs.pop(job.future, None)
+        try:
+            if exception is not None:
+                job.future.set_exception(exception)
+            else:
+                job.future.set_result(result)
+        except InvalidStateError:
+            # The caller cancelled the job while its last poll was in flight
+            pass
+
+_scheduler: Optional[PollScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_poll_scheduler() -> PollScheduler:
+    """Get the process-wide poll scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = PollScheduler()
+    return _scheduler
+
+def configure_poll_scheduler(max_workers: int = DEFAULT_MAX_WORKERS) -> PollScheduler:
+    """Replace the process-wide poll scheduler.
+
+    Jobs still polled by the previous scheduler are cancelled.
+
+    Args:
+        max_workers: Maximum number of status checks sent at once
+
+    Returns:
+        The new scheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        previous = _scheduler
+        _scheduler = PollScheduler(max_workers=max_workers)
+    if previous is not None:
+        previous.stop()
+    return _scheduler
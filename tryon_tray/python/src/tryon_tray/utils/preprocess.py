@@ -0,0 +1,155 @@
+"""Client-side image preprocessing before upload."""
+
+import asyncio
+import base64
+import io
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+from .http import get_async_client
+from .image_input import ImageData, image_exists, open_image
+from .payload_cache import get_payload_cache
+
+Source = Union[str, Path, ImageData]
+
+@dataclass(frozen=True)
+class ImageSpec:
+    """How an input image is prepared for a provider.
+
+    Attributes:
+        max_dimension: Longest side in pixels (None keeps the original size)
+        format: Output format, "JPEG" or "PNG"
+        quality: JPEG quality
+    """
+    max_dimension: Optional[int] = None
+    format: str = "JPEG"
+    quality: int = 90
+
+    @property
+    def variant(self) -> str:
+        """Payload cache variant name for images prepared with this spec."""
+        return f"{self.format.lower()}-{self.max_dimension or 'full'}-q{self.quality}"
+
+    @property
+    def mime_type(self) -> str:
+        return f"image/{self.format.lower()}"
+
+# Sizes match the ones tryon_menu uploads its inputs at
+DEFAULT_IMAGE_SPECS: Dict[str, ImageSpec] = {
+    "human": ImageSpec(max_dimension=1536),
+    "garment": ImageSpec(max_dimension=1024),
+    "source": ImageSpec(max_dimension=1536),
+}
+
+# Per-provider overrides of DEFAULT_IMAGE_SPECS, keyed by provider then role
+PROVIDER_IMAGE_SPECS: Dict[str, Dict[str, ImageSpec]] = {}
+
+def configure_image_specs(provider: str, **specs: ImageSpec) -> None:
+    """Set the image specs for one provider.
+
+    Args:
+        provider: Provider name (e.g. "fashnai")
+        **specs: ImageSpec per role ("human", "garment", "source")
+    """
+    PROVIDER_IMAGE_SPECS.setdefault(provider, {}).update(specs)
+
+def resolve_image_spec(
+    preprocess: Union[bool, ImageSpec, Dict[str, ImageSpec], None],
+    provider: str,
+    role: str
+) -> Optional[ImageSpec]:
+    """Turn a preprocess argument into the spec for one input image.
+
+    Args:
+        preprocess: True (provider defaults), an ImageSpec for every image,
+            a dict of ImageSpec per role, or False/None to send originals
+        provider: Provider the image is sent to
+        role: "human", "garment" or "source"
+    """
+    if not preprocess:
+        return None
+    if isinstance(preprocess, ImageSpec):
+        return preprocess
+    if isinstance(preprocess, dict):
+        return preprocess.get(role)
+    return PROVIDER_IMAGE_SPECS.get(provider, {}).get(role) or DEFAULT_IMAGE_SPECS.get(role)
+
+def _require_pil():
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise ImportError("Image preprocessing requires Pillow: pip install tryon-tray[images]")
+    return Image, ImageOps
+
+def preprocess_image(path: Source, spec: ImageSpec) -> bytes:
+    """Prepare an image for upload.
+
+    Applies the EXIF orientation, shrinks the image so its longest side is
+    at most ``spec.max_dimension``, flattens transparency onto white for
+    JPEG output and re-encodes it.
+
+    Args:
+        path: Path to the image, or an in-memory image
+        spec: How to prepare it
+
+    Returns:
+        Encoded image bytes
+    """
+    Image, ImageOps = _require_pil()
+    with open_image(path) as f, Image.open(f) as original:
+        img = ImageOps.exif_transpose(original)
+        if spec.max_dimension and max(img.size) > spec.max_dimension:
+            img.thumbnail((spec.max_dimension, spec.max_dimension), Image.LANCZOS)
+
+        save_kwargs: Dict[str, Any] = {"optimize": True}
+        if spec.format.upper() == "JPEG":
+            if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+                rgba = img.convert("RGBA")
+                img = Image.new("RGB", rgba.size, (255, 255, 255))
+                img.paste(rgba, mask=rgba.getchannel("A"))
+            elif img.mode != "RGB":
+                img = img.convert("RGB")
+            save_kwargs["quality"] = spec.quality
+
+        out = io.BytesIO()
+        img.save(out, format=spec.format, **save_kwargs)
+    return out.getvalue()
+
+def encode_preprocessed(path: Source, spec: ImageSpec) -> Iterator[bytes]:
+    """Preprocess an image and yield its base64 encoding."""
+    yield base64.b64encode(preprocess_image(path, spec))
+
+def preprocessed_base64(path: Source, spec: ImageSpec) -> bytes:
+    """Base64 of the preprocessed image, from the payload cache when possible."""
+    entry = get_payload_cache().get(path, spec.variant, encode=lambda: encode_preprocessed(path, spec))
+    if entry is None:
+        return b"".join(encode_preprocessed(path, spec))
+    return entry if isinstance(entry, bytes) else Path(entry).read_bytes()
+
+def preprocessed_bytes(path: Source, spec: ImageSpec) -> bytes:
+    """Preprocessed image bytes, for multipart uploads."""
+    return base64.b64decode(preprocessed_base64(path, spec))
+
+async def preprocess_async(
+    path: Source,
+    spec: ImageSpec,
+    executor: Optional[Executor] = None
+) -> None:
+    """Preprocess an image into the payload cache without blocking the event loop.
+
+    Args:
+        path: Path to the image, or an in-memory image
+        spec: How to prepare it
+        executor: Where to run the work, e.g. a ProcessPoolExecutor for
+            batches (defaults to the shared async client's thread pool)
+    """
+    cache = get_payload_cache()
+    if not image_exists(path) or cache.contains(path, spec.variant):
+        return
+    if executor is None:
+        data = await get_async_client().run(preprocess_image, path, spec)
+    else:
+        data = await asyncio.get_running_loop().run_in_executor(executor, preprocess_image, path, spec)
+    cache.get(path, spec.variant, encode=lambda: iter([base64.b64encode(data)]))
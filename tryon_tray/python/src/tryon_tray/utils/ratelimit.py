@@ -0,0 +1,205 @@
+"""Per-provider request rate limiting and job concurrency limits."""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, Optional, Tuple
+
+@dataclass
+class RateLimit:
+    """Limits applied to one provider account.
+
+    Attributes:
+        rate: Sustained requests per second (None for no limit)
+        burst: Requests allowed back to back before ``rate`` applies
+        max_in_flight: Jobs allowed to run at once (None for no limit)
+        max_retries: Times a request answered with 429 is retried
+        min_rate: Lowest rate the limiter slows down to after 429s
+    """
+    rate: Optional[float] = None
+    burst: int = 10
+    max_in_flight: Optional[int] = None
+    max_retries: int = 5
+    min_rate: float = 0.2
+
+class TokenBucket:
+    """Thread-safe token bucket."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate, keeping the tokens earned so far."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+class Governor:
+    """Rate and concurrency limits shared by every request to one provider account.
+
+    Requests wait for a token before they are sent (:meth:`throttle`). A 429
+    response pauses all requests for its ``Retry-After`` and halves the
+    request rate; each successful request then restores a tenth of the
+    configured rate. Job slots (:meth:`reserve` / :meth:`release`) bound how
+    many jobs run at once and are handed out first come, first served.
+    """
+
+    def __init__(self, limit: Optional[RateLimit] = None):
+        """Initialize the governor.
+
+        Args:
+            limit: Limits to apply (defaults to RateLimit(), which only
+                reacts to 429 responses)
+        """
+        self.limit = limit or RateLimit()
+        self.bucket = TokenBucket(self.limit.rate, self.limit.burst) if self.limit.rate else None
+        self.throttled = 0
+        self._blocked_until = 0.0
+        self._consecutive = 0
+        self._in_flight = 0
+        self._waiters: Deque[Future] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of job slots currently held."""
+        with self._lock:
+            return self._in_flight
+
+    def throttle(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                wait = self._blocked_until - time.monotonic()
+            if wait <= 0:
+                break
+            time.sleep(wait)
+        if self.bucket:
+            self.bucket.acquire()
+
+    def on_rate_limited(self, retry_after: Optional[float]) -> float:
+        """Slow down after a 429 response.
+
+        Args:
+            retry_after: Seconds from the Retry-After header, if any
+
+        Returns:
+            Seconds until requests resume
+        """
+        with self._lock:
+            self.throttled += 1
+            self._consecutive += 1
+            if retry_after is None:
+                retry_after = min(2 ** (self._consecutive - 1), 60)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        if self.bucket:
+            self.bucket.set_rate(max(self.bucket.rate / 2, self.limit.min_rate))
+        return retry_after
+
+    def on_success(self) -> None:
+        """Record an accepted request and recover the request rate."""
+        with self._lock:
+            self._consecutive = 0
+        if self.bucket and self.bucket.rate < self.limit.rate:
+            self.bucket.set_rate(min(self.bucket.rate + self.limit.rate / 10, self.limit.rate))
+
+    def reserve(self) -> Future:
+        """Ask for a job slot.
+
+        Returns:
+            Future resolved once the slot is granted; cancel it to give up
+            waiting. Every granted slot must be given back with :meth:`release`.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self.limit.max_in_flight is None or self._in_flight < self.limit.max_in_flight:
+                self._in_flight += 1
+                granted = True
+            else:
+                self._waiters.append(future)
+                granted = False
+        if granted:
+            future.set_running_or_notify_cancel()
+            future.set_result(None)
+        return future
+
+    def release(self) -> None:
+        """Give back a job slot, handing it to the next waiter if any."""
+        while True:
+            with self._lock:
+                if not self._waiters:
+                    self._in_flight -= 1
+                    return
+                waiter = self._waiters.popleft()
+            # The slot passes straight to the waiter unless it gave up
+            if waiter.set_running_or_notify_cancel():
+                waiter.set_result(None)
+                return
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+_limits: Dict[Tuple[str, Optional[str]], RateLimit] = {}
+_governors: Dict[Tuple[str, Optional[str]], Governor] = {}
+_governors_lock = threading.Lock()
+
+def configure_rate_limit(provider: str, api_key: Optional[str] = None, **kwargs) -> RateLimit:
+    """Set the limits for a provider, or for one API key of a provider.
+
+    Args:
+        provider: Provider name (e.g. "fashnai", "klingai")
+        api_key: Only apply to this API key; None sets the provider default
+        **kwargs: RateLimit fields (rate, burst, max_in_flight, max_retries, min_rate)
+
+    Returns:
+        The new limits
+    """
+    limit = RateLimit(**kwargs)
+    with _governors_lock:
+        _limits[(provider, api_key)] = limit
+        # Rebuild governors created under the previous limits on next use
+        for key in [key for key in _governors if key[0] == provider and (api_key is None or key[1] == api_key)]:
+            del _governors[key]
+    return limit
+
+def get_governor(provider: str, api_key: Optional[str] = None) -> Governor:
+    """Get the process-wide governor for one provider account."""
+    key = (provider, api_key)
+    with _governors_lock:
+        governor = _governors.get(key)
+        if governor is None:
+            limit = _limits.get(key) or _limits.get((provider, None))
+            governor = _governors[key] = Governor(limit)
+    return governor
@@ -0,0 +1,212 @@
+"""Persistent cache of finished try-on results."""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+DEFAULT_CACHE_PATH = Path("~/.cache/tryon_tray/results.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS outputs (
+    key TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (key, idx)
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+@dataclass
+class CachedResult:
+    """A result stored in the cache.
+
+    Attributes:
+        metadata: The result dictionary the job returned, without its
+            download entries
+        outputs: Bytes of each result file, in result URL order
+        created: When the job finished (seconds since the epoch)
+    """
+    metadata: Dict[str, Any]
+    outputs: List[bytes]
+    created: float
+
+class ResultCache:
+    """SQLite cache of try-on results keyed by everything that determines them.
+
+    Keys come from :meth:`BaseVTON.cache_key`: the provider, its model
+    version, the generation parameters with their defaults filled in
+    (including ``seed``) and the content hashes of the input images. Result
+    files are stored with the metadata, so a hit does not depend on the
+    provider's result URLs still being valid.
+
+    Entries expire after ``ttl`` seconds; once the stored files exceed
+    ``max_bytes``, the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_CACHE_PATH,
+        ttl: Optional[float] = 30 * 24 * 3600,
+        max_bytes: int = 1024 * 1024 * 1024
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file (":memory:" for a throwaway cache)
+            ttl: Seconds an entry stays valid (None keeps entries until evicted)
+            max_bytes: Total size of stored result files
+        """
+        self.path = str(path) if str(path) == ":memory:" else str(Path(path).expanduser())
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        """Look up a result.
+
+        Args:
+            key: Cache key of the job
+
+        Returns:
+            The cached result, or None on a miss or an expired entry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT created, metadata FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and row[0] + self.ttl < now:
+                self._delete(key)
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            outputs = [data for (data,) in self._db.execute(
+                "SELECT data FROM outputs WHERE key = ? ORDER BY idx", (key,)
+            )]
+            self.hits += 1
+        return CachedResult(metadata=json.loads(row[1]), outputs=outputs, created=row[0])
+
+    def put(self, key: str, provider: str, metadata: Dict[str, Any], outputs: List[bytes]) -> None:
+        """Store a result, replacing any entry with the same key.
+
+        Args:
+            key: Cache key of the job
+            provider: Provider that produced the result
+            metadata: Result dictionary (values that are not JSON are stored
+                as strings)
+            outputs: Bytes of each result file
+        """
+        now = time.time()
+        size = sum(len(data) for data in outputs)
+        if size > self.max_bytes:
+            return
+        encoded = json.dumps(metadata, default=str)
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._delete(key)
+                self._db.execute(
+                    "INSERT INTO results (key, provider, created, accessed, size, metadata) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, provider, now, now, size, encoded)
+                )
+                self._db.executemany(
+                    "INSERT INTO outputs (key, idx, data) VALUES (?, ?, ?)",
+                    [(key, i, sqlite3.Binary(data)) for i, data in enumerate(outputs)]
+                )
+                self._evict(now)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._db.execute("DELETE FROM outputs")
+            self._db.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _delete(self, key: str) -> None:
+        self._db.execute("DELETE FROM outputs WHERE key = ?", (key,))
+        self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+
+    def _evict(self, now: float) -> None:
+        if self.ttl is not None:
+            for (key,) in self._db.execute("SELECT key FROM results WHERE created < ?", (now - self.ttl,)).fetchall():
+                self._delete(key)
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM results ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._delete(key)
+            total -= size
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+def get_result_cache() -> ResultCache:
+    """Get the process-wide result cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache()
+    return _cache
+
+def configure_result_cache(**kwargs) -> ResultCache:
+    """Replace the process-wide result cache.
+
+    Args:
+        **kwargs: ResultCache arguments (path, ttl, max_bytes)
+
+    Returns:
+        The new cache
+    """
+    global _cache
+    with _cache_lock:
+        _cache = ResultCache(**kwargs)
+    return _cache
+
+def resolve_result_cache(cache: Union[bool, ResultCache, None]) -> Optional[ResultCache]:
+    """The cache to use for a ``cache`` argument.
+
+    Args:
+        cache: True for the process-wide cache, a ResultCache, or
+            None/False to disable caching
+
+    Returns:
+        The cache, or None if caching is disabled
+    """
+    if isinstance(cache, ResultCache):
+        return cache
+    return get_result_cache() if cache else None
@@ -0,0 +1,66 @@
+"""Retry rules for provider HTTP calls."""
+
+import random
+from dataclasses import dataclass, field
+from typing import FrozenSet
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, NewConnectionError
+
+# Methods that can be repeated without side effects
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+@dataclass
+class RetryPolicy:
+    """When and how often failed requests are retried.
+
+    Idempotent requests (status polls, downloads) are retried on connection
+    errors, timeouts and the listed 5xx statuses. Other requests (job
+    submissions, which may start a paid prediction) are only retried when
+    the connection to the provider was never established, so a request the
+    provider may have received is never sent twice.
+
+    Attributes:
+        max_retries: Retries after the first attempt (0 disables retries)
+        backoff: Base delay in seconds, doubled on every retry
+        max_backoff: Upper bound for a single delay in seconds
+        statuses: Response statuses retried for idempotent requests
+    """
+    max_retries: int = 4
+    backoff: float = 0.5
+    max_backoff: float = 10.0
+    statuses: FrozenSet[int] = field(default_factory=lambda: frozenset({500, 502, 503, 504}))
+
+    def delay(self, attempt: int) -> float:
+        """Delay before the given retry (0-based), with full jitter."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def should_retry_error(self, error: Exception, idempotent: bool) -> bool:
+        """Whether a request that raised ``error`` may be sent again."""
+        if never_sent(error):
+            return True
+        return idempotent and isinstance(error, (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError
+        ))
+
+    def should_retry_status(self, status_code: int, idempotent: bool) -> bool:
+        """Whether a request answered with ``status_code`` may be sent again."""
+        return idempotent and status_code in self.statuses
+
+def never_sent(error: Exception) -> bool:
+    """Whether a request error proves the request never reached the server.
+
+    True for connect timeouts and failures to open the connection (DNS
+    errors, refused connections). Resets and read timeouts are ambiguous:
+    the server may already have processed the request.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError) and error.args:
+        reason = error.args[0]
+        if isinstance(reason, MaxRetryError):
+            reason = reason.reason
+        return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+    return False
@@ -0,0 +1,351 @@
+"""Destinations for downloaded result files."""
+
+import io
+import mimetypes
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional, Union
+
+# S3 rejects multipart parts smaller than this, except the last one
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
+class SinkWriter(ABC):
+    """Receives one result file as it is downloaded.
+
+    The downloader writes chunks as they arrive. After an interrupted
+    transfer it asks for the bytes after :attr:`size`, or calls
+    :meth:`reset` when the server sends the whole file again.
+    """
+
+    @property
+    @abstractmethod
+    def size(self) -> int:
+        """Bytes received so far."""
+
+    @property
+    @abstractmethod
+    def location(self) -> str:
+        """Where the file is being written, for error messages."""
+
+    @abstractmethod
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk of the file."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Discard everything written so far."""
+
+    @abstractmethod
+    def commit(self) -> Any:
+        """Finish the file once every byte has been received.
+
+        Returns:
+            The stored result: a path, an object URI or an in-memory buffer
+        """
+
+    def abort(self) -> None:
+        """Give up on the file after the download failed."""
+
+class ResultSink(ABC):
+    """Where a job's result files are stored.
+
+    A sink receives every result of one job; ``index`` and ``count`` let it
+    name several results (e.g. ``num_samples=4``) apart.
+    """
+
+    @abstractmethod
+    def open(self, url: str, index: int, count: int) -> SinkWriter:
+        """Start storing one result file.
+
+        Args:
+            url: URL the file is downloaded from
+            index: Position of the file among the job's results
+            count: Number of result files of the job
+
+        Returns:
+            Writer for the file
+        """
+
+def indexed_paths(path: Union[str, Path], count: int) -> List[Path]:
+    """Local paths for ``count`` results saved under one download path.
+
+    A single result uses the path itself; several are numbered before the
+    extension (``result_0.png``, ``result_1.png``, ...).
+    """
+    path = Path(path)
+    if count == 1:
+        return [path]
+    return [path.with_name(f"{path.stem}_{i}{path.suffix}") for i in range(count)]
+
+def _indexed_key(key: str, index: int, count: int) -> str:
+    if count == 1:
+        return key
+    key_path = PurePosixPath(key)
+    return str(key_path.with_name(f"{key_path.stem}_{index}{key_path.suffix}"))
+
+class FileWriter(SinkWriter):
+    """Writes a file to ``<path>.part`` and renames it into place."""
+
+    def __init__(self, path: Union[str, Path], resume: bool = True):
+        """Initialize the writer.
+
+        Args:
+            path: Path to save the file to
+            resume: Whether to continue from an existing ``.part`` file
+        """
+        self.path = Path(path)
+        self.part = self.path.with_name(self.path.name + ".part")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not resume:
+            self._remove_part()
+        self._file = None
+        self._size = self.part.stat().st_size if self.part.exists() else 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def location(self) -> str:
+        return str(self.path)
+
+    def write(self, chunk: bytes) -> None:
+        if self._file is None:
+            self._file = open(self.part, "ab")
+        self._file.write(chunk)
+        self._size += len(chunk)
+
+    def reset(self) -> None:
+        self._close()
+        self._remove_part()
+        self._size = 0
+
+    def commit(self) -> str:
+        self._close()
+        if not self.part.exists():
+            # An empty file never opened its part file
+            self.part.touch()
+        os.replace(self.part, self.path)
+        return str(self.path)
+
+    def abort(self) -> None:
+        # The part file is kept so a later download can resume it
+        self._close()
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _remove_part(self) -> None:
+        try:
+            self.part.unlink()
+        except FileNotFoundError:
+            pass
+
+class LocalFileSink(ResultSink):
+    """Saves results to local files.
+
+    A single result is saved to ``path``; several are numbered before its
+    extension.
+    """
+
+    def __init__(self, path: Union[str, Path], resume: bool = True):
+        """Initialize the sink.
+
+        Args:
+            path: Path to save the result to
+            resume: Whether to continue from existing ``.part`` files
+        """
+        self.path = Path(path)
+        self.resume = resume
+
+    def open(self, url: str, index: int, count: int) -> FileWriter:
+        return FileWriter(indexed_paths(self.path, count)[index], resume=self.resume)
+
+class _MemoryWriter(SinkWriter):
+    def __init__(self, sink: "MemorySink", index: int):
+        self._sink = sink
+        self._index = index
+        self._buffer = io.BytesIO()
+
+    @property
+    def size(self) -> int:
+        return self._buffer.tell()
+
+    @property
+    def location(self) -> str:
+        return f"memory:{self._index}"
+
+    def write(self, chunk: bytes) -> None:
+        self._buffer.write(chunk)
+
+    def reset(self) -> None:
+        self._buffer = io.BytesIO()
+
+    def commit(self) -> io.BytesIO:
+        self._buffer.seek(0)
+        self._sink.buffers[self._index] = self._buffer
+        return self._buffer
+
+class MemorySink(ResultSink):
+    """Keeps results in memory as ``BytesIO`` buffers.
+
+    Useful when the result is uploaded elsewhere or decoded straight away,
+    e.g. for a thumbnail, without writing a temporary file::
+
+        sink = MemorySink()
+        VTON(model_image, garment_image, result_sink=sink)
+        thumbnail = sink.image()
+        thumbnail.thumbnail((600, 600))
+    """
+
+    def __init__(self):
+        self.buffers: Dict[int, io.BytesIO] = {}
+
+    def open(self, url: str, index: int, count: int) -> SinkWriter:
+        return _MemoryWriter(self, index)
+
+    def getvalue(self, index: int = 0) -> bytes:
+        """Bytes of one result."""
+        return self.buffers[index].getvalue()
+
+    def image(self, index: int = 0) -> Any:
+        """Decode one result with Pillow.
+
+        Raises:
+            ImportError: If Pillow is not installed
+        """
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ImportError("Decoding results requires Pillow: pip install tryon-tray[images]")
+        return Image.open(io.BytesIO(self.getvalue(index)))
+
+class _S3Writer(SinkWriter):
+    def __init__(self, sink: "S3Sink", key: str, content_type: Optional[str]):
+        self._sink = sink
+        self._key = key
+        self._extra = dict(sink.extra_args)
+        if content_type and "ContentType" not in self._extra:
+            self._extra["ContentType"] = content_type
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Dict[str, Any]] = []
+        self._uploaded = 0
+
+    @property
+    def size(self) -> int:
+        return self._uploaded + len(self._buffer)
+
+    @property
+    def location(self) -> str:
+        return f"s3://{self._sink.bucket}/{self._key}"
+
+    def write(self, chunk: bytes) -> None:
+        self._buffer += chunk
+        if len(self._buffer) >= self._sink.part_size:
+            self._upload_part()
+
+    def reset(self) -> None:
+        self.abort()
+        self._buffer = bytearray()
+
+    def commit(self) -> str:
+        client = self._sink.client
+        if self._upload_id is None:
+            # Small files go up in one request
+            client.put_object(Bucket=self._sink.bucket, Key=self._key, Body=bytes(self._buffer), **self._extra)
+        else:
+            if self._buffer:
+                self._upload_part()
+            client.complete_multipart_upload(
+                Bucket=self._sink.bucket,
+                Key=self._key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts}
+            )
+        self._buffer = bytearray()
+        return self.location
+
+    def abort(self) -> None:
+        if self._upload_id is not None:
+            self._sink.client.abort_multipart_upload(Bucket=self._sink.bucket, Key=self._key, UploadId=self._upload_id)
+        self._upload_id = None
+        self._parts = []
+        self._uploaded = 0
+
+    def _upload_part(self) -> None:
+        client = self._sink.client
+        if self._upload_id is None:
+            response = client.create_multipart_upload(Bucket=self._sink.bucket, Key=self._key, **self._extra)
+            self._upload_id = response["UploadId"]
+        number = len(self._parts) + 1
+        response = client.upload_part(
+            Bucket=self._sink.bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            PartNumber=number,
+            Body=bytes(self._buffer)
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": number})
+        self._uploaded += len(self._buffer)
+        self._buffer = bytearray()
+
+class S3Sink(ResultSink):
+    """Streams results into S3 as they are downloaded.
+
+    Files are uploaded in ``part_size`` multipart chunks while the download
+    is still running; files smaller than one part are sent with a single
+    ``put_object``. A single result is stored under ``key``; several are
+    numbered before its extension.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        key: str,
+        client: Any = None,
+        part_size: int = 8 * 1024 * 1024,
+        content_type: Optional[str] = None,
+        extra_args: Optional[Dict[str, Any]] = None
+    ):
+        """Initialize the sink.
+
+        Args:
+            bucket: Bucket name
+            key: Object key for the result
+            client: boto3 S3 client (a default client is created if omitted)
+            part_size: Multipart chunk size in bytes (at least 5 MiB)
+            content_type: Content type of the objects (guessed from the key
+                if omitted)
+            extra_args: Additional put_object / create_multipart_upload
+                arguments, e.g. ``{"ACL": "public-read"}``
+
+        Raises:
+            ValueError: If part_size is below the S3 minimum
+        """
+        if part_size < S3_MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {S3_MIN_PART_SIZE} bytes")
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.content_type = content_type
+        self.extra_args = extra_args or {}
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise ImportError("S3 results require boto3: pip install tryon-tray[s3]")
+            self._client = boto3.client("s3")
+        return self._client
+
+    def open(self, url: str, index: int, count: int) -> SinkWriter:
+        key = _indexed_key(self.key, index, count)
+        content_type = self.content_type or mimetypes.guess_type(key)[0]
+        return _S3Writer(self, key, content_type)
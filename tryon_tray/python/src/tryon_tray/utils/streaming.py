@@ -0,0 +1,153 @@
+"""Streaming request bodies."""
+
+import json
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+
+from .image_input import ImageData, image_size
+from .payload_cache import Entry, encode_file, get_payload_cache
+
+# Raw bytes read per chunk; a multiple of 3 so chunks encode without padding
+CHUNK_SIZE = 3 * 16 * 1024
+
+class Base64File:
+    """A file sent as a base64 string inside a JSON request body.
+
+    Use it in place of an already-encoded string in a payload. When the
+    payload is sent, the encoded data is taken from the process-wide
+    :class:`~tryon_tray.utils.payload_cache.PayloadCache`, so an image used
+    by many jobs is encoded once. Files too large to cache are encoded chunk
+    by chunk while the body is written to the socket.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, ImageData],
+        prefix: str = "",
+        use_cache: bool = True,
+        variant: str = "base64",
+        encode: Optional[Callable[[], Iterable[bytes]]] = None
+    ):
+        """Initialize the value.
+
+        Args:
+            path: Path to the file, or an in-memory image
+            prefix: Text placed before the encoded data (e.g. a data URI header)
+            use_cache: Whether to look up and store the encoding in the payload cache
+            variant: Payload cache variant name of ``encode``'s output
+            encode: Callable yielding the base64 data, for transformed files
+                (defaults to encoding the file as is)
+        """
+        self.path = path
+        self.prefix = prefix
+        self.use_cache = use_cache
+        self.variant = variant
+        self.encode = encode
+        self._entry: Optional[Entry] = None
+        self._resolved = False
+
+    def _cached(self) -> Optional[Entry]:
+        if not self._resolved:
+            if self.use_cache:
+                self._entry = get_payload_cache().get(self.path, self.variant, encode=self.encode)
+            if self._entry is None and self.encode is not None:
+                # Transformed data has no size known up front, so hold it
+                self._entry = b"".join(self.encode())
+            self._resolved = True
+        return self._entry
+
+    def encoded_length(self) -> int:
+        """Length of the encoded string."""
+        entry = self._cached()
+        if isinstance(entry, bytes):
+            size = len(entry)
+        elif entry is not None:
+            size = os.path.getsize(entry)
+        else:
+            size = 4 * -(-image_size(self.path) // 3)
+        return len(self.prefix.encode()) + size
+
+    def iter_encoded(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Encoded string as a sequence of byte chunks."""
+        if self.prefix:
+            yield self.prefix.encode()
+        entry = self._cached()
+        if isinstance(entry, bytes):
+            view = memoryview(entry)
+            step = chunk_size // 3 * 4
+            for start in range(0, len(view), step):
+                yield view[start:start + step]
+        elif entry is not None:
+            with open(entry, "rb") as f:
+                yield from iter(lambda: f.read(chunk_size // 3 * 4), b"")
+        else:
+            yield from encode_file(self.path, chunk_size)
+
+    def read(self) -> str:
+        """Whole encoded string."""
+        return b"".join(self.iter_encoded()).decode()
+
+    def __repr__(self) -> str:
+        return f"Base64File({str(self.path)!r})"
+
+def contains_streams(value: Any) -> bool:
+    """Whether a payload has Base64File values anywhere in it."""
+    if isinstance(value, Base64File):
+        return True
+    if isinstance(value, dict):
+        return any(contains_streams(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(contains_streams(v) for v in value)
+    return False
+
+class StreamingJSONBody:
+    """JSON request body that streams its Base64File values.
+
+    The JSON around the files is rendered up front; each file is encoded
+    while the body is sent, so memory use does not depend on file size.
+    The body has a known length, so it is sent with Content-Length rather
+    than chunked encoding, and it can be iterated again if the request is
+    retried.
+    """
+
+    def __init__(self, payload: Any, chunk_size: int = CHUNK_SIZE):
+        """Initialize the body.
+
+        Args:
+            payload: JSON-serializable payload, possibly containing Base64File values
+            chunk_size: Raw bytes read from a file per chunk (multiple of 3)
+        """
+        if chunk_size % 3:
+            raise ValueError("chunk_size must be a multiple of 3")
+        self.chunk_size = chunk_size
+        files: List[Base64File] = []
+        marker = uuid.uuid4().hex
+
+        def replace(value: Any) -> Any:
+            if isinstance(value, Base64File):
+                files.append(value)
+                return f"{marker}:{len(files) - 1}"
+            if isinstance(value, dict):
+                return {k: replace(v) for k, v in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [replace(v) for v in value]
+            return value
+
+        pieces = re.split(f"{marker}:(\\d+)", json.dumps(replace(payload)))
+        # pieces alternates JSON text and file indexes: text, index, text, ..., text
+        self._text = [piece.encode() for piece in pieces[::2]]
+        self._files = [files[int(index)] for index in pieces[1::2]]
+
+    def __len__(self) -> int:
+        return sum(len(text) for text in self._text) + sum(f.encoded_length() for f in self._files)
+
+    def __iter__(self) -> Iterator[bytes]:
+        for text, file in zip(self._text, self._files):
+            if text:
+                yield text
+            yield from file.iter_encoded(self.chunk_size)
+        if self._text[-1]:
+            yield self._text[-1]
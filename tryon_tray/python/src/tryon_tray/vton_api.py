@@ -1,5 +1,5 @@
 from .services.factory import get_vton_service
-from .utils.file_io import download_image
+from .utils.download import get_downloader, indexed_paths
 from pathlib import Path
 
 def VTON(
@@ -31,7 +31,7 @@ def VTON(
         dict with keys:
             - urls: List of result image URLs
             - local_paths: List of local file paths (if auto_download=True)
-            - timing: Dict with start_time, end_time, and time_taken
+            - timing: JobTiming with the duration of each phase of the job
     """
     kwargs["show_polling_progress"] = show_polling_progress
     service = get_vton_service(
@@ -49,11 +49,7 @@ def VTON(
     # Create result dictionary with timing information
     result = {
         "urls": result_urls,
-        "timing": {
-            "start_time": service.start_time,
-            "end_time": service.end_time,
-            "time_taken": service.time_taken
-        }
+        "timing": service.timing
     }
     
     if auto_download and isinstance(result_urls, list):
@@ -65,20 +61,12 @@ def VTON(
         # Create parent directory if it doesn't exist
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        local_paths = []
-        for i, url in enumerate(result_urls):
-            # For single result, use the exact path. For multiple results, add index suffix
-            if len(result_urls) == 1:
-                file_path = output_path
-            else:
-                # Insert index before file extension
-                stem = output_path.stem
-                suffix = output_path.suffix
-                file_path = output_path.parent / f"{stem}_{i}{suffix}"
-                
-            download_image(url, str(file_path))
-            local_paths.append(str(file_path))
-            
-        result["local_paths"] = local_paths
+        # For single result, use the exact path. For multiple results, add index suffix
+        with service.timing.phase("download"):
+            downloads = get_downloader().download_all(result_urls, indexed_paths(output_path, len(result_urls)))
+        result["local_paths"] = [d.path for d in downloads if d.ok]
+        errors = [d.error for d in downloads if not d.ok]
+        if errors:
+            result["download_errors"] = errors
     
     return result 
\ No newline at end of file
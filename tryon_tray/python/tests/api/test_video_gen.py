@@ -3,6 +3,9 @@ from unittest.mock import patch, MagicMock
 from tryon_tray.api.video_gen import generate_video
 from tryon_tray.types.video import VideoGenResponse, VideoModelVersion, VideoMode, VideoDuration
 from tryon_tray.services.factory import ServiceType
+from tryon_tray.testing.fake_providers import FakeKlingServer
+from tryon_tray.types.download import DownloadError
+from tryon_tray.utils.sinks import MemorySink
 
 @pytest.fixture
 def mock_env():
@@ -21,8 +24,8 @@ def mock_image(tmp_path):
 
 def test_generate_video_integration(mock_env, mock_image):
     """Test the full video generation flow with mocked API calls."""
-    with patch('requests.post') as mock_post, \
-         patch('requests.get') as mock_get:
+    with patch('tryon_tray.utils.http.post') as mock_post, \
+         patch('tryon_tray.utils.http.get') as mock_get:
         
         # Mock API responses
         mock_post.return_value.ok = True
@@ -77,7 +80,7 @@ def test_generate_video_integration(mock_env, mock_image):
 
 def test_generate_video_error_handling(mock_env, mock_image):
     """Test error handling in the video generation flow."""
-    with patch('requests.post') as mock_post:
+    with patch('tryon_tray.utils.http.post') as mock_post:
         # Mock API error
         mock_post.return_value.ok = False
         mock_post.return_value.status_code = 400
@@ -96,8 +99,8 @@ def test_generate_video_error_handling(mock_env, mock_image):
 
 def test_generate_video_timeout(mock_env, mock_image):
     """Test handling of timeout during video generation."""
-    with patch('requests.post') as mock_post, \
-         patch('requests.get') as mock_get:
+    with patch('tryon_tray.utils.http.post') as mock_post, \
+         patch('tryon_tray.utils.http.get') as mock_get:
         
         # Mock initial success
         mock_post.return_value.ok = True
@@ -117,4 +120,20 @@ def test_generate_video_timeout(mock_env, mock_image):
             generate_video(
                 source_image=mock_image,
                 prompt="test prompt"
-            ) 
\ No newline at end of file
+            ) 
+
+def test_generate_video_reports_download_error(mock_env, mock_image):
+    """A failed download is reported on the response instead of being dropped."""
+    gone = MagicMock(return_value=(404, b"gone", {}))
+    with patch.object(FakeKlingServer, "_result_file", gone), FakeKlingServer(latency=0) as fake:
+        response = generate_video(
+            source_image=mock_image,
+            prompt="a walk",
+            base_url=fake.api_url,
+            result_sink=MemorySink(),
+            polling_interval=0.05
+        )
+
+    assert response.video_url.endswith(".mp4")
+    assert response.output is None
+    assert isinstance(response.download_error, DownloadError)
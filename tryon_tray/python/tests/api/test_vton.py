@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import pytest
+from tryon_tray.api.vton import VTON, VTON_async, VTON_batch, VTON_batch_async, VTON_fanout
+from tryon_tray.base.vton import BaseVTON
+from tryon_tray.services.factory import ServiceFactory, ServiceType
+from tryon_tray.utils.ratelimit import configure_rate_limit
+
+class FakeVTON(BaseVTON):
+    """In-memory service that completes after a fixed number of polls."""
+
+    polls_until_done = 2
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def __init__(self, model_image, garment_image, **kwargs):
+        super().__init__(model_image, garment_image, **kwargs)
+        self.polls = 0
+        self.polls_until_done = kwargs.get("polls", self.polls_until_done)
+
+    def run(self):
+        with FakeVTON.lock:
+            FakeVTON.in_flight += 1
+            FakeVTON.max_in_flight = max(FakeVTON.max_in_flight, FakeVTON.in_flight)
+        return "job-1"
+
+    def check_status(self):
+        self.polls += 1
+        if self.polls < self.polls_until_done:
+            return False, None
+        with FakeVTON.lock:
+            FakeVTON.in_flight -= 1
+        self.result_urls = [f"https://example.com/{self.model_image}.png"]
+        return True, self.result_urls
+
+    def get_result(self):
+        return {"urls": self.result_urls, "polls": self.polls}
+
+class FailingVTON(FakeVTON):
+    """Service whose job fails on the first poll."""
+
+    def check_status(self):
+        with FakeVTON.lock:
+            FakeVTON.in_flight -= 1
+        return True, Exception("Try-on failed: bad input")
+
+@pytest.fixture(autouse=True)
+def fake_services():
+    registry = ServiceFactory._registry[ServiceType.VTON]
+    registry["fake"] = FakeVTON
+    registry["failing"] = FailingVTON
+    FakeVTON.in_flight = FakeVTON.max_in_flight = 0
+    yield
+    registry.pop("fake")
+    registry.pop("failing")
+
+def test_vton_async_returns_result():
+    """VTON_async polls until completion and returns the service result."""
+    result = asyncio.run(VTON_async("person", "garment", model_name="fake", polling_interval=0))
+
+    assert result == {"urls": ["https://example.com/person.png"], "polls": 2}
+
+def test_vton_async_runs_jobs_concurrently():
+    """Jobs wait between polls without holding a thread each."""
+    async def main():
+        return await asyncio.gather(*[
+            VTON_async(f"person{i}", "garment", model_name="fake", polling_interval=0.05)
+            for i in range(50)
+        ])
+
+    results = asyncio.run(main())
+
+    assert [r["urls"][0] for r in results] == [f"https://example.com/person{i}.png" for i in range(50)]
+
+def test_vton_blocking_wraps_async():
+    """The blocking VTON gives the same result as the async core."""
+    result = VTON("person", "garment", model_name="fake", polling_interval=0)
+
+    assert result["urls"] == ["https://example.com/person.png"]
+
+def test_vton_blocking_inside_running_loop():
+    """The blocking VTON still works when called from a running event loop."""
+    async def main():
+        return VTON("person", "garment", model_name="fake", polling_interval=0)
+
+    assert asyncio.run(main())["polls"] == 2
+
+def test_vton_async_raises_job_error():
+    """A failed job surfaces its error."""
+    with pytest.raises(Exception, match="bad input"):
+        asyncio.run(VTON_async("person", "garment", model_name="failing", polling_interval=0))
+
+def test_vton_async_timeout():
+    """Exceeding the polling budget raises TimeoutError."""
+    with pytest.raises(TimeoutError):
+        asyncio.run(VTON_async(
+            "person", "garment", model_name="fake",
+            max_polling_attempts=1, polling_interval=0
+        ))
+
+def test_vton_batch_yields_in_completion_order():
+    """Fast jobs are yielded before slow jobs submitted ahead of them."""
+    pairs = [
+        ("slow", "garment", {"polls": 4}),
+        ("fast", "garment", {"polls": 1}),
+        ("medium", "garment", {"polls": 2}),
+    ]
+
+    results = list(VTON_batch(pairs, model_name="fake", polling_interval=0.02))
+
+    assert [r.model_image for r in results] == ["fast", "medium", "slow"]
+    assert [r.index for r in results] == [1, 2, 0]
+    assert all(r.ok for r in results)
+
+def test_vton_batch_bounds_concurrency():
+    """No more than max_concurrency jobs are in flight at once."""
+    pairs = ((f"person{i}", "garment") for i in range(20))
+
+    results = list(VTON_batch(pairs, model_name="fake", max_concurrency=3, polling_interval=0.01))
+
+    assert len(results) == 20
+    assert FakeVTON.max_in_flight == 3
+
+def test_vton_batch_reports_errors_per_job():
+    """A failing job is reported without stopping the batch."""
+    async def main():
+        return [r async for r in VTON_batch_async(
+            [("person", "garment")], model_name="failing", polling_interval=0
+        )]
+
+    [result] = asyncio.run(main())
+
+    assert not result.ok
+    assert "bad input" in str(result.error)
+
+def test_vton_batch_early_exit_cancels_pending():
+    """Closing the iterator early cancels jobs still in flight."""
+    pairs = [(f"person{i}", "garment", {"polls": 1 if i == 0 else 1000}) for i in range(5)]
+    batch = VTON_batch(pairs, model_name="fake", max_polling_attempts=1000, polling_interval=0.01)
+
+    first = next(batch)
+    batch.close()
+
+    assert first.model_image == "person0"
+
+def test_vton_fanout_runs_providers_concurrently():
+    """Each provider is reported as it finishes, with its own parameters."""
+    results = list(VTON_fanout(
+        "person", "garment",
+        model_names=["fake", "failing", "unknown"],
+        params={"fake": {"polls": 3}},
+        polling_interval=0.02
+    ))
+
+    by_name = {r.model_name: r for r in results}
+    assert [r.model_name for r in results][-1] == "fake"
+    assert by_name["fake"].result["polls"] == 3
+    assert "bad input" in str(by_name["failing"].error)
+    assert "Unknown model 'unknown'" in str(by_name["unknown"].error)
+    assert FakeVTON.max_in_flight == 2
+
+def test_vton_fanout_param_overrides_inputs():
+    """Provider parameters can swap in provider-specific inputs."""
+    [result] = VTON_fanout(
+        "person", "garment",
+        model_names=["fake"],
+        params={"fake": {"model_image": "https-person"}},
+        polling_interval=0
+    )
+
+    assert result.result["urls"] == ["https://example.com/https-person.png"]
+
+def test_vton_batch_respects_provider_in_flight_limit():
+    """The provider governor caps in-flight jobs across the whole process."""
+    configure_rate_limit("FakeVTON", max_in_flight=2)
+    try:
+        pairs = ((f"person{i}", "garment") for i in range(10))
+        results = list(VTON_batch(pairs, model_name="fake", max_concurrency=8, polling_interval=0.01))
+    finally:
+        configure_rate_limit("FakeVTON")
+
+    assert all(r.ok for r in results)
+    assert FakeVTON.max_in_flight == 2
@@ -0,0 +1,69 @@
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+from unittest.mock import patch
+from tryon_tray.services import factory
+from tryon_tray.services.factory import ServiceFactory, ServiceType
+
+SRC = str(Path(__file__).resolve().parents[2] / "src")
+
+# Generous so that slow CI machines pass; before lazy loading the package
+# took ~450 ms to import because of the provider SDKs
+IMPORT_BUDGET_MS = 150
+
+def run_python(code):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env={"PYTHONPATH": SRC, "FASHNAI_API_KEY": "test_key"}, check=True
+    )
+    return result.stdout, result.stderr
+
+def test_import_stays_within_budget():
+    stdout, importtime = run_python(
+        "import sys, tryon_tray; print(sorted(m for m in ('requests', 'replicate', 'jwt') if m in sys.modules))"
+    )
+    assert stdout.strip() == "[]"
+
+    # Last line of the -X importtime report is the package itself:
+    # "import time: self [us] | cumulative | imported package"
+    [line] = [l for l in importtime.splitlines() if l.rstrip().endswith("| tryon_tray")]
+    cumulative_us = int(line.split("|")[1])
+    assert cumulative_us / 1000 < IMPORT_BUDGET_MS
+
+def test_only_the_requested_provider_is_imported():
+    stdout, _ = run_python(
+        "import sys\n"
+        "from tryon_tray.services.factory import get_vton_service\n"
+        "get_vton_service('fashnai', model_image='a', garment_image='b')\n"
+        "print(sorted(m for m in sys.modules if m.startswith('tryon_tray.services.vton.')), 'replicate' in sys.modules)"
+    )
+    assert stdout.strip() == "['tryon_tray.services.vton.fashnai'] False"
+
+@pytest.fixture
+def plugin_registry():
+    registry = ServiceFactory._registry[ServiceType.VTON]
+    saved = dict(registry)
+    ServiceFactory._entry_points_loaded = False
+    yield registry
+    registry.clear()
+    registry.update(saved)
+    ServiceFactory._entry_points_loaded = False
+
+def test_entry_point_plugins_are_registered_lazily(plugin_registry):
+    plugin = SimpleNamespace(name="plugin", value="tryon_tray.services.vton.fashnai:FashnaiVTON")
+    shadowing = SimpleNamespace(name="fashnai", value="some.other:Module")
+    groups = {"tryon_tray.vton": [plugin, shadowing]}
+    with patch.object(factory, "_entry_points", lambda group: groups.get(group, [])):
+        assert "plugin" in ServiceFactory.available(ServiceType.VTON)
+        assert plugin_registry["plugin"] == plugin.value
+
+        service_class = ServiceFactory.get_service_class(ServiceType.VTON, "plugin")
+
+    assert service_class.__name__ == "FashnaiVTON"
+    assert ServiceFactory.get_service_class(ServiceType.VTON, "fashnai") is service_class
+
+def test_unknown_model_lists_available_models():
+    with pytest.raises(ValueError, match="Available models: .*'alphabake'"):
+        ServiceFactory.get_service_class(ServiceType.VTON, "nope")
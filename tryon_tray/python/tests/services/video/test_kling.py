@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock
 import jwt
@@ -15,7 +16,7 @@ def mock_env():
 
 @pytest.fixture
 def mock_requests():
-    with patch('tryon_tray.services.video.kling.requests') as mock:
+    with patch('tryon_tray.services.video.kling.http') as mock:
         yield mock
 
 @pytest.fixture
@@ -179,4 +180,42 @@ def test_get_result_with_metadata(service):
     assert result["video_url"] == "https://example.com/video.mp4"
     assert result["task_id"] == "test_task_123"
     assert result["created_at"] == 1234567890
-    assert result["updated_at"] == 1234567891 
\ No newline at end of file
+    assert result["updated_at"] == 1234567891 
+def test_run_async_success(service, mock_requests):
+    """Test video generation through the async core."""
+    create_response = MagicMock()
+    create_response.ok = True
+    create_response.json.return_value = {
+        "data": {"task_id": "test_task_123"}
+    }
+    
+    pending_response = MagicMock()
+    pending_response.ok = True
+    pending_response.json.return_value = {
+        "data": {"task_status": "processing"}
+    }
+    
+    done_response = MagicMock()
+    done_response.ok = True
+    done_response.json.return_value = {
+        "data": {
+            "task_status": "succeed",
+            "task_id": "test_task_123",
+            "task_result": {
+                "videos": [{
+                    "url": "https://example.com/video.mp4"
+                }]
+            }
+        }
+    }
+    
+    mock_requests.post.return_value = create_response
+    mock_requests.get.side_effect = [pending_response, done_response]
+    
+    service.polling_interval = 0
+    with patch.object(KlingVideoGen, '_image_to_base64', return_value="base64_image_data"):
+        asyncio.run(service.run_async())
+    
+    assert service.task_id == "test_task_123"
+    assert service.result_url == "https://example.com/video.mp4"
+    assert mock_requests.get.call_count == 2
@@ -0,0 +1,88 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.harness import (
+    Benchmark, BenchmarkResult, find_regressions, load_history, run_benchmark, save_run
+)
+
+ENV = {"machine": "bench-host x86_64 Linux", "python": "3.11.7", "version": "0.2.2", "commit": "abc1234"}
+
+def test_run_benchmark_times_the_yielded_operation_and_tears_down():
+    events = []
+
+    def func():
+        events.append("setup")
+        try:
+            yield lambda: events.append("op")
+        finally:
+            events.append("teardown")
+
+    result = run_benchmark(Benchmark("noop", func, number=3, repeat=2, items=10))
+
+    # One warm-up operation, then 2 repeats of 3
+    assert events == ["setup"] + ["op"] * 7 + ["teardown"]
+    assert len(result.times) == 2
+    assert result.to_dict()["per_item"] == result.median / 10
+
+def test_history_round_trip_and_regressions(tmp_path):
+    path = tmp_path / "history.json"
+    save_run([BenchmarkResult("fast", [1.0], 1), BenchmarkResult("slow", [1.0], 1)], path, ENV)
+
+    history = load_history(path)
+    assert [run["commit"] for run in history] == ["abc1234"]
+
+    current = [BenchmarkResult("fast", [1.1], 1), BenchmarkResult("slow", [1.5], 1), BenchmarkResult("new", [9.0], 1)]
+    [regression] = find_regressions(current, history, ENV, threshold=0.2)
+    assert regression.name == "slow"
+    assert regression.ratio == 1.5
+
+    # Runs from another machine are not comparable
+    assert find_regressions(current, history, {**ENV, "machine": "laptop"}) == []
+
+def test_every_benchmark_runs():
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks", "--quick"],
+        cwd=ROOT, capture_output=True, text=True, env={"PYTHONPATH": str(ROOT / "src")}, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    assert "encode.payload[20MB]" in result.stdout
+    assert "polling.scheduler[500 jobs]" in result.stdout
+
+def test_load_test_runs_jobs_against_a_fake_provider(tmp_path):
+    summary_path = tmp_path / "summary.json"
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.loadtest", "--jobs", "40", "--latency", "0.1", "--poll-interval", "0.05",
+         "--failure-rate", "0.1", "--json", str(summary_path)],
+        cwd=ROOT, capture_output=True, text=True, env={"PYTHONPATH": str(ROOT / "src")}, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+
+    summary = json.loads(summary_path.read_text())
+    assert summary["jobs"] == 40
+    assert 0 < summary["failed"] < 40
+    assert summary["polls_per_job"] >= 1
+    assert set(summary["latency"]) == {"p50", "p90", "p99", "p99.9"}
+
+def test_load_test_replays_a_recorded_run(tmp_path):
+    def loadtest(*args):
+        summary_path = tmp_path / "summary.json"
+        result = subprocess.run(
+            [sys.executable, "-m", "benchmarks.loadtest", "--jobs", "20", "--poll-interval", "0.05",
+             "--json", str(summary_path), *args],
+            cwd=ROOT, capture_output=True, text=True, env={"PYTHONPATH": str(ROOT / "src")}, timeout=120
+        )
+        assert result.returncode == 0, result.stderr
+        return json.loads(summary_path.read_text())
+
+    cassette = tmp_path / "cassette"
+    recorded = loadtest("--provider", "vmodel", "--latency", "0.5", "--failure-rate", "0.2", "--record", str(cassette))
+    replayed = loadtest("--replay", str(cassette), "--speed", "10")
+
+    assert replayed["provider"] == "vmodel"
+    assert replayed["failed"] == recorded["failed"]
+    assert replayed["requests"] is None
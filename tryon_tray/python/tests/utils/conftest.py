@@ -0,0 +1,21 @@
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+from tryon_tray.api.vton import VTON
+
+INPUTS = Path(__file__).resolve().parents[1] / "inputs"
+PERSON = str(INPUTS / "person.jpg")
+GARMENT = str(INPUTS / "garment.jpeg")
+
+@pytest.fixture
+def kling_env():
+    with patch.dict("os.environ", {"KLINGAI_ACCESS_ID": "test_id", "KLINGAI_API_KEY": "test_key"}):
+        yield
+
+@pytest.fixture
+def run_kling():
+    """Run a Kling try-on against a fake server; other arguments go to VTON."""
+    def run(server, model_image=PERSON, garment_image=GARMENT, **kwargs):
+        kwargs.setdefault("polling_interval", 0.1)
+        return VTON(model_image, garment_image, model_name="klingai", base_url=server.images_url, **kwargs)
+    return run
@@ -0,0 +1,40 @@
+import threading
+import jwt
+from unittest.mock import patch
+from tryon_tray.utils.auth import JWTCache
+
+def test_token_reused_until_refresh_margin():
+    """The same token is returned until it is close to expiring."""
+    cache = JWTCache(ttl=1800, refresh_margin=60)
+
+    with patch("tryon_tray.utils.auth.time.time", return_value=1_000_000):
+        first = cache.get("id", "secret")
+        assert cache.get("id", "secret") is first
+    with patch("tryon_tray.utils.auth.time.time", return_value=1_000_000 + 1700):
+        assert cache.get("id", "secret") is first
+    with patch("tryon_tray.utils.auth.time.time", return_value=1_000_000 + 1750):
+        refreshed = cache.get("id", "secret")
+
+    assert refreshed != first
+    claims = jwt.decode(refreshed, "secret", algorithms=["HS256"], options={"verify_exp": False, "verify_nbf": False})
+    assert claims == {"iss": "id", "exp": 1_000_000 + 1750 + 1800, "nbf": 1_000_000 + 1750 - 5}
+
+def test_tokens_are_per_access_id():
+    """Different credentials get different tokens."""
+    cache = JWTCache()
+
+    assert cache.get("id-a", "secret") != cache.get("id-b", "secret")
+
+def test_concurrent_callers_share_one_signature():
+    """Many threads asking at once cause a single signing."""
+    cache = JWTCache()
+    tokens = []
+    with patch("tryon_tray.utils.auth.jwt.encode", wraps=jwt.encode) as encode:
+        threads = [threading.Thread(target=lambda: tokens.append(cache.get("id", "secret"))) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert encode.call_count == 1
+    assert len(set(tokens)) == 1
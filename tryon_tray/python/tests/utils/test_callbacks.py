@@ -0,0 +1,115 @@
+import time
+from pathlib import Path
+import pytest
+import requests
+from tryon_tray.api.vton import VTON
+from tryon_tray.services.video.kling import KlingVideoGen
+from tryon_tray.testing.fake_providers import FakeKlingServer
+from tryon_tray.utils.callbacks import CallbackReceiver
+from tryon_tray.utils.polling import FixedPolling, PollScheduler
+
+INPUTS = Path(__file__).resolve().parents[1] / "inputs"
+
+@pytest.fixture
+def scheduler():
+    scheduler = PollScheduler(max_workers=4)
+    yield scheduler
+    scheduler.stop()
+
+@pytest.fixture
+def receiver():
+    receiver = CallbackReceiver()
+    yield receiver
+    receiver.close()
+
+@pytest.fixture
+def fake_kling():
+    with FakeKlingServer(latency=0.3) as server:
+        yield server
+
+def slow_policy():
+    """Fallback polling too slow to finish any test on its own."""
+    return FixedPolling(60, initial_delay=60)
+
+def test_callback_wakes_job(scheduler, receiver):
+    """A POST to the registration URL makes the job poll immediately."""
+    registration = receiver.register()
+    future = scheduler.submit(lambda: (True, "done"), policy=slow_policy())
+    registration.attach(future, scheduler)
+
+    response = requests.post(registration.url, json={"task_status": "succeed"})
+
+    assert response.status_code == 200
+    assert future.result(timeout=5) == "done"
+    assert registration.payloads == [{"task_status": "succeed"}]
+
+def test_early_callback_wakes_on_attach(scheduler, receiver):
+    """A callback that arrives before polling starts is not lost."""
+    registration = receiver.register()
+    assert receiver.dispatch(registration.token, {"task_status": "succeed"})
+
+    future = scheduler.submit(lambda: (True, "done"), policy=slow_policy())
+    registration.attach(future, scheduler)
+
+    assert future.result(timeout=5) == "done"
+
+def test_unknown_token_is_rejected(receiver):
+    """Callbacks for unknown or closed registrations get a 404."""
+    registration = receiver.register()
+    registration.close()
+
+    response = requests.post(registration.url, json={})
+
+    assert response.status_code == 404
+
+def test_mounted_receiver_requires_public_url():
+    """Without the embedded server the app must say where it is mounted."""
+    with pytest.raises(ValueError):
+        CallbackReceiver(serve=False)
+
+    receiver = CallbackReceiver(serve=False, public_url="https://example.com/hooks")
+    assert receiver.register().url.startswith("https://example.com/hooks/")
+
+def test_vton_completes_on_callback(kling_env, fake_kling, receiver):
+    """Kling try-on resolves on the callback instead of the polling interval."""
+    start = time.monotonic()
+    result = VTON(
+        str(INPUTS / "person.jpg"), str(INPUTS / "garment.jpeg"),
+        model_name="klingai",
+        base_url=fake_kling.images_url,
+        callbacks=receiver,
+        polling_interval=60
+    )
+
+    assert time.monotonic() - start < 10
+    assert result["urls"][0].endswith(".png")
+    assert fake_kling.callbacks_sent == 1
+    assert fake_kling.count("GET", "/v1/images/kolors-virtual-try-on/") == 1
+
+def test_vton_falls_back_to_polling(kling_env, fake_kling):
+    """Without callbacks the job is found by polling, as before."""
+    result = VTON(
+        str(INPUTS / "person.jpg"), str(INPUTS / "garment.jpeg"),
+        model_name="klingai",
+        base_url=fake_kling.images_url,
+        polling_interval=0.1
+    )
+
+    assert result["urls"][0].endswith(".png")
+    assert fake_kling.callbacks_sent == 0
+    assert fake_kling.count("GET", "/v1/images/kolors-virtual-try-on/") > 1
+
+def test_video_completes_on_callback(kling_env, fake_kling, receiver):
+    """Kling video jobs register the callback URL with the task."""
+    service = KlingVideoGen(
+        source_image=str(INPUTS / "person.jpg"),
+        prompt="walk",
+        base_url=fake_kling.api_url,
+        callbacks=receiver,
+        polling_interval=60
+    )
+
+    service.run()
+
+    assert service.result_url.endswith(".mp4")
+    assert fake_kling.count("GET", "/v1/videos/image2video/") == 1
@@ -0,0 +1,78 @@
+import json
+import time
+import pytest
+import requests
+from tryon_tray.testing.fake_providers import FakeKlingServer
+from tryon_tray.utils.cassette import Cassette, CassetteError
+from tryon_tray.utils.hooks import JobHooks
+from tryon_tray.utils.http import configure_http
+from tryon_tray.utils.sinks import MemorySink
+
+class PollCounter(JobHooks):
+    def __init__(self):
+        self.polls = 0
+
+    def on_poll(self, service):
+        self.polls += 1
+
+@pytest.fixture(autouse=True)
+def reset_http(kling_env):
+    yield
+    configure_http()
+
+def test_recorded_job_replays_without_the_provider(tmp_path, run_kling):
+    recorded_polls = PollCounter()
+    with FakeKlingServer(latency=0.3, output_size=(16, 16)) as server, Cassette(tmp_path, "record") as cassette:
+        configure_http(cassette=cassette)
+        recorded = run_kling(server, result_sink=MemorySink(), polling_interval=0.05, hooks=recorded_polls)
+
+    # Image bodies are stored once by content hash; credentials are not stored
+    blobs = list((tmp_path / "blobs").iterdir())
+    assert len(blobs) == 2
+    assert "Authorization" not in (tmp_path / "interactions.jsonl").read_text()
+
+    replayed_polls = PollCounter()
+    configure_http(cassette=Cassette(tmp_path, "replay", speed=None))
+    replayed = run_kling(server, result_sink=MemorySink(), polling_interval=0.01, hooks=replayed_polls)
+
+    assert replayed["urls"] == recorded["urls"]
+    assert replayed["outputs"][0].getvalue() == recorded["outputs"][0].getvalue()
+    assert replayed_polls.polls == recorded_polls.polls
+
+def write_cassette(path, interactions):
+    path.mkdir(exist_ok=True)
+    with open(path / "interactions.jsonl", "w") as f:
+        for interaction in interactions:
+            f.write(json.dumps({"headers": [["Content-Type", "application/json"]], "reason": "OK", **interaction}) + "\n")
+
+def status(state, start):
+    return {
+        "method": "GET", "url": "https://provider.test/status/job-12345678", "request": None,
+        "start": start, "elapsed": 0.01, "status": 200,
+        "response": {"sha256": state, "text": json.dumps({"status": state})}
+    }
+
+def test_status_checks_replay_on_a_scaled_timeline(tmp_path):
+    write_cassette(tmp_path, [
+        {"method": "POST", "url": "https://provider.test/run", "request": {"sha256": "a", "text": "{}"},
+         "start": 0.0, "elapsed": 0.1, "status": 200, "response": {"sha256": "b", "text": '{"id": "job-12345678"}'}},
+        status("processing", 1.0),
+        status("processing", 2.0),
+        status("completed", 3.0),
+    ])
+    session = requests.Session()
+    session.mount("https://", Cassette(tmp_path, "replay", speed=10).adapter())
+
+    assert session.post("https://provider.test/run", json={"image": "other"}).json() == {"id": "job-12345678"}
+    assert session.get("https://provider.test/status/job-12345678").json() == {"status": "processing"}
+    # 0.4 s at 10x is 4 s after the submit in the recording
+    time.sleep(0.4)
+    assert session.get("https://provider.test/status/job-12345678").json() == {"status": "completed"}
+
+def test_unrecorded_request_raises(tmp_path):
+    write_cassette(tmp_path, [status("completed", 0.0)])
+    session = requests.Session()
+    session.mount("https://", Cassette(tmp_path, "replay").adapter())
+
+    with pytest.raises(CassetteError):
+        session.get("https://provider.test/status/other-job-id")
@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+from tryon_tray.api.vton import VTON
+from tryon_tray.testing.fake_providers import FakeKlingServer
+from tryon_tray.types.download import DownloadError
+from tryon_tray.utils.download import Downloader, indexed_paths
+from tryon_tray.utils.retry import RetryPolicy
+
+DATA = bytes(range(256)) * 400
+
+class FileServer:
+    """Serves DATA with Range support and scriptable failures."""
+
+    def __init__(self):
+        self.requests = []
+        self.failures = []  # per-request behaviour: "truncate", "503", "short", "no-range"
+        self.delay = 0.0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append((self.path, self.headers.get("Range")))
+                failure = server.failures.pop(0) if server.failures else None
+                time.sleep(server.delay)
+                if self.path.startswith("/missing"):
+                    self.send_error(404)
+                    return
+                if failure == "503":
+                    self.send_error(503)
+                    return
+                start = 0
+                range_header = self.headers.get("Range")
+                if range_header and failure != "no-range":
+                    start = int(range_header[len("bytes="):].rstrip("-"))
+                    if start >= len(DATA):
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{len(DATA)}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(DATA) - 1}/{len(DATA)}")
+                else:
+                    self.send_response(200)
+                body = DATA[start:]
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if failure == "truncate":
+                    self.wfile.write(body[:len(body) // 2])
+                    self.close_connection = True
+                    return
+                self.wfile.write(body[:-10] if failure == "short" else body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+@pytest.fixture
+def server():
+    server = FileServer()
+    yield server
+    server.close()
+
+@pytest.fixture
+def downloader():
+    return Downloader(chunk_size=4096, retry=RetryPolicy(max_retries=3, backoff=0.01))
+
+def test_downloads_file(server, downloader, tmp_path):
+    path = downloader.download(f"{server.url}/a.png", tmp_path / "out" / "a.png")
+    assert path.read_bytes() == DATA
+    assert not (tmp_path / "out" / "a.png.part").exists()
+
+def test_resumes_truncated_transfer(server, downloader, tmp_path):
+    """A connection dropped mid-body is resumed with a Range request."""
+    server.failures = ["truncate"]
+    path = downloader.download(f"{server.url}/a.png", tmp_path / "a.png")
+
+    assert path.read_bytes() == DATA
+    offset = int(server.requests[1][1][len("bytes="):].rstrip("-"))
+    assert 0 < offset <= len(DATA) // 2
+
+def test_resumes_existing_part_file(server, downloader, tmp_path):
+    (tmp_path / "a.png.part").write_bytes(DATA[:1000])
+    downloader.download(f"{server.url}/a.png", tmp_path / "a.png")
+
+    assert (tmp_path / "a.png").read_bytes() == DATA
+    assert server.requests == [("/a.png", "bytes=1000-")]
+
+def test_complete_part_file_is_kept(server, downloader, tmp_path):
+    """A 416 for a part file that already has every byte finishes the download."""
+    (tmp_path / "a.png.part").write_bytes(DATA)
+    downloader.download(f"{server.url}/a.png", tmp_path / "a.png")
+    assert (tmp_path / "a.png").read_bytes() == DATA
+
+def test_server_ignoring_range_restarts(server, downloader, tmp_path):
+    (tmp_path / "a.png.part").write_bytes(b"x" * 1000)
+    server.failures = ["no-range"]
+    downloader.download(f"{server.url}/a.png", tmp_path / "a.png")
+    assert (tmp_path / "a.png").read_bytes() == DATA
+
+def test_retries_server_errors(server, downloader, tmp_path):
+    server.failures = ["503", "503"]
+    downloader.download(f"{server.url}/a.png", tmp_path / "a.png")
+    assert len(server.requests) == 3
+
+def test_size_mismatch_is_reported(server, tmp_path):
+    server.failures = ["short"] * 10
+    downloader = Downloader(chunk_size=4096, retry=RetryPolicy(max_retries=1, backoff=0.01))
+
+    with pytest.raises(DownloadError) as excinfo:
+        downloader.download(f"{server.url}/a.png", tmp_path / "a.png")
+
+    error = excinfo.value
+    assert error.expected_bytes == len(DATA)
+    assert 0 < error.received_bytes < len(DATA)
+    assert error.retryable
+    assert error.path == str(tmp_path / "a.png")
+    assert not (tmp_path / "a.png").exists()
+
+def test_client_errors_are_not_retried(server, downloader, tmp_path):
+    with pytest.raises(DownloadError) as excinfo:
+        downloader.download(f"{server.url}/missing.png", tmp_path / "a.png")
+    assert excinfo.value.status_code == 404
+    assert len(server.requests) == 1
+
+def test_download_all_runs_concurrently(server, downloader, tmp_path):
+    server.delay = 0.3
+    urls = [f"{server.url}/{i}.png" for i in range(3)] + [f"{server.url}/missing.png"]
+    paths = indexed_paths(tmp_path / "result.png", len(urls))
+
+    start = time.monotonic()
+    results = downloader.download_all(urls, paths)
+
+    assert time.monotonic() - start < 0.9
+    assert [r.ok for r in results] == [True, True, True, False]
+    assert [r.path for r in results] == [str(p) for p in paths]
+    assert results[0].size == len(DATA)
+    assert results[3].error.status_code == 404
+
+def test_invalid_urls_are_reported_not_raised(server, downloader, tmp_path):
+    urls = [f"{server.url}/a.png", "ftp://example.com/result.png", "http://"]
+    results = downloader.download_all(urls, indexed_paths(tmp_path / "result.png", len(urls)))
+
+    assert [r.ok for r in results] == [True, False, False]
+    for result in results[1:]:
+        assert isinstance(result.error, DownloadError)
+        assert not result.error.retryable and result.error.url == result.url
+    assert len(server.requests) == 1
+
+def test_indexed_paths():
+    assert indexed_paths("out/result.png", 1) == [Path("out/result.png")]
+    assert indexed_paths("out/result.png", 2) == [Path("out/result_0.png"), Path("out/result_1.png")]
+
+def test_vton_auto_download(tmp_path):
+    with patch.dict("os.environ", {"KLINGAI_ACCESS_ID": "test_id", "KLINGAI_API_KEY": "test_key"}):
+        with FakeKlingServer(latency=0) as fake:
+            inputs = Path(__file__).resolve().parents[1] / "inputs"
+            result = VTON(
+                str(inputs / "person.jpg"), str(inputs / "garment.jpeg"),
+                model_name="klingai",
+                base_url=fake.images_url,
+                auto_download=True,
+                download_path=str(tmp_path / "result.png"),
+                polling_interval=0.1
+            )
+
+    assert result["local_path"] == str(tmp_path / "result.png")
+    assert result["local_paths"] == [result["local_path"]]
+    assert os.path.getsize(result["local_path"]) > 0
+    assert "download_errors" not in result
@@ -0,0 +1,69 @@
+import io
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+from PIL import Image
+from tryon_tray.api.vton import VTON
+from tryon_tray.testing.fake_providers import (
+    FakeAlphabakeServer, FakeFashnServer, FakeVModelServer, lognormal, synthetic_image, uniform
+)
+from tryon_tray.utils.sinks import MemorySink
+
+INPUTS = Path(__file__).resolve().parents[1] / "inputs"
+PERSON = str(INPUTS / "person.jpg")
+GARMENT = str(INPUTS / "garment.jpeg")
+
+@pytest.fixture(autouse=True)
+def credentials():
+    env = {"FASHNAI_API_KEY": "test_key", "VMODEL_API_KEY": "test_key", "ALPHABAKE_API_KEY": "test_key"}
+    with patch.dict("os.environ", env):
+        yield
+
+@pytest.mark.parametrize("server_class, model_name", [
+    (FakeFashnServer, "fashnai"),
+    (FakeVModelServer, "vmodel"),
+    (FakeAlphabakeServer, "alphabake"),
+])
+def test_service_runs_against_fake_provider(server_class, model_name):
+    sink = MemorySink()
+    with server_class(latency=0.2, output_size=(48, 32)) as server:
+        result = VTON(PERSON, GARMENT, model_name=model_name, base_url=server.base_url,
+                      polling_interval=0.1, result_sink=sink)
+
+    [task_id] = server.tasks
+    assert result["urls"] == [server.result_url(task_id)]
+    assert Image.open(io.BytesIO(sink.getvalue())).size == (48, 32)
+
+@pytest.mark.parametrize("server_class, model_name", [
+    (FakeFashnServer, "fashnai"),
+    (FakeVModelServer, "vmodel"),
+    (FakeAlphabakeServer, "alphabake"),
+])
+def test_failed_job_raises(server_class, model_name):
+    with server_class(latency=0, failure_rate=1.0) as server:
+        with pytest.raises(Exception, match="fail"):
+            VTON(PERSON, GARMENT, model_name=model_name, base_url=server.base_url, polling_interval=0.1)
+
+def test_random_429s_are_retried():
+    with FakeFashnServer(latency=0, rate_limit_rate=0.5, retry_after=0.01, seed=1) as server:
+        for _ in range(3):
+            VTON(PERSON, GARMENT, model_name="fashnai", base_url=server.base_url, polling_interval=0.05)
+
+    assert server.rejected > 0
+    assert len(server.tasks) == 3
+
+def test_failure_rate_and_latency_are_drawn_per_job():
+    with FakeFashnServer(latency=uniform(1, 2, seed=3), failure_rate=0.5, seed=3) as server:
+        tasks = [server.tasks[server.create_task("image", None)] for _ in range(200)]
+
+    assert all(1 <= task["latency"] <= 2 for task in tasks)
+    assert 60 < sum(task["failed"] for task in tasks) < 140
+
+def test_lognormal_median():
+    draw = lognormal(2.0, 0.5, seed=4)
+    values = sorted(draw() for _ in range(2001))
+    assert 1.8 < values[1000] < 2.2
+
+def test_synthetic_image_is_a_valid_png():
+    image = Image.open(io.BytesIO(synthetic_image(20, 10)))
+    assert (image.format, image.size, image.mode) == ("PNG", (20, 10), "RGB")
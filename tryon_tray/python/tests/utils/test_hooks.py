@@ -0,0 +1,82 @@
+import logging
+import pytest
+from tryon_tray.testing.fake_providers import FakeKlingServer
+from tryon_tray.utils.hooks import JobHooks, add_hooks, remove_hooks
+from tryon_tray.utils.metrics import MetricsExporter
+
+pytestmark = pytest.mark.usefixtures("kling_env")
+
+class RecordingHooks(JobHooks):
+    def __init__(self):
+        self.events = []
+
+    def on_submit(self, service):
+        self.events.append("submit")
+
+    def on_poll(self, service):
+        self.events.append("poll")
+
+    def on_complete(self, service, result):
+        self.events.append("complete")
+
+    def on_error(self, service, error):
+        self.events.append(f"error:{type(error).__name__}")
+
+    def on_download(self, service, results):
+        self.events.append(f"download:{len(results)}")
+
+def test_job_events_are_sent_in_order(tmp_path, run_kling):
+    hooks = RecordingHooks()
+    with FakeKlingServer(latency=0.1) as server:
+        run_kling(server, hooks=hooks, auto_download=True, download_path=str(tmp_path / "out.png"))
+
+    assert hooks.events[0] == "submit"
+    assert hooks.events[1:-2] and set(hooks.events[1:-2]) == {"poll"}
+    assert hooks.events[-2:] == ["complete", "download:1"]
+
+def test_failed_job_reports_error(run_kling):
+    hooks = RecordingHooks()
+    with FakeKlingServer(latency=0, fail=True) as server:
+        with pytest.raises(Exception):
+            run_kling(server, hooks=[hooks])
+
+    assert hooks.events[-1] == "error:Exception"
+    assert "complete" not in hooks.events
+
+def test_process_wide_hooks_and_broken_hooks(caplog, run_kling):
+    class BrokenHooks(JobHooks):
+        def on_submit(self, service):
+            raise RuntimeError("boom")
+
+    hooks = add_hooks(RecordingHooks())
+    broken = add_hooks(BrokenHooks())
+    try:
+        with FakeKlingServer(latency=0) as server, caplog.at_level(logging.ERROR):
+            result = run_kling(server)
+    finally:
+        remove_hooks(hooks)
+        remove_hooks(broken)
+
+    assert result["urls"]
+    assert hooks.events[0] == "submit" and hooks.events[-1] == "complete"
+    assert "BrokenHooks.on_submit failed" in caplog.text
+
+def test_metrics_exporter_renders_prometheus_text(tmp_path, run_kling):
+    exporter = MetricsExporter(buckets=(1, 10), tracing=False)
+    with FakeKlingServer(latency=0) as server:
+        run_kling(server, hooks=exporter, auto_download=True, download_path=str(tmp_path / "out.png"))
+    with FakeKlingServer(latency=0, fail=True) as server:
+        with pytest.raises(Exception):
+            run_kling(server, hooks=exporter)
+
+    text = exporter.render()
+    assert '# TYPE tryon_jobs_submitted_total counter' in text
+    assert 'tryon_jobs_submitted_total{provider="klingai"} 2' in text
+    assert 'tryon_jobs_completed_total{provider="klingai"} 1' in text
+    assert 'tryon_jobs_failed_total{provider="klingai",error="Exception"} 1' in text
+    assert 'tryon_jobs_in_flight{provider="klingai"} 0' in text
+    assert 'tryon_downloads_total{provider="klingai",outcome="ok"} 1' in text
+    assert 'tryon_job_duration_seconds_bucket{provider="klingai",le="+Inf"} 1' in text
+    assert 'tryon_job_phase_seconds_count{provider="klingai",phase="inference"} 1' in text
+    assert 'tryon_job_phase_seconds_count{provider="klingai",phase="download"} 1' in text
+    assert [line for line in text.splitlines() if line.startswith("tryon_polls_total")]
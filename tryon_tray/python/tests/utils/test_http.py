@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from tryon_tray.utils import http
+from tryon_tray.utils.http import SessionPool, HTTPConfig
+
+def test_session_reused_per_host():
+    """Requests to the same host share one pooled session."""
+    pool = SessionPool()
+
+    first = pool.get_session("https://api.fashn.ai/v1/run")
+    second = pool.get_session("https://api.fashn.ai/v1/status/123")
+    other = pool.get_session("https://api.klingai.com/v1/images")
+
+    assert first is second
+    assert first is not other
+
+def test_session_pool_size():
+    """Sessions use the configured connection pool size."""
+    pool = SessionPool(HTTPConfig(pool_maxsize=64))
+
+    adapter = pool.get_session("https://api.fashn.ai/v1/run").get_adapter("https://api.fashn.ai")
+
+    assert adapter._pool_maxsize == 64
+
+def test_request_applies_default_timeout():
+    """Requests get the configured timeout unless one is given."""
+    pool = SessionPool(HTTPConfig(timeout=3.0))
+    session = pool.get_session("https://api.fashn.ai")
+
+    with patch.object(session, "request") as mock_request:
+        pool.request("GET", "https://api.fashn.ai/v1/status/1")
+        pool.request("GET", "https://api.fashn.ai/v1/status/2", timeout=9)
+
+    assert mock_request.call_args_list[0].kwargs["timeout"] == 3.0
+    assert mock_request.call_args_list[1].kwargs["timeout"] == 9
+
+def test_keep_alive_disabled():
+    """Disabling keep-alive asks the server to close each connection."""
+    pool = SessionPool(HTTPConfig(keep_alive=False))
+
+    assert pool.get_session("https://api.fashn.ai").headers["Connection"] == "close"
+
+def test_configure_http_replaces_pool():
+    """configure_http installs a new process-wide pool."""
+    previous = http.get_session_pool()
+    try:
+        pool = http.configure_http(pool_maxsize=4)
+        assert http.get_session_pool() is pool
+        assert pool.config.pool_maxsize == 4
+    finally:
+        http._pool = previous
+
+def test_configure_async_client_sets_thread_cap():
+    """configure_async_client replaces the client with one of the given size."""
+    try:
+        client = http.configure_async_client(max_workers=4)
+        assert http.get_async_client() is client
+        assert client.max_workers == 4
+        with pytest.raises(ValueError, match="max_workers"):
+            http.AsyncHTTPClient(max_workers=0)
+    finally:
+        # The previous client was closed; the next caller gets a default one
+        http.configure_async_client()
@@ -0,0 +1,171 @@
+import base64
+import io
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+from PIL import Image
+from tryon_tray.api.vmodel import VModelAPIClient
+from tryon_tray.api.vton import VTON
+from tryon_tray.services.video.kling import KlingVideoGen
+from tryon_tray.services.vton.fashnai import FashnaiVTON
+from tryon_tray.services.vton.vmodel import VModelVTON
+from tryon_tray.testing.fake_providers import FakeKlingServer, FakeProviderServer
+from tryon_tray.utils.image_input import ImageData, load_image_input
+from tryon_tray.utils.payload_cache import PayloadCache
+from tryon_tray.utils.preprocess import ImageSpec, preprocess_image
+
+INPUTS = Path(__file__).resolve().parents[1] / "inputs"
+
+@pytest.fixture
+def person_bytes():
+    return (INPUTS / "person.jpg").read_bytes()
+
+def test_paths_and_urls_pass_through():
+    path = INPUTS / "person.jpg"
+    assert load_image_input(str(path)) == str(path)
+    assert load_image_input(path) is path
+    assert load_image_input("https://example.com/a.jpg") == "https://example.com/a.jpg"
+
+def test_bytes_like_inputs(person_bytes):
+    for value in (person_bytes, bytearray(person_bytes), memoryview(person_bytes)):
+        image = load_image_input(value)
+        assert isinstance(image, ImageData)
+        assert image.data == person_bytes
+        assert image.mime_type == "image/jpeg"
+        assert image.name == "image.jpg"
+
+def test_file_object_input(person_bytes):
+    image = load_image_input(io.BytesIO(person_bytes))
+    assert image.data == person_bytes
+
+    with open(INPUTS / "garment.jpeg", "rb") as f:
+        assert load_image_input(f).name == "garment.jpeg"
+
+def test_pil_input_is_encoded_losslessly():
+    original = Image.new("RGBA", (40, 30), (10, 20, 30, 128))
+    image = load_image_input(original)
+
+    assert image.mime_type == "image/png"
+    decoded = Image.open(image.open())
+    assert decoded.size == (40, 30)
+    assert decoded.getpixel((0, 0)) == (10, 20, 30, 128)
+
+def test_unsupported_inputs_raise():
+    with pytest.raises(TypeError):
+        load_image_input(42)
+    with pytest.raises(TypeError):
+        load_image_input(io.StringIO("not an image"))
+
+def test_cache_keys_in_memory_images_by_content(person_bytes):
+    """Bytes and a file with the same content share a cache entry."""
+    cache = PayloadCache()
+    cache.get(INPUTS / "person.jpg")
+    entry = cache.get(ImageData(person_bytes))
+
+    assert entry == base64.b64encode(person_bytes)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_preprocess_in_memory_image(person_bytes):
+    data = preprocess_image(ImageData(person_bytes), ImageSpec(max_dimension=512))
+    assert max(Image.open(io.BytesIO(data)).size) == 512
+
+def test_vmodel_uploads_in_memory_image(person_bytes):
+    name, data, _ = VModelAPIClient._upload_file(ImageData(person_bytes, "person.jpg"), None)
+    assert (name, data) == ("person.jpg", person_bytes)
+
+    name, data, mime_type = VModelAPIClient._upload_file(ImageData(person_bytes), ImageSpec(format="PNG"))
+    assert (name, mime_type) == ("image.png", "image/png")
+
+def test_vton_with_in_memory_inputs(kling_env, person_bytes):
+    """Try-on runs from bytes and file objects without touching disk."""
+    with FakeKlingServer(latency=0) as server:
+        result = VTON(
+            person_bytes,
+            io.BytesIO((INPUTS / "garment.jpeg").read_bytes()),
+            model_name="klingai",
+            base_url=server.images_url,
+            polling_interval=0.1
+        )
+        body = server.submissions[0]
+
+    assert base64.b64decode(body["human_image"]) == person_bytes
+    assert result["source_images"] == {"model": "image.jpg", "garment": "image.jpg"}
+
+def test_video_from_pil_image(kling_env):
+    with FakeKlingServer(latency=0) as server:
+        service = KlingVideoGen(
+            Image.new("RGB", (64, 64), (255, 0, 0)),
+            "a red square",
+            base_url=server.api_url,
+            polling_interval=0.1
+        )
+        service.run()
+        body = server.submissions[0]
+
+    image = Image.open(io.BytesIO(base64.b64decode(body["image"])))
+    assert (image.format, image.size) == ("PNG", (64, 64))
+
+@pytest.fixture
+def fake_kling():
+    with FakeKlingServer(latency=0) as server:
+        yield server
+
+def test_urls_passed_through_to_providers_that_accept_them(kling_env, fake_kling, person_bytes, run_kling):
+    url = fake_kling.serve_file("/inputs/person.jpg", person_bytes)
+    run_kling(fake_kling, url, url)
+    body = fake_kling.submissions[-1]
+
+    assert body["human_image"] == url
+    assert fake_kling.count("GET", "/inputs/") == 0
+
+def test_urls_inlined_on_request(kling_env, fake_kling, person_bytes, run_kling):
+    url = fake_kling.serve_file("/inputs/person.jpg", person_bytes)
+    run_kling(fake_kling, url, url, url_mode="inline")
+    body = fake_kling.submissions[-1]
+
+    assert base64.b64decode(body["human_image"]) == person_bytes
+    assert fake_kling.count("GET", "/inputs/") == 2
+
+def test_preprocessing_inlines_urls(kling_env, fake_kling, person_bytes, run_kling):
+    url = fake_kling.serve_file("/inputs/person.jpg", person_bytes)
+    run_kling(fake_kling, url, preprocess=ImageSpec(max_dimension=256))
+    body = fake_kling.submissions[-1]
+
+    assert max(Image.open(io.BytesIO(base64.b64decode(body["human_image"]))).size) == 256
+
+def test_passthrough_requires_provider_support():
+    with patch.dict("os.environ", {"VMODEL_API_KEY": "test_key"}):
+        with pytest.raises(ValueError, match="does not accept image URLs"):
+            VModelVTON("https://example.com/a.jpg", "https://example.com/b.jpg", url_mode="passthrough")
+    with pytest.raises(ValueError, match="url_mode"):
+        FashnaiVTON("a.jpg", "b.jpg", url_mode="sometimes")
+
+def test_alphabake_uses_v2_api_for_urls(person_bytes):
+    """Alphabake fetches URL inputs itself through its v2 API."""
+    with FakeProviderServer() as server:
+        created = []
+
+        def create(body):
+            created.append(body)
+            return 200, {"tryon_id": "t-1"}
+
+        server.route("POST", "/api/v2/tryon/", create)
+        server.route("POST", "/api/v2/tryon_status/", lambda body: (200, {
+            "message": "success", "status": "done", "s3_url": f"{server.url}/results/{body['tryon_id']}.jpg"
+        }))
+        human = server.serve_file("/inputs/human.jpg", person_bytes)
+        garment = server.serve_file("/inputs/garment.jpg", person_bytes)
+
+        with patch.dict("os.environ", {"ALPHABAKE_API_KEY": "test_key"}):
+            result = VTON(
+                human, garment,
+                model_name="alphabake",
+                base_url=f"{server.url}/",
+                garment_type="full",
+                polling_interval=0.1
+            )
+
+    assert created == [{"human_url": human, "garment_url": garment, "garment_type": "full"}]
+    assert result["urls"] == [f"{server.url}/results/t-1.jpg"]
+    assert result["source_images"] == {"model": human, "garment": garment}
+    assert server.count("GET", "/inputs/") == 0
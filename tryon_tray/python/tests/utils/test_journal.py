@@ -0,0 +1,164 @@
+import time
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+import requests
+from tryon_tray.api.resume import resume_jobs
+from tryon_tray.api.vton import VTON
+from tryon_tray.services.video.kling import KlingVideoGen
+from tryon_tray.testing.fake_providers import FakeKlingServer, FakeVModelServer
+from tryon_tray.utils import http
+from tryon_tray.utils.journal import JobJournal
+from tryon_tray.utils.retry import RetryPolicy
+
+INPUTS = Path(__file__).resolve().parents[1] / "inputs"
+PERSON = str(INPUTS / "person.jpg")
+GARMENT = str(INPUTS / "garment.jpeg")
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = JobJournal(tmp_path / "jobs.sqlite")
+    yield journal
+    journal.close()
+
+@pytest.fixture(autouse=True)
+def provider_env(kling_env):
+    with patch.dict("os.environ", {"VMODEL_API_KEY": "test_key"}):
+        yield
+
+def test_journal_round_trip(journal):
+    job_id = journal.record("VTON", "fashnai", "fashnai", {"prediction_id": "p-1"}, "abc", {"seed": 42})
+    [entry] = journal.pending()
+    assert (entry.id, entry.remote_state, entry.params) == (job_id, {"prediction_id": "p-1"}, {"seed": 42})
+
+    journal.complete(job_id, ["https://a/1.png"])
+    assert journal.pending() == []
+    assert journal.get(job_id).result == ["https://a/1.png"]
+
+    assert journal.prune(older_than=-1) == 1
+    assert journal.get(job_id) is None
+
+def test_live_worker_keeps_its_jobs(journal, tmp_path):
+    other = JobJournal(tmp_path / "jobs.sqlite", lease=60)
+    try:
+        job_id = other.record("VTON", "fashnai", "fashnai", {"prediction_id": "p-1"}, "abc", {})
+        # Another worker is still polling the job
+        assert journal.pending() == [] and not journal.claim(job_id)
+        assert [e.owner for e in journal.pending(include_leased=True)] == [other.owner]
+
+        other.release(job_id)
+        assert journal.claim(job_id)
+        assert not other.claim(job_id)
+        assert journal.get(job_id).owner == journal.owner
+    finally:
+        other.close()
+
+def test_dead_worker_lease_runs_out(journal, tmp_path):
+    other = JobJournal(tmp_path / "jobs.sqlite", lease=0.2)
+    try:
+        job_id = other.record("VTON", "fashnai", "fashnai", {"prediction_id": "p-1"}, "abc", {})
+    finally:
+        other.close()
+    assert journal.pending() == []
+    time.sleep(0.3)
+    assert [e.id for e in journal.pending()] == [job_id]
+    assert journal.claim(job_id)
+
+def test_completed_job_is_journaled(journal, run_kling):
+    with FakeKlingServer(latency=0) as server:
+        result = run_kling(server, journal=journal)
+        task_id = next(iter(server.tasks))
+
+    entry = journal.get(1)
+    assert entry.status == "completed"
+    assert entry.remote_state == {"prediction_id": task_id}
+    assert entry.result == result["urls"]
+    assert entry.params["model_image"] == PERSON
+    assert "api_key" not in entry.params and "journal" not in entry.params
+
+def test_failed_job_is_marked_failed(journal, run_kling):
+    with FakeKlingServer(latency=0, fail=True) as server:
+        with pytest.raises(Exception):
+            run_kling(server, journal=journal)
+
+    entry = journal.get(1)
+    assert entry.status == "failed"
+    assert "Simulated failure" in entry.error
+
+def test_transient_status_error_leaves_job_pending(journal):
+    with FakeVModelServer(latency=0) as server:
+        with patch(
+            "tryon_tray.api.vmodel.VModelAPIClient.get_job_status",
+            side_effect=requests.ConnectionError("connection reset")
+        ):
+            with pytest.raises(requests.ConnectionError):
+                VTON(
+                    PERSON, GARMENT, model_name="vmodel", base_url=server.base_url,
+                    journal=journal, polling_interval=0.1
+                )
+
+        assert [e.status for e in journal.pending()] == ["pending"]
+        [resumed] = list(resume_jobs(journal, polling_interval=0.1))
+
+    assert resumed.ok
+    assert journal.get(resumed.entry.id).status == "completed"
+
+def test_unavailable_video_status_leaves_task_pending(journal):
+    unavailable = (503, {"code": 5000, "message": "Service unavailable"})
+    previous = http.get_session_pool()
+    http.configure_http(retry=RetryPolicy(max_retries=1, backoff=0.01))
+    try:
+        with patch.object(FakeKlingServer, "_status", return_value=unavailable), FakeKlingServer(latency=0) as server:
+            service = KlingVideoGen(PERSON, "a walk", base_url=server.api_url, journal=journal, polling_interval=0.05)
+            with pytest.raises(requests.HTTPError):
+                service.run()
+    finally:
+        http._pool = previous
+
+    [entry] = journal.pending()
+    assert entry.remote_state == {"task_id": service.task_id}
+    assert entry.owner is None
+
+def test_interrupted_job_is_resumed_without_resubmitting(journal, tmp_path, run_kling):
+    with FakeKlingServer(latency=0.5) as server:
+        # The worker gives up (or dies) before the job finishes
+        with pytest.raises(TimeoutError):
+            run_kling(
+                server, journal=journal, max_polling_attempts=1,
+                auto_download=True, download_path=str(tmp_path / "out.png")
+            )
+        assert [e.status for e in journal.pending()] == ["pending"]
+
+        time.sleep(0.5)
+        resumed = list(resume_jobs(journal, polling_interval=0.1))
+        submissions = len(server.submissions)
+
+    assert submissions == 1
+    assert [r.ok for r in resumed] == [True]
+    assert resumed[0].result["local_path"] == str(tmp_path / "out.png")
+    assert (tmp_path / "out.png").read_bytes().startswith(b"result ")
+    assert journal.pending() == []
+    assert journal.get(resumed[0].entry.id).status == "completed"
+
+def test_video_task_is_resumed(journal):
+    with FakeKlingServer(latency=0.3) as server:
+        service = KlingVideoGen(
+            PERSON, "a walk",
+            base_url=server.api_url,
+            journal=journal,
+            max_polling_attempts=1,
+            polling_interval=0.05
+        )
+        with pytest.raises(TimeoutError):
+            service.run()
+
+        [resumed] = list(resume_jobs(journal, polling_interval=0.1))
+        submissions = len(server.submissions)
+
+    assert submissions == 1
+    assert resumed.result["video_url"] == f"{server.url}/results/{service.task_id}.mp4"
+
+def test_jobs_are_not_journaled_by_default(journal, run_kling):
+    with FakeKlingServer(latency=0) as server:
+        run_kling(server)
+    assert journal.pending() == [] and journal.get(1) is None
@@ -0,0 +1,115 @@
+import base64
+import threading
+from pathlib import Path
+import pytest
+from tryon_tray.utils import payload_cache
+from tryon_tray.utils.payload_cache import PayloadCache, configure_payload_cache, encode_file
+from tryon_tray.utils.streaming import Base64File
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "garment.png"
+    path.write_bytes(b"garment-bytes" * 100)
+    return path
+
+def counting_encoder(path, calls):
+    def encode():
+        calls.append(path)
+        return encode_file(path)
+    return encode
+
+def test_repeated_input_encoded_once(image):
+    """The second request for the same content is served from memory."""
+    cache = PayloadCache()
+    calls = []
+
+    first = cache.get(image, encode=counting_encoder(image, calls))
+    second = cache.get(image, encode=counting_encoder(image, calls))
+
+    assert first == base64.b64encode(image.read_bytes())
+    assert second is first
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_keyed_by_content_and_variant(image, tmp_path):
+    """Copies share an entry; edits and other variants do not."""
+    cache = PayloadCache()
+    copy = tmp_path / "copy.png"
+    copy.write_bytes(image.read_bytes())
+
+    cache.get(image)
+    cache.get(copy)
+    cache.get(image, variant="resized", encode=lambda: iter([b"small"]))
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    copy.write_bytes(b"different")
+    assert cache.get(copy) == base64.b64encode(b"different")
+    assert cache.misses == 3
+
+def test_memory_tier_is_lru_bounded(tmp_path):
+    """The least recently used entries are evicted past max_bytes."""
+    cache = PayloadCache(max_bytes=4500)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"{i}.png"
+        path.write_bytes(bytes([i]) * 1500)  # 2000 bytes encoded
+        paths.append(path)
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+
+    assert cache._memory_bytes == 4000
+    misses = cache.misses
+    cache.get(paths[0])
+    assert cache.misses == misses
+    cache.get(paths[1])
+    assert cache.misses == misses + 1
+
+def test_disk_tier_survives_restart(image, tmp_path):
+    """Entries written to disk are reused by a new cache."""
+    disk = tmp_path / "cache"
+    PayloadCache(disk_dir=disk).get(image)
+
+    fresh = PayloadCache(disk_dir=disk)
+    calls = []
+    data = fresh.get(image, encode=counting_encoder(image, calls))
+
+    assert calls == []
+    assert data == base64.b64encode(image.read_bytes())
+
+def test_large_entries_stay_on_disk(image, tmp_path):
+    """Entries above max_entry_bytes are served from the disk tier."""
+    cache = PayloadCache(max_entry_bytes=100, disk_dir=tmp_path / "cache")
+
+    entry = cache.get(image)
+
+    assert isinstance(entry, Path)
+    assert entry.read_bytes() == base64.b64encode(image.read_bytes())
+    assert PayloadCache(max_entry_bytes=100).get(image) is None
+
+def test_concurrent_requests_encode_once(image):
+    """Jobs starting together with the same garment share one encode."""
+    cache = PayloadCache()
+    calls = []
+    threads = [threading.Thread(target=cache.get, args=(image,), kwargs={"encode": counting_encoder(image, calls)}) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+
+def test_payload_values_share_cache(image):
+    """Plain and data-URI payload values of one image use one entry."""
+    previous = payload_cache._cache
+    try:
+        cache = configure_payload_cache()
+        plain = Base64File(image).read()
+        data_uri = Base64File(image, prefix="data:image/png;base64,").read()
+    finally:
+        payload_cache._cache = previous
+
+    assert data_uri == "data:image/png;base64," + plain
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,159 @@
+import threading
+import time
+import pytest
+from concurrent.futures import wait
+from tryon_tray.utils.polling import (
+    PollScheduler, PollingPolicy, FixedPolling, AdaptivePolling, get_adaptive_policy, resolve_polling_policy
+)
+
+@pytest.fixture
+def scheduler():
+    scheduler = PollScheduler(max_workers=4)
+    yield scheduler
+    scheduler.stop()
+
+def make_check(polls_until_done, result="done"):
+    """Status check that completes on the given poll."""
+    calls = []
+    def check():
+        calls.append(time.monotonic())
+        if len(calls) < polls_until_done:
+            return False, None
+        return True, result
+    return check, calls
+
+def test_resolves_future_on_completion(scheduler):
+    """The job's future gets the result once the check reports completion."""
+    check, calls = make_check(3)
+
+    future = scheduler.submit(check, delay=0.01)
+
+    assert future.result(timeout=5) == "done"
+    assert len(calls) == 3
+
+def test_job_error_sets_exception(scheduler):
+    """Errors returned or raised by the check fail the future."""
+    returned = scheduler.submit(lambda: (True, ValueError("failed")), delay=0)
+    raised = scheduler.submit(lambda: 1 / 0, delay=0)
+
+    with pytest.raises(ValueError, match="failed"):
+        returned.result(timeout=5)
+    with pytest.raises(ZeroDivisionError):
+        raised.result(timeout=5)
+
+def test_times_out_after_max_attempts(scheduler):
+    """A job that never completes times out after max_attempts polls."""
+    check, calls = make_check(100)
+
+    future = scheduler.submit(check, delay=0, max_attempts=4)
+
+    with pytest.raises(TimeoutError):
+        future.result(timeout=5)
+    assert len(calls) == 4
+
+def test_polls_in_due_order(scheduler):
+    """Jobs are polled by next-poll time, not submission order."""
+    order = []
+    lock = threading.Lock()
+    def check_for(name):
+        def check():
+            with lock:
+                order.append(name)
+            return True, name
+        return check
+
+    futures = [
+        scheduler.submit(check_for("late"), initial_delay=0.3),
+        scheduler.submit(check_for("early"), initial_delay=0.05),
+        scheduler.submit(check_for("middle"), initial_delay=0.15),
+    ]
+    wait(futures, timeout=5)
+
+    assert order == ["early", "middle", "late"]
+
+def test_many_jobs_share_one_thread(scheduler):
+    """Thousands of outstanding jobs do not need a thread each."""
+    threads_before = threading.active_count()
+    futures = [scheduler.submit(make_check(2)[0], delay=0.05) for _ in range(2000)]
+
+    assert threading.active_count() - threads_before <= 4
+    done, not_done = wait(futures, timeout=30)
+    assert not not_done
+    assert all(f.result() == "done" for f in done)
+
+def test_cancelled_job_is_dropped(scheduler):
+    """A cancelled job is not polled again."""
+    check, calls = make_check(100)
+
+    future = scheduler.submit(check, initial_delay=0.2)
+    future.cancel()
+    time.sleep(0.3)
+
+    assert calls == []
+    assert scheduler.pending() == 0
+
+def test_policy_without_next_delay_cannot_be_created():
+    """A policy missing next_delay fails when created, not mid-poll."""
+    class Incomplete(PollingPolicy):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_adaptive_policy_falls_back_while_learning():
+    """Without enough samples the adaptive policy polls at its default delay."""
+    policy = AdaptivePolling(default_delay=5, min_samples=3)
+    policy.observe(20)
+
+    assert policy.first_delay() == 0
+    assert policy.next_delay(1, 1) == 5
+
+def test_adaptive_policy_learns_schedule():
+    """Learned schedules poll first near completion, densely, then back off."""
+    policy = AdaptivePolling(min_samples=5, dense_polls=4, min_delay=0.5, max_delay=30, backoff=2)
+    for duration in [20, 22, 24, 26, 28, 30, 32, 34, 36, 38, 40]:
+        policy.observe(duration)
+
+    assert policy.first_delay() == pytest.approx(22)
+    # Dense polling between the 10th and 90th percentiles
+    assert policy.next_delay(1, 25) == pytest.approx((38 - 22) / 4)
+    # Geometric back-off in the tail, capped at max_delay
+    assert policy.next_delay(5, 48) == pytest.approx(10)
+    assert policy.next_delay(6, 200) == 30
+
+def test_adaptive_policy_cuts_polls():
+    """A learned schedule needs far fewer polls than a fixed interval."""
+    def polls_needed(policy, duration):
+        elapsed, polls = policy.first_delay(), 1
+        while elapsed < duration:
+            elapsed += policy.next_delay(polls, elapsed)
+            polls += 1
+        return polls, elapsed
+
+    adaptive = AdaptivePolling(min_samples=5)
+    for duration in [55, 58, 60, 61, 63, 65, 70]:
+        adaptive.observe(duration)
+
+    adaptive_polls, adaptive_done = polls_needed(adaptive, 62)
+    fixed_polls, fixed_done = polls_needed(FixedPolling(2), 62)
+
+    assert adaptive_polls < fixed_polls / 4
+    assert adaptive_done - 62 <= 2
+
+def test_scheduler_feeds_policy(scheduler):
+    """Completed jobs report their duration to the policy."""
+    policy = AdaptivePolling(default_delay=0)
+    check, _ = make_check(2)
+
+    scheduler.submit(check, policy=policy, max_attempts=5).result(timeout=5)
+
+    assert len(policy._samples) == 1
+    assert policy._samples[0] >= 0
+
+def test_resolve_polling_policy():
+    """Policy arguments resolve to fixed or per-provider adaptive policies."""
+    assert resolve_polling_policy(None, "fashnai", 3).next_delay(1, 0) == 3
+    assert resolve_polling_policy("adaptive", "fashnai", 3) is get_adaptive_policy("fashnai")
+    assert resolve_polling_policy("adaptive", "klingai", 3) is not get_adaptive_policy("fashnai")
+    with pytest.raises(ValueError):
+        resolve_polling_policy("sometimes", "fashnai", 3)
@@ -0,0 +1,130 @@
+import base64
+import io
+import pytest
+from PIL import Image
+from tryon_tray.api.vton import VTON, VTON_batch
+from tryon_tray.testing.fake_providers import FakeKlingServer
+from tryon_tray.utils.payload_cache import configure_payload_cache
+from tryon_tray.utils.preprocess import (
+    DEFAULT_IMAGE_SPECS,
+    ImageSpec,
+    configure_image_specs,
+    preprocess_image,
+    resolve_image_spec,
+)
+from tryon_tray.utils.file_io import stream_base64
+
+def decode(data):
+    return Image.open(io.BytesIO(data))
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    configure_payload_cache()
+    yield
+    configure_payload_cache()
+
+@pytest.fixture
+def large_photo(tmp_path):
+    path = tmp_path / "person.jpg"
+    Image.new("RGB", (3000, 2000), (200, 120, 80)).save(path, quality=95)
+    return path
+
+def test_resizes_longest_side(large_photo):
+    """Images are shrunk to max_dimension, keeping the aspect ratio."""
+    img = decode(preprocess_image(large_photo, ImageSpec(max_dimension=1024)))
+    assert img.size == (1024, 683)
+    assert img.format == "JPEG"
+
+def test_small_images_keep_their_size(tmp_path):
+    path = tmp_path / "small.jpg"
+    Image.new("RGB", (300, 400)).save(path)
+    assert decode(preprocess_image(path, ImageSpec(max_dimension=1024))).size == (300, 400)
+
+def test_applies_exif_orientation(tmp_path):
+    """A photo stored sideways with an orientation tag comes out upright."""
+    path = tmp_path / "rotated.jpg"
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotate 90 degrees clockwise
+    Image.new("RGB", (400, 200)).save(path, exif=exif)
+
+    img = decode(preprocess_image(path, ImageSpec()))
+    assert img.size == (200, 400)
+    assert img.getexif().get(0x0112) in (None, 1)
+
+def test_flattens_transparency_onto_white(tmp_path):
+    path = tmp_path / "garment.png"
+    Image.new("RGBA", (100, 100), (0, 0, 0, 0)).save(path)
+
+    img = decode(preprocess_image(path, ImageSpec()))
+    assert img.mode == "RGB"
+    assert all(channel > 250 for channel in img.getpixel((50, 50)))
+
+def test_png_output_keeps_transparency(tmp_path):
+    path = tmp_path / "garment.png"
+    Image.new("RGBA", (100, 100), (0, 0, 0, 0)).save(path)
+
+    img = decode(preprocess_image(path, ImageSpec(format="PNG")))
+    assert img.format == "PNG"
+    assert img.mode == "RGBA"
+
+def test_quality_sets_jpeg_size(large_photo):
+    low = preprocess_image(large_photo, ImageSpec(quality=20))
+    high = preprocess_image(large_photo, ImageSpec(quality=95))
+    assert len(low) < len(high)
+    assert ImageSpec(quality=20).variant != ImageSpec(quality=95).variant
+
+def test_resolve_image_spec():
+    custom = ImageSpec(max_dimension=512)
+    assert resolve_image_spec(False, "fashnai", "human") is None
+    assert resolve_image_spec(True, "fashnai", "human") == DEFAULT_IMAGE_SPECS["human"]
+    assert resolve_image_spec(custom, "fashnai", "garment") == custom
+    assert resolve_image_spec({"garment": custom}, "fashnai", "human") is None
+
+    configure_image_specs("test-provider", human=custom)
+    assert resolve_image_spec(True, "test-provider", "human") == custom
+    assert resolve_image_spec(True, "test-provider", "garment") == DEFAULT_IMAGE_SPECS["garment"]
+
+def test_data_uri_uses_output_format(tmp_path):
+    path = tmp_path / "garment.png"
+    Image.new("RGB", (100, 100)).save(path)
+
+    value = stream_base64(path, data_uri=True, spec=ImageSpec()).read()
+    assert value.startswith("data:image/jpeg;base64,")
+    assert decode(base64.b64decode(value.split(",", 1)[1])).format == "JPEG"
+
+def test_kling_uploads_preprocessed_images(kling_env, large_photo):
+    """With preprocess=True the provider receives the resized image."""
+    with FakeKlingServer(latency=0) as server:
+        VTON(
+            str(large_photo), str(large_photo),
+            model_name="klingai",
+            base_url=server.images_url,
+            preprocess=True,
+            polling_interval=0.1
+        )
+        body = server.submissions[0]
+
+    assert max(decode(base64.b64decode(body["human_image"])).size) == 1536
+    assert max(decode(base64.b64decode(body["cloth_image"])).size) == 1024
+
+def test_batch_preprocesses_in_process_pool(kling_env, tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"person-{i}.jpg"
+        Image.new("RGB", (2400, 3200), (i * 50, 0, 0)).save(path)
+        paths.append(str(path))
+
+    with FakeKlingServer(latency=0) as server:
+        results = list(VTON_batch(
+            [(path, path) for path in paths],
+            model_name="klingai",
+            base_url=server.images_url,
+            preprocess=True,
+            preprocess_workers=2,
+            polling_interval=0.1
+        ))
+        bodies = list(server.submissions)
+
+    assert [r.error for r in results] == [None] * 3
+    for body in bodies:
+        assert decode(base64.b64decode(body["human_image"])).size == (1152, 1536)
@@ -0,0 +1,111 @@
+import time
+from email.utils import formatdate
+from pathlib import Path
+import pytest
+from unittest.mock import patch, MagicMock
+from tryon_tray.api.vton import VTON
+from tryon_tray.testing.fake_providers import FakeKlingServer
+from tryon_tray.utils.http import SessionPool
+from tryon_tray.utils.ratelimit import (
+    Governor, RateLimit, TokenBucket, configure_rate_limit, get_governor, parse_retry_after
+)
+
+INPUTS = Path(__file__).resolve().parents[1] / "inputs"
+
+def make_response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+def test_token_bucket_paces_requests():
+    """After the burst, requests are spaced by the configured rate."""
+    bucket = TokenBucket(rate=20, burst=2)
+
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+
+    assert time.monotonic() - start >= 0.18
+
+def test_parse_retry_after():
+    """Retry-After is accepted as seconds or as an HTTP date."""
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 5 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+def test_429_is_retried_after_retry_after():
+    """A rate-limited request waits for Retry-After and is sent again."""
+    pool = SessionPool()
+    governor = Governor(RateLimit(rate=100))
+    session = pool.get_session("https://api.fashn.ai")
+
+    with patch.object(session, "request", side_effect=[
+        make_response(429, {"Retry-After": "0.2"}),
+        make_response(200)
+    ]) as mock_request:
+        start = time.monotonic()
+        response = pool.request("GET", "https://api.fashn.ai/v1/status/1", governor=governor)
+
+    assert response.status_code == 200
+    assert mock_request.call_count == 2
+    assert time.monotonic() - start >= 0.2
+    assert governor.throttled == 1
+    # The request rate was halved and then partly recovered
+    assert governor.bucket.rate == pytest.approx(60)
+
+def test_429_returned_after_max_retries():
+    """Once retries are exhausted the 429 response is returned to the caller."""
+    pool = SessionPool()
+    governor = Governor(RateLimit(max_retries=2))
+    session = pool.get_session("https://api.fashn.ai")
+
+    with patch.object(session, "request", return_value=make_response(429, {"Retry-After": "0"})) as mock_request:
+        response = pool.request("GET", "https://api.fashn.ai/v1/status/1", governor=governor)
+
+    assert response.status_code == 429
+    assert mock_request.call_count == 3
+
+def test_job_slots_are_bounded_and_fifo():
+    """Waiting jobs get freed slots in the order they asked for them."""
+    governor = Governor(RateLimit(max_in_flight=2))
+    first, second, third, fourth = [governor.reserve() for _ in range(4)]
+
+    assert first.done() and second.done()
+    assert not third.done() and not fourth.done()
+
+    third.cancel()
+    governor.release()
+
+    assert fourth.done()
+    assert governor.in_flight == 2
+
+def test_governors_are_per_api_key():
+    """Limits can be set per provider and overridden per API key."""
+    try:
+        configure_rate_limit("test-provider", rate=5)
+        configure_rate_limit("test-provider", api_key="key-b", rate=1)
+
+        assert get_governor("test-provider", "key-a") is get_governor("test-provider", "key-a")
+        assert get_governor("test-provider", "key-a").limit.rate == 5
+        assert get_governor("test-provider", "key-b").limit.rate == 1
+    finally:
+        configure_rate_limit("test-provider")
+        configure_rate_limit("test-provider", api_key="key-b")
+
+def test_vton_survives_429s():
+    """Rate-limited Kling requests are retried instead of failing the job."""
+    with patch.dict("os.environ", {"KLINGAI_ACCESS_ID": "test_id", "KLINGAI_API_KEY": "test_key"}), \
+            FakeKlingServer(latency=0.1) as server:
+        server.reject_next(2, retry_after=0.05)
+
+        result = VTON(
+            str(INPUTS / "person.jpg"), str(INPUTS / "garment.jpeg"),
+            model_name="klingai",
+            base_url=server.images_url,
+            polling_interval=0.05
+        )
+
+    assert result["urls"][0].endswith(".png")
+    assert server.rejected == 2
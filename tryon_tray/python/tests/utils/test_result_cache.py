@@ -0,0 +1,91 @@
+import time
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+from tryon_tray.services.vton.fashnai import FashnaiVTON
+from tryon_tray.testing.fake_providers import FakeKlingServer
+from tryon_tray.utils.preprocess import ImageSpec
+from tryon_tray.utils.result_cache import ResultCache
+from tryon_tray.utils.sinks import MemorySink
+
+INPUTS = Path(__file__).resolve().parents[1] / "inputs"
+PERSON = str(INPUTS / "person.jpg")
+GARMENT = str(INPUTS / "garment.jpeg")
+
+@pytest.fixture
+def cache():
+    cache = ResultCache(":memory:")
+    yield cache
+    cache.close()
+
+def test_round_trip(cache):
+    cache.put("k", "fashnai", {"urls": ["https://a/1.png"], "mode": "quality"}, [b"one", b"two"])
+    entry = cache.get("k")
+
+    assert entry.metadata == {"urls": ["https://a/1.png"], "mode": "quality"}
+    assert entry.outputs == [b"one", b"two"]
+    assert cache.get("missing") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_expired_entries_are_dropped():
+    cache = ResultCache(":memory:", ttl=0.05)
+    cache.put("k", "fashnai", {}, [b"x"])
+    time.sleep(0.1)
+
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResultCache(":memory:", max_bytes=25)
+    cache.put("a", "p", {}, [b"a" * 10])
+    cache.put("b", "p", {}, [b"b" * 10])
+    cache.get("a")
+    cache.put("c", "p", {}, [b"c" * 10])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+def test_cache_key_covers_defaults_params_and_content(tmp_path):
+    with patch.dict("os.environ", {"FASHNAI_API_KEY": "test_key"}):
+        def key(model_image=PERSON, **params):
+            return FashnaiVTON(model_image, GARMENT, **params).cache_key()
+
+        copy = tmp_path / "copy.jpg"
+        copy.write_bytes(Path(PERSON).read_bytes())
+
+        assert key() == key(seed=42, show_polling_progress=True, api_key="other")
+        assert key() == key(model_image=str(copy))
+        assert key() == key(model_image=Path(PERSON).read_bytes())
+        assert key() != key(seed=7)
+        assert key() != key(model_image=GARMENT)
+        assert key() != key(preprocess=ImageSpec(max_dimension=512))
+
+@pytest.fixture
+def kling(kling_env):
+    with FakeKlingServer(latency=0) as server:
+        yield server
+
+def test_identical_job_is_served_from_cache(kling, cache, tmp_path, run_kling):
+    first = run_kling(kling, cache=cache)
+    second = run_kling(kling, cache=cache, auto_download=True, download_path=str(tmp_path / "out.png"))
+
+    assert len(kling.submissions) == 1
+    assert "cached" not in first
+    assert second["cached"] is True
+    assert second["urls"] == first["urls"]
+    assert (tmp_path / "out.png").read_bytes().startswith(b"result ")
+    assert second["local_path"] == str(tmp_path / "out.png")
+
+def test_cache_hit_fills_result_sink(kling, cache, run_kling):
+    run_kling(kling, cache=cache)
+    sink = MemorySink()
+    result = run_kling(kling, cache=cache, result_sink=sink)
+
+    assert result["outputs"] == [sink.buffers[0]]
+    assert sink.getvalue().startswith(b"result ")
+    assert len(kling.submissions) == 1
+
+def test_cache_is_opt_in(kling, cache, run_kling):
+    run_kling(kling, cache=cache)
+    run_kling(kling)
+    assert len(kling.submissions) == 2
@@ -0,0 +1,95 @@
+import socket
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from tryon_tray.utils.http import SessionPool, HTTPConfig
+from tryon_tray.utils.retry import RetryPolicy, never_sent
+
+URL = "https://api.fashn.ai/v1/run"
+
+def make_response(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    return response
+
+def refused():
+    """ConnectionError as raised when the connection cannot be opened."""
+    reason = NewConnectionError(None, "Failed to establish a new connection: [Errno 111] Connection refused")
+    return requests.ConnectionError(MaxRetryError(None, URL, reason))
+
+def reset():
+    """ConnectionError as raised when an open connection is dropped."""
+    return requests.ConnectionError("Connection aborted.", ConnectionResetError(104, "Connection reset by peer"))
+
+@pytest.fixture
+def pool():
+    return SessionPool(HTTPConfig(retry=RetryPolicy(max_retries=3, backoff=0)))
+
+def send(pool, method, side_effect, **kwargs):
+    session = pool.get_session(URL)
+    with patch.object(session, "request", side_effect=side_effect) as mock_request:
+        try:
+            return pool.request(method, URL, **kwargs), mock_request.call_count
+        except requests.RequestException as e:
+            return e, mock_request.call_count
+
+def test_poll_retried_on_reset_and_5xx(pool):
+    """Status polls survive dropped connections and server errors."""
+    response, calls = send(pool, "GET", [reset(), make_response(503), make_response(200)])
+
+    assert response.status_code == 200
+    assert calls == 3
+
+def test_poll_gives_up_after_max_retries(pool):
+    """Persistent failures are raised once the retries are used up."""
+    error, calls = send(pool, "GET", [reset()] * 4)
+
+    assert isinstance(error, requests.ConnectionError)
+    assert calls == 4
+
+def test_submit_not_retried_when_possibly_received(pool):
+    """A submit that may have reached the provider is never sent twice."""
+    error, calls = send(pool, "POST", [reset(), make_response(200)])
+    assert isinstance(error, requests.ConnectionError)
+    assert calls == 1
+
+    response, calls = send(pool, "POST", [make_response(502), make_response(200)])
+    assert response.status_code == 502
+    assert calls == 1
+
+def test_submit_retried_when_never_sent(pool):
+    """A submit whose connection could not be opened is safe to resend."""
+    response, calls = send(pool, "POST", [refused(), make_response(200)])
+
+    assert response.status_code == 200
+    assert calls == 2
+
+def test_idempotent_post_retried(pool):
+    """POST status checks can opt in to poll retries."""
+    response, calls = send(pool, "POST", [make_response(500), make_response(200)], idempotent=True)
+
+    assert response.status_code == 200
+    assert calls == 2
+
+def test_retries_disabled_per_request(pool):
+    """Callers with their own retry loop send each request once."""
+    error, calls = send(pool, "GET", [refused(), make_response(200)], retry=False)
+    assert isinstance(error, requests.ConnectionError)
+    assert calls == 1
+
+    response, calls = send(pool, "GET", [make_response(503), make_response(200)], retry=False)
+    assert response.status_code == 503
+    assert calls == 1
+
+def test_refused_connection_is_never_sent():
+    """A real refused connection is classified as never sent."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    with pytest.raises(requests.ConnectionError) as exc:
+        requests.post(f"http://127.0.0.1:{port}/run", timeout=2)
+
+    assert never_sent(exc.value)
+    assert not never_sent(reset())
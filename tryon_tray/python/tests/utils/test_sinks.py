@@ -0,0 +1,133 @@
+import io
+import os
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+from PIL import Image
+from tryon_tray.api.vton import VTON
+from tryon_tray.testing.fake_providers import FakeKlingServer, FakeProviderServer
+from tryon_tray.utils.download import Downloader
+from tryon_tray.utils.retry import RetryPolicy
+from tryon_tray.utils.sinks import LocalFileSink, MemorySink, S3Sink, S3_MIN_PART_SIZE
+
+INPUTS = Path(__file__).resolve().parents[1] / "inputs"
+
+class RecordingS3Client:
+    """Stands in for a boto3 S3 client, keeping objects in a dict."""
+
+    def __init__(self):
+        self.calls = []
+        self.objects = {}
+        self._uploads = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.calls.append(("put_object", Key, kwargs))
+        self.objects[(Bucket, Key)] = Body
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.calls.append(("create_multipart_upload", Key, kwargs))
+        upload_id = f"upload-{len(self._uploads)}"
+        self._uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.calls.append(("upload_part", Key, len(Body)))
+        self._uploads[UploadId][PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls.append(("complete_multipart_upload", Key, MultipartUpload))
+        parts = self._uploads.pop(UploadId)
+        self.objects[(Bucket, Key)] = b"".join(parts[p["PartNumber"]] for p in MultipartUpload["Parts"])
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append(("abort_multipart_upload", Key, UploadId))
+        self._uploads.pop(UploadId)
+
+@pytest.fixture
+def server():
+    with FakeProviderServer(latency=0) as server:
+        yield server
+
+@pytest.fixture
+def downloader():
+    return Downloader(chunk_size=64 * 1024, retry=RetryPolicy(max_retries=1, backoff=0.01))
+
+def png_bytes():
+    out = io.BytesIO()
+    Image.new("RGB", (32, 16), (0, 128, 255)).save(out, format="PNG")
+    return out.getvalue()
+
+def test_memory_sink_decodes_without_temp_file(server, downloader, tmp_path):
+    url = server.serve_file("/results/a.png", png_bytes(), "image/png")
+    sink = MemorySink()
+
+    [result] = downloader.save_all([url], sink)
+
+    assert result.ok and result.location is sink.buffers[0]
+    assert sink.getvalue() == png_bytes()
+    assert sink.image().size == (32, 16)
+    assert os.listdir(tmp_path) == []
+
+def test_local_file_sink_numbers_results(server, downloader, tmp_path):
+    urls = [server.serve_file(f"/results/{i}.png", bytes([i]) * 10) for i in range(2)]
+    results = downloader.save_all(urls, LocalFileSink(tmp_path / "result.png"))
+
+    assert [r.location for r in results] == [str(tmp_path / "result_0.png"), str(tmp_path / "result_1.png")]
+    assert (tmp_path / "result_1.png").read_bytes() == bytes([1]) * 10
+
+def test_s3_sink_small_file_uses_put_object(server, downloader):
+    url = server.serve_file("/results/a.png", b"small result", "image/png")
+    client = RecordingS3Client()
+
+    [result] = downloader.save_all([url], S3Sink("bucket", "tryons/a.png", client=client))
+
+    assert result.location == "s3://bucket/tryons/a.png"
+    assert client.objects[("bucket", "tryons/a.png")] == b"small result"
+    assert client.calls == [("put_object", "tryons/a.png", {"ContentType": "image/png"})]
+
+def test_s3_sink_streams_multipart_upload(server, downloader):
+    data = os.urandom(2 * S3_MIN_PART_SIZE + 1000)
+    url = server.serve_file("/results/video.mp4", data, "video/mp4")
+    client = RecordingS3Client()
+
+    [result] = downloader.save_all([url], S3Sink("bucket", "videos/v.mp4", client=client, part_size=S3_MIN_PART_SIZE))
+
+    assert result.ok and result.size == len(data)
+    assert client.objects[("bucket", "videos/v.mp4")] == data
+    assert [c[0] for c in client.calls] == [
+        "create_multipart_upload", "upload_part", "upload_part", "upload_part", "complete_multipart_upload"
+    ]
+    assert client.calls[0][2] == {"ContentType": "video/mp4"}
+
+def test_s3_sink_reset_aborts_upload():
+    client = RecordingS3Client()
+    writer = S3Sink("bucket", "a.png", client=client, part_size=S3_MIN_PART_SIZE).open("", 0, 1)
+    writer.write(b"x" * S3_MIN_PART_SIZE)
+    assert writer.size == S3_MIN_PART_SIZE
+
+    writer.reset()
+    assert writer.size == 0
+    assert client.calls[-1][0] == "abort_multipart_upload"
+
+def test_s3_sink_indexes_keys_and_validates_part_size():
+    sink = S3Sink("bucket", "tryons/result.jpg", client=RecordingS3Client())
+    assert sink.open("", 1, 2).location == "s3://bucket/tryons/result_1.jpg"
+    with pytest.raises(ValueError, match="part_size"):
+        S3Sink("bucket", "a.png", part_size=1024)
+
+def test_vton_with_memory_sink():
+    sink = MemorySink()
+    with patch.dict("os.environ", {"KLINGAI_ACCESS_ID": "test_id", "KLINGAI_API_KEY": "test_key"}):
+        with FakeKlingServer(latency=0) as fake:
+            result = VTON(
+                str(INPUTS / "person.jpg"), str(INPUTS / "garment.jpeg"),
+                model_name="klingai",
+                base_url=fake.images_url,
+                result_sink=sink,
+                polling_interval=0.1
+            )
+
+    assert result["outputs"] == [sink.buffers[0]]
+    assert sink.getvalue().startswith(b"result ")
+    assert "local_paths" not in result
@@ -0,0 +1,57 @@
+import base64
+import json
+from pathlib import Path
+from unittest.mock import patch
+import requests
+from tryon_tray.api.vton import VTON
+from tryon_tray.testing.fake_providers import FakeKlingServer
+from tryon_tray.utils.file_io import base64_with_prefix, stream_base64
+from tryon_tray.utils.streaming import Base64File, StreamingJSONBody, contains_streams
+
+INPUTS = Path(__file__).resolve().parents[1] / "inputs"
+PERSON = INPUTS / "person.jpg"
+
+def test_body_matches_eager_encoding():
+    """The streamed body is the same JSON the eager encoders produce."""
+    payload = {"model_image": stream_base64(PERSON, data_uri=True), "nested": [{"image": Base64File(PERSON)}], "mode": "fast"}
+    expected = json.dumps({
+        "model_image": base64_with_prefix(PERSON),
+        "nested": [{"image": base64.b64encode(PERSON.read_bytes()).decode()}],
+        "mode": "fast"
+    })
+
+    body = StreamingJSONBody(payload, chunk_size=3 * 1024)
+
+    assert b"".join(body).decode() == expected
+    assert len(body) == len(expected)
+    # Iterating again (e.g. for a retry) gives the same bytes
+    assert b"".join(body).decode() == expected
+
+def test_body_streams_in_bounded_chunks():
+    """No chunk is larger than one encoded read."""
+    body = StreamingJSONBody({"image": Base64File(PERSON)}, chunk_size=3 * 1024)
+
+    assert max(len(chunk) for chunk in body) <= 4 * 1024
+
+def test_body_sent_with_content_length():
+    """requests sends the body with a Content-Length, not chunked."""
+    body = StreamingJSONBody({"image": Base64File(PERSON)})
+
+    prepared = requests.Request("POST", "https://api.fashn.ai/v1/run", data=body).prepare()
+
+    assert prepared.headers["Content-Length"] == str(len(body))
+    assert "Transfer-Encoding" not in prepared.headers
+
+def test_contains_streams():
+    assert contains_streams({"a": [1, {"b": Base64File(PERSON)}]})
+    assert not contains_streams({"a": "plain"})
+
+def test_kling_submission_streams_images():
+    """Kling try-on images arrive at the provider as plain base64 strings."""
+    with patch.dict("os.environ", {"KLINGAI_ACCESS_ID": "test_id", "KLINGAI_API_KEY": "test_key"}), \
+            FakeKlingServer(latency=0) as server:
+        VTON(str(PERSON), str(INPUTS / "garment.jpeg"), model_name="klingai", base_url=server.images_url, polling_interval=0)
+
+    [submitted] = server.submissions
+    assert base64.b64decode(submitted["human_image"]) == PERSON.read_bytes()
+    assert submitted["callback_url"] == ""
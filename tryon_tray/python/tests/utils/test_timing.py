@@ -0,0 +1,77 @@
+import time
+from pathlib import Path
+import pytest
+from tryon_tray.api.video_gen import generate_video
+from tryon_tray.api.vton import VTON
+from tryon_tray.testing.fake_providers import FakeKlingServer
+from tryon_tray.types.timing import JobTiming
+from tryon_tray.utils.result_cache import ResultCache
+
+INPUTS = Path(__file__).resolve().parents[1] / "inputs"
+PERSON = str(INPUTS / "person.jpg")
+GARMENT = str(INPUTS / "garment.jpeg")
+
+pytestmark = pytest.mark.usefixtures("kling_env")
+
+def test_nested_phases_are_not_counted_twice():
+    timing = JobTiming()
+    with timing.phase("submit"):
+        time.sleep(0.02)
+        with timing.phase("inference"):
+            time.sleep(0.05)
+
+    assert [p.name for p in timing.phases] == ["inference", "submit"]
+    assert timing.duration("inference") >= 0.05
+    assert 0.02 <= timing.duration("submit") < 0.05
+    assert timing.total == pytest.approx(timing.duration("submit") + timing.duration("inference"))
+    assert timing.duration("download") == 0
+
+def test_to_dict_is_json_friendly():
+    timing = JobTiming()
+    with timing.phase("encode"):
+        pass
+
+    data = timing.to_dict()
+    assert set(data) == {"started_at", "total", "phases"}
+    assert [p["name"] for p in data["phases"]] == ["encode"]
+    assert isinstance(data["phases"][0]["start"], float)
+
+def test_vton_job_records_every_phase(tmp_path):
+    with FakeKlingServer(latency=0.2) as server:
+        result = VTON(
+            PERSON, GARMENT, model_name="klingai", base_url=server.images_url,
+            polling_interval=0.05, auto_download=True, download_path=str(tmp_path / "out.png")
+        )
+
+    timing = result["timing"]
+    assert isinstance(timing, JobTiming)
+    assert [p.name for p in timing.phases] == [
+        "encode", "throttle", "submit", "inference", "download", "postprocess"
+    ]
+    assert timing.duration("inference") >= 0.2
+    assert timing.total >= sum(p.duration for p in timing.phases)
+
+def test_cache_hit_is_timed_on_its_own(tmp_path):
+    cache = ResultCache(":memory:")
+    with FakeKlingServer(latency=0) as server:
+        def run():
+            return VTON(
+                PERSON, GARMENT, model_name="klingai", base_url=server.images_url,
+                polling_interval=0.05, auto_download=True,
+                download_path=str(tmp_path / "out.png"), cache=cache
+            )
+        first = run()
+        second = run()
+
+    assert second["cached"] is True
+    assert second["timing"] is not first["timing"]
+    assert [p.name for p in second["timing"].phases] == ["cache", "download"]
+
+def test_video_response_carries_timing():
+    with FakeKlingServer(latency=0.1) as server:
+        response = generate_video(PERSON, "a walk", base_url=server.api_url, polling_interval=0.05)
+
+    assert [p.name for p in response.timing.phases] == [
+        "encode", "throttle", "submit", "inference", "postprocess"
+    ]
+    assert response.timing.duration("inference") >= 0.1